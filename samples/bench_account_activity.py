@@ -0,0 +1,113 @@
+import time
+import xml.etree.ElementTree as ElementTree
+from td.account_activity import parse_activity_message
+
+NAMESPACE = 'xmlns="urn:xmlns:beb.ameritrade.com"'
+
+ORDER = (
+    '<Order><OrderKey>{order_id}</OrderKey><Security><CUSIP>037833100</CUSIP><Symbol>AAPL</Symbol>'
+    '<SecurityType>Common Stock</SecurityType></Security><OrderPricing><Limit>320.5</Limit></OrderPricing>'
+    '<OrderType>Limit</OrderType><OrderDuration>Day</OrderDuration>'
+    '<OrderEnteredDateTime>2020-06-01T10:00:00.000-05:00</OrderEnteredDateTime>'
+    '<OrderInstructions>Buy</OrderInstructions><OriginalQuantity>1000</OriginalQuantity>'
+    '<AmountIndicator>Shares</AmountIndicator><Discretionary>false</Discretionary><OrderSource>Web</OrderSource>'
+    '<Solicited>false</Solicited><MarketCode>Normal</MarketCode><Capacity>Agency</Capacity>'
+    '<Settlement><SettlementInstructions>Regular</SettlementInstructions></Settlement>'
+    '<EnteringDevice>AA_ABCDEF</EnteringDevice></Order>'
+)
+
+HEADER = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?><{message_type}Message ' + NAMESPACE + '>'
+    '<OrderGroupID><Firm>310</Firm><Branch>ABCD</Branch><ClientKey>123456789</ClientKey>'
+    '<AccountKey>123456789</AccountKey><SubAccountType>Margin</SubAccountType><CDDomainID>A000000012345678</CDDomainID>'
+    '</OrderGroupID><ActivityTimestamp>2020-06-01T10:00:01.000-05:00</ActivityTimestamp>'
+)
+
+FILL = (
+    '<OrderCompletionCode>Normal Completion</OrderCompletionCode><ContraInformation><Contra>'
+    '<AccountKey>987654321</AccountKey><SubAccountType>Cash</SubAccountType><Broker>XYZ</Broker>'
+    '<Quantity>{quantity}</Quantity><BadgeNumber></BadgeNumber><ReportTime>2020-06-01T10:00:01.000-05:00</ReportTime>'
+    '</Contra></ContraInformation><SettlementInformation><Instructions>Normal</Instructions><Currency>USD</Currency>'
+    '</SettlementInformation><ExecutionInformation><Type>Bought</Type><Timestamp>2020-06-01T10:00:01.000-05:00</Timestamp>'
+    '<Quantity>{quantity}</Quantity><ExecutionPrice>320.5</ExecutionPrice><AveragePriceIndicator>false'
+    '</AveragePriceIndicator><LeavesQuantity>{leaves}</LeavesQuantity><ID>{order_id}-{leaves}</ID><Exchange>Q</Exchange>'
+    '<BrokerId>NSDQ</BrokerId></ExecutionInformation><MarkupAmount>0</MarkupAmount><MarkdownAmount>0</MarkdownAmount>'
+    '<TradeCreditAmount>0</TradeCreditAmount><ConfirmTexts><ConfirmText>Executed</ConfirmText></ConfirmTexts>'
+    '<TrueCommCost>0</TrueCommCost><TradeDate>2020-06-01</TradeDate>'
+)
+
+
+def build_message(message_type: str, order_id: int, extra: str = '') -> str:
+    """Builds the XML of a single ACCT_ACTIVITY message."""
+
+    return (
+        HEADER.format(message_type=message_type) + ORDER.format(order_id=order_id) + extra +
+        '<LastUpdated>2020-06-01T10:00:01.000-05:00</LastUpdated></{}Message>'.format(message_type)
+    )
+
+
+def build_burst(orders: int = 500, fills_per_order: int = 10) -> dict:
+    """Builds one stream message with the entry, route and fills of many orders, like a burst of fills."""
+
+    content = []
+
+    for order_id in range(1, orders + 1):
+
+        content.append({'2': 'OrderEntryRequest', '3': build_message('OrderEntryRequest', order_id)})
+        content.append({'2': 'OrderRoute', '3': build_message('OrderRoute', order_id)})
+
+        for fill in range(1, fills_per_order + 1):
+
+            leaves = 1000 - fill * 1000 // fills_per_order
+            message_type = 'OrderFill' if leaves == 0 else 'OrderPartialFill'
+            extra = FILL.format(order_id=order_id, quantity=1000 // fills_per_order, leaves=leaves)
+
+            content.append({'2': message_type, '3': build_message(message_type, order_id, extra)})
+
+    for item in content:
+        item['0'] = 'SubscriptionKey'
+        item['1'] = '123456789'
+
+    return {'data': [{'service': 'ACCT_ACTIVITY', 'timestamp': 1591023601000, 'command': 'SUBS', 'content': content}]}
+
+
+def parse_with_element_tree(message: dict) -> list:
+    """The same work done with `ElementTree`, for comparison."""
+
+    parsed = []
+
+    for content in message['data'][0]['content']:
+        root = ElementTree.fromstring(content['3'])
+        parsed.append({element.tag.rsplit('}', 1)[-1]: element.text for element in root.iter() if len(element) == 0})
+
+    return parsed
+
+
+def timed(label: str, function, count: int, repeat: int = 5):
+    """Runs a function a few times and prints the best time, and the time per message."""
+
+    best = None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    print('{:<24} {:>9.1f} ms {:>9.2f} us/message'.format(label, best * 1000, best * 1e6 / count))
+
+    return result
+
+
+if __name__ == '__main__':
+
+    # 500 orders, each entered, routed and filled in 10 pieces.
+    message = build_burst()
+    count = len(message['data'][0]['content'])
+    print('{:<24} {:>9}'.format('messages', count))
+
+    records = timed('parse_activity_message', lambda: parse_activity_message(message=message), count)
+    timed('ElementTree', lambda: parse_with_element_tree(message=message), count)
+
+    filled = sum(record.execution_quantity for record in records if record.message_type in ('OrderFill', 'OrderPartialFill'))
+    print('{:<24} {:>9.0f}'.format('filled quantity', filled))
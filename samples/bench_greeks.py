@@ -0,0 +1,99 @@
+import math
+import time
+import datetime
+from td.greeks import chain_greeks
+from td.greeks import chain_implied_volatility
+from td.greeks import option_greeks
+from td.option_chain import OptionChainColumns
+
+
+def build_chain(expirations: int = 20, strikes: int = 250, spot: float = 4000.0) -> dict:
+    """Builds a synthetic `get_options_chain` response, 20 x 250 x 2 is 10,000 contracts."""
+
+    response = {
+        'symbol': '$SPX.X',
+        'underlyingPrice': spot,
+        'interestRate': 0.5,
+        'volatility': 20.0,
+        'callExpDateMap': {},
+        'putExpDateMap': {}
+    }
+
+    first_expiration = datetime.date(2020, 4, 17)
+
+    for week in range(expirations):
+
+        expiration = first_expiration + datetime.timedelta(days=7 * week)
+        days_to_expiration = 3 + 7 * week
+        expiration_key = '{}:{}'.format(expiration.isoformat(), days_to_expiration)
+
+        for put_call, date_map in (('CALL', 'callExpDateMap'), ('PUT', 'putExpDateMap')):
+
+            strike_map = response[date_map].setdefault(expiration_key, {})
+
+            for step in range(strikes):
+
+                strike = spot * 0.5 + step * spot / strikes
+
+                # a bit of skew, so the solver has something to do.
+                volatility = 0.15 + 0.10 * abs(math.log(strike / spot))
+
+                contract = {
+                    'putCall': put_call,
+                    'symbol': 'SPX_{}{}{}'.format(expiration.strftime('%m%d%y'), put_call[0], int(strike)),
+                    'strikePrice': strike,
+                    'daysToExpiration': days_to_expiration,
+                    'volatility': 20.0,
+                    'multiplier': 100.0
+                }
+
+                strike_map['{:.1f}'.format(strike)] = [contract]
+
+                contract['mark'] = option_greeks(
+                    is_call=put_call == 'CALL',
+                    underlying=spot,
+                    strike=strike,
+                    time_to_expiry=days_to_expiration / 365.0,
+                    volatility=volatility,
+                    rate=0.005
+                )['price'][0]
+
+    return response
+
+
+def timed(label: str, function, repeat: int = 5):
+    """Runs a function a few times and prints the best time."""
+
+    best = None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    print('{:<32} {:>9.1f} ms'.format(label, best * 1000))
+
+    return result
+
+
+if __name__ == '__main__':
+
+    # Build the chain once, the API response is the same shape.
+    response = build_chain()
+    chain = timed('columnar chain', lambda: OptionChainColumns.from_response(response))
+    print('{:<32} {:>9}'.format('contracts', len(chain)))
+
+    # Solve the volatility, then the greeks at that volatility.
+    volatilities = timed('implied volatility', lambda: chain_implied_volatility(chain=chain))
+    greeks = timed('greeks', lambda: chain_greeks(chain=chain, volatility=volatilities))
+
+    solved = sum(1 for volatility in volatilities if volatility == volatility)
+    print('{:<32} {:>9}'.format('solved', solved))
+
+    # every solved contract should reprice to its mark.
+    error = max(
+        abs(price - mark) for price, mark, volatility in zip(greeks['price'], chain.mark, volatilities)
+        if volatility == volatility
+    )
+    print('{:<32} {:>9.2e}'.format('largest repricing error', error))
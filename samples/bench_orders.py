@@ -0,0 +1,105 @@
+import json
+import time
+from td.orders import Order
+from td.orders import OrderLeg
+from td.order_templates import OrderTemplateLibrary
+
+
+def build_leg(instruction: str, symbol: str, quantity: int) -> OrderLeg:
+    """Builds a single equity order leg."""
+
+    order_leg = OrderLeg()
+    order_leg.order_leg_instruction(instruction=instruction)
+    order_leg.order_leg_quantity(quantity=quantity)
+    order_leg.order_leg_asset(asset_type='EQUITY', symbol=symbol)
+
+    return order_leg
+
+
+def build_bracket(symbol: str, quantity: int, entry: float, take_profit: float, stop_loss: float) -> Order:
+    """Builds a bracket order, a limit entry that triggers a take profit and stop loss OCO."""
+
+    entry_order = Order()
+    entry_order.order_session(session='NORMAL')
+    entry_order.order_duration(duration='DAY')
+    entry_order.order_type(order_type='LIMIT')
+    entry_order.order_price(price=entry)
+    entry_order.order_strategy_type(order_strategy_type='TRIGGER')
+
+    entry_leg = build_leg(instruction='BUY', symbol=symbol, quantity=quantity)
+    entry_order.add_order_leg(order_leg=entry_leg)
+
+    exit_order = entry_order.create_child_order_strategy()
+    exit_order.order_strategy_type(order_strategy_type='OCO')
+
+    for order_type, price in (('LIMIT', take_profit), ('STOP', stop_loss)):
+
+        child_order = exit_order.create_child_order_strategy()
+        child_order.order_session(session='NORMAL')
+        child_order.order_duration(duration='GOOD_TILL_CANCEL')
+        child_order.order_type(order_type=order_type)
+        child_order.order_strategy_type(order_strategy_type='SINGLE')
+
+        if order_type == 'LIMIT':
+            child_order.order_price(price=price)
+        else:
+            child_order.stop_price(stop_price=price)
+
+        exit_leg = entry_leg.copy()
+        exit_leg.order_leg_instruction(instruction='SELL')
+        child_order.add_order_leg(order_leg=exit_leg)
+
+        exit_order.add_child_order_strategy(child_order_strategy=child_order)
+
+    entry_order.add_child_order_strategy(child_order_strategy=exit_order)
+
+    return entry_order
+
+
+def timed(label: str, function, count: int, repeat: int = 5):
+    """Runs a function a few times and prints the best time, and the time per order."""
+
+    best = None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    print('{:<24} {:>9.1f} ms {:>9.2f} us/order'.format(label, best * 1000, best * 1e6 / count))
+
+    return result
+
+
+if __name__ == '__main__':
+
+    # a basket of 10,000 bracket orders.
+    count = 10000
+    basket = [('SYM{}'.format(index), 100 + index % 50, 50.0 + index % 100) for index in range(count)]
+
+    orders = timed(
+        'build brackets',
+        lambda: [build_bracket(symbol, quantity, price, price * 1.05, price * 0.95) for symbol, quantity, price in basket],
+        count
+    )
+
+    timed('to_dict', lambda: [order.to_dict() for order in orders], count)
+    timed('to_json', lambda: [order.to_json() for order in orders], count)
+
+    # the JSON has to be the same payload.
+    assert all(json.loads(order.to_json()) == order.to_dict() for order in orders[:100])
+
+    # the same basket, from a template compiled once.
+    library = OrderTemplateLibrary()
+    library.add(name='bracket', payload=build_bracket('SYM', 100, 50.0, 52.5, 47.5).to_dict())
+
+    rows = [
+        {'symbol': symbol, 'quantity': quantity, 'price': price, 'child_0_0_price': price * 1.05, 'child_0_1_stop_price': price * 0.95}
+        for symbol, quantity, price in basket
+    ]
+
+    payloads = timed('template build_many', lambda: library.build_many('bracket', rows), count)
+    timed('template as_bytes', lambda: library.build_many('bracket', rows, as_bytes=True), count)
+
+    assert payloads[:100] == [order.to_dict() for order in orders[:100]]
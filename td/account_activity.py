@@ -0,0 +1,317 @@
+import re
+from typing import Dict
+from typing import List
+from xml.sax.saxutils import unescape
+
+# the execution block of a fill, its `Quantity` is not the contra side's.
+_EXECUTION_TAG = '<ExecutionInformation>'
+
+# the message types that aren't about an order.
+STATUS_MESSAGE_TYPES = frozenset(['SUBSCRIBED', 'ERROR'])
+
+
+def _float(value: str) -> float:
+    return float(value) if value else None
+
+
+def _int(value: str) -> int:
+    return int(value) if value else None
+
+
+def _upper(value: str) -> str:
+    return value.upper().replace(' ', '_') if value else None
+
+
+def _element_pattern(fields: tuple) -> re.Pattern:
+    """Compiles a pattern that matches only the elements of `fields` and captures their name and text."""
+
+    return re.compile('<({})>([^<]*)'.format('|'.join(re.escape(element) for element, _, _ in fields)))
+
+
+def _values(pattern: re.Pattern, message_data: str, start: int = 0, end: int = None) -> Dict[str, str]:
+    """Returns the text of the matched elements in a part of a message, keyed by element name, first one wins."""
+
+    return dict(reversed(pattern.findall(message_data, start, len(message_data) if end is None else end)))
+
+
+class AccountActivity():
+
+    """
+        An ACCT_ACTIVITY message about an order.
+
+        Every message type has its own subclass, the attributes are read from
+        the leaf elements of the XML message named in `element_fields`, along
+        with their converter. Values that are not in a message read as `None`.
+    """
+
+    __slots__ = ('message_type', 'account', 'subscription_key', 'activity_timestamp', 'order_id', 'symbol',
+                 'cusip', 'security_type', 'instruction', 'order_type', 'duration', 'quantity', 'limit_price',
+                 'stop_price', 'entered_time', 'last_updated')
+
+    # (element name, attribute name, converter), filled in by every subclass.
+    element_fields = (
+        ('ActivityTimestamp', 'activity_timestamp', str),
+        ('OrderKey', 'order_id', _int),
+        ('Symbol', 'symbol', str),
+        ('CUSIP', 'cusip', str),
+        ('SecurityType', 'security_type', str),
+        ('OrderInstructions', 'instruction', _upper),
+        ('OrderType', 'order_type', _upper),
+        ('OrderDuration', 'duration', _upper),
+        ('OriginalQuantity', 'quantity', _float),
+        ('Limit', 'limit_price', _float),
+        ('StopPrice', 'stop_price', _float),
+        ('OrderEnteredDateTime', 'entered_time', str),
+        ('LastUpdated', 'last_updated', str)
+    )
+
+    # elements read from the `ExecutionInformation` block only.
+    execution_fields = ()
+
+    # compiled from the fields above for every class.
+    _element_pattern = None
+    _execution_pattern = None
+
+    def __init__(self, message_type: str, account: str = None, subscription_key: str = None) -> None:
+
+        for name in self._all_slots:
+            setattr(self, name, None)
+
+        self.message_type = message_type
+        self.account = account
+        self.subscription_key = subscription_key
+
+    def __repr__(self) -> str:
+        return '<{} {}>'.format(type(self).__name__, self.to_dict())
+
+    def to_dict(self) -> dict:
+        """Returns the attributes that are set."""
+
+        return {
+            name: getattr(self, name) for name in self._all_slots if getattr(self, name) is not None
+        }
+
+    def _fill(self, message_data: str) -> None:
+        """Reads the attributes from the XML message."""
+
+        values = _values(self._element_pattern, message_data)
+
+        for element, name, converter in self.element_fields:
+            value = values.get(element)
+            if value is not None:
+                setattr(self, name, converter(unescape(value) if '&' in value else value))
+
+        start = message_data.find(_EXECUTION_TAG) if self.execution_fields else -1
+
+        if start < 0:
+            return None
+
+        # up to the closing tag, so what comes after the block isn't read as part of it.
+        values = _values(self._execution_pattern, message_data, start, message_data.find('</ExecutionInformation>', start))
+
+        for element, name, converter in self.execution_fields:
+            value = values.get(element)
+            if value is not None:
+                setattr(self, name, converter(value))
+
+
+class OrderEntryRequest(AccountActivity):
+    __slots__ = ()
+
+
+class OrderRoute(AccountActivity):
+
+    __slots__ = ('destination',)
+
+    element_fields = AccountActivity.element_fields + (('OrderDestination', 'destination', str),)
+
+
+class OrderActivation(AccountActivity):
+    __slots__ = ()
+
+
+class OrderFill(AccountActivity):
+
+    """A fill, `leaves_quantity` is what's left of the order after it."""
+
+    __slots__ = ('execution_type', 'execution_time', 'execution_quantity', 'execution_price', 'leaves_quantity',
+                 'execution_id', 'exchange', 'completion_code', 'trade_date')
+
+    element_fields = AccountActivity.element_fields + (
+        ('OrderCompletionCode', 'completion_code', str),
+        ('TradeDate', 'trade_date', str)
+    )
+
+    execution_fields = (
+        ('Type', 'execution_type', _upper),
+        ('Timestamp', 'execution_time', str),
+        ('Quantity', 'execution_quantity', _float),
+        ('ExecutionPrice', 'execution_price', _float),
+        ('LeavesQuantity', 'leaves_quantity', _float),
+        ('ID', 'execution_id', str),
+        ('Exchange', 'exchange', str)
+    )
+
+
+class OrderPartialFill(OrderFill):
+    __slots__ = ()
+
+
+class ManualExecution(OrderFill):
+    __slots__ = ()
+
+
+class BrokenTrade(OrderFill):
+    __slots__ = ()
+
+
+class OrderCancelRequest(AccountActivity):
+
+    __slots__ = ('pending_cancel_quantity',)
+
+    element_fields = AccountActivity.element_fields + (('PendingCancelQuantity', 'pending_cancel_quantity', _float),)
+
+
+class OrderCancelReplaceRequest(AccountActivity):
+
+    """A replace, `order_id` is the new order and `original_order_id` the one it replaces."""
+
+    __slots__ = ('original_order_id', 'pending_cancel_quantity')
+
+    element_fields = AccountActivity.element_fields + (
+        ('OriginalOrderId', 'original_order_id', _int),
+        ('PendingCancelQuantity', 'pending_cancel_quantity', _float)
+    )
+
+
+class TooLateToCancel(AccountActivity):
+    __slots__ = ()
+
+
+class UROUT(AccountActivity):
+
+    """An order cancelled by the market, `UROUT` is short for unsolicited route out."""
+
+    __slots__ = ('cancelled_quantity',)
+
+    element_fields = AccountActivity.element_fields + (('CancelledQuantity', 'cancelled_quantity', _float),)
+
+
+class OrderRejection(AccountActivity):
+
+    __slots__ = ('reject_code', 'reject_reason', 'reported_by')
+
+    element_fields = AccountActivity.element_fields + (
+        ('RejectCode', 'reject_code', str),
+        ('RejectReason', 'reject_reason', str),
+        ('ReportedBy', 'reported_by', str)
+    )
+
+
+# the record class of every message type, keyed by the value of field `2`.
+ACTIVITY_CLASSES = {
+    record_class.__name__: record_class for record_class in (
+        OrderEntryRequest, OrderRoute, OrderActivation, OrderFill, OrderPartialFill, ManualExecution,
+        BrokenTrade, OrderCancelRequest, OrderCancelReplaceRequest, TooLateToCancel, UROUT, OrderRejection
+    )
+}
+
+for _record_class in (AccountActivity,) + tuple(ACTIVITY_CLASSES.values()):
+
+    # every slot of a class, its own and the inherited ones, so records can be iterated in one pass.
+    _record_class._all_slots = tuple(
+        name for klass in reversed(_record_class.__mro__) for name in getattr(klass, '__slots__', ())
+    )
+
+    _record_class._element_pattern = _element_pattern(_record_class.element_fields)
+
+    if _record_class.execution_fields:
+        _record_class._execution_pattern = _element_pattern(_record_class.execution_fields)
+
+
+def parse_activity(message_type: str, message_data: str, account: str = None,
+                   subscription_key: str = None) -> AccountActivity:
+    """Parses a single ACCT_ACTIVITY message into its record.
+
+    The XML is never built into a tree. Every record class compiles a pattern
+    that matches only the elements it reads, so a message is read in a single
+    pass of a regular expression, several times faster than `ElementTree`.
+    TD sends the messages in a default namespace, so element names carry no
+    prefix and the namespace never has to be resolved.
+
+    Arguments:
+    ----
+    message_type {str} -- The message type, field `2`, like `OrderFill`.
+
+    message_data {str} -- The XML message, field `3`.
+
+    Keyword Arguments:
+    ----
+    account {str} -- The account, field `1`. (default: {None})
+
+    subscription_key {str} -- The subscription key, field `0`. (default: {None})
+
+    Returns:
+    ----
+    AccountActivity -- The record, `None` for the `SUBSCRIBED` and `ERROR` messages.
+        Message types without their own class are parsed as a plain `AccountActivity`.
+    """
+
+    if message_type in STATUS_MESSAGE_TYPES or not message_data:
+        return None
+
+    record = ACTIVITY_CLASSES.get(message_type, AccountActivity)(
+        message_type=message_type,
+        account=account,
+        subscription_key=subscription_key
+    )
+    record._fill(message_data)
+
+    return record
+
+
+def parse_activity_content(content: dict) -> AccountActivity:
+    """Parses an ACCT_ACTIVITY content item, as it comes in a stream message.
+
+    Arguments:
+    ----
+    content {dict} -- The content item, with fields `0` through `3`.
+
+    Returns:
+    ----
+    AccountActivity -- The record, `None` for messages that aren't about an order.
+    """
+
+    return parse_activity(
+        message_type=content.get('2'),
+        message_data=content.get('3'),
+        account=content.get('1'),
+        subscription_key=content.get('0')
+    )
+
+
+def parse_activity_message(message: dict) -> List[AccountActivity]:
+    """Parses every ACCT_ACTIVITY item of a decoded stream message.
+
+    Arguments:
+    ----
+    message {dict} -- A decoded stream message, other services are skipped.
+
+    Returns:
+    ----
+    List[AccountActivity] -- The records, in the order they were sent.
+    """
+
+    records = []
+
+    for service_result in message.get('data', ()):
+
+        if service_result['service'] != 'ACCT_ACTIVITY':
+            continue
+
+        for content in service_result['content']:
+            record = parse_activity_content(content=content)
+            if record is not None:
+                records.append(record)
+
+    return records
@@ -0,0 +1,246 @@
+from array import array
+from typing import Dict
+from typing import List
+
+NAN = float('nan')
+
+# the balance columns, and the `currentBalances` keys they're read from, first one found wins.
+BALANCE_COLUMNS = (
+    ('liquidation_value', ('liquidationValue',)),
+    ('cash_balance', ('cashBalance',)),
+    ('buying_power', ('buyingPower', 'cashAvailableForTrading')),
+    ('equity', ('equity', 'liquidationValue')),
+    ('long_market_value', ('longMarketValue',)),
+    ('short_market_value', ('shortMarketValue',)),
+    ('maintenance_requirement', ('maintenanceRequirement',)),
+    ('available_funds', ('availableFunds', 'cashAvailableForWithdrawal'))
+)
+
+
+def _number(value) -> float:
+
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return NAN
+
+
+class _Table():
+
+    """A set of columns that are filled row by row, `account` is always the first."""
+
+    # (column name, array type code or None for a list), filled in by every table.
+    columns = ()
+
+    def __init__(self) -> None:
+
+        for column_name, type_code in self.columns:
+            setattr(self, column_name, [] if type_code is None else array(type_code))
+
+    def __len__(self) -> int:
+        return len(self.account)
+
+    def _append(self, *values) -> None:
+
+        for (column_name, _), value in zip(self.columns, values):
+            getattr(self, column_name).append(value)
+
+    def extend(self, other: '_Table') -> None:
+        """Adds every row of another table of the same kind."""
+
+        for column_name, _ in self.columns:
+            getattr(self, column_name).extend(getattr(other, column_name))
+
+    def rows(self) -> List[tuple]:
+        """Returns the table as a list of tuples, in column order."""
+
+        return list(zip(*(getattr(self, column_name) for column_name, _ in self.columns)))
+
+    def to_dicts(self) -> List[dict]:
+        """Returns the table as a list of dictionaries."""
+
+        names = [column_name for column_name, _ in self.columns]
+        return [dict(zip(names, row)) for row in self.rows()]
+
+
+class PositionTable(_Table):
+
+    """The positions of one or more accounts, one row per position."""
+
+    columns = (
+        ('account', None), ('symbol', None), ('asset_type', None), ('long_quantity', 'd'),
+        ('short_quantity', 'd'), ('average_price', 'd'), ('market_value', 'd'), ('day_profit_loss', 'd')
+    )
+
+    def add(self, account: str, position: dict) -> None:
+
+        instrument = position.get('instrument', {})
+
+        self._append(
+            account,
+            instrument.get('symbol'),
+            instrument.get('assetType'),
+            _number(position.get('longQuantity', 0.0)),
+            _number(position.get('shortQuantity', 0.0)),
+            _number(position.get('averagePrice')),
+            _number(position.get('marketValue')),
+            _number(position.get('currentDayProfitLoss'))
+        )
+
+
+class OrderTable(_Table):
+
+    """The orders of one or more accounts, one row per order and child order."""
+
+    columns = (
+        ('account', None), ('order_id', 'q'), ('symbol', None), ('instruction', None), ('order_type', None),
+        ('status', None), ('quantity', 'd'), ('filled_quantity', 'd'), ('remaining_quantity', 'd'),
+        ('price', 'd'), ('entered_time', None)
+    )
+
+    def add(self, account: str, order: dict) -> None:
+
+        legs = order.get('orderLegCollection') or [{}]
+        leg = legs[0]
+
+        self._append(
+            account,
+            int(order.get('orderId', 0)),
+            leg.get('instrument', {}).get('symbol'),
+            leg.get('instruction'),
+            order.get('orderType'),
+            order.get('status'),
+            _number(order.get('quantity')),
+            _number(order.get('filledQuantity', 0.0)),
+            _number(order.get('remainingQuantity')),
+            _number(order.get('price', order.get('stopPrice'))),
+            order.get('enteredTime')
+        )
+
+        # conditional orders keep their children nested.
+        for child in order.get('childOrderStrategies', []):
+            self.add(account=account, order=child)
+
+
+class BalanceTable(_Table):
+
+    """The current balances of one or more accounts, one row per account."""
+
+    columns = (('account', None), ('account_type', None)) + tuple((column_name, 'd') for column_name, _ in BALANCE_COLUMNS)
+
+    def add(self, account: str, account_type: str, balances: dict) -> None:
+
+        values = []
+
+        for _, keys in BALANCE_COLUMNS:
+            values.append(next((_number(balances[key]) for key in keys if key in balances), NAN))
+
+        self._append(account, account_type, *values)
+
+
+class AccountSnapshot():
+
+    """
+        A single account at a point in time, with its balances, positions and
+        orders normalized into tables and the time its request took.
+    """
+
+    __slots__ = ('account', 'fetched_at', 'elapsed', 'balances', 'positions', 'orders', 'raw', 'error')
+
+    def __init__(self, account: str, response: dict, fetched_at: float, elapsed: float,
+                 error: Exception = None) -> None:
+        """Normalizes a `get_accounts` response of a single account.
+
+        Arguments:
+        ----
+        account {str} -- The account number.
+
+        response {dict} -- The response, `None` if the request failed.
+
+        fetched_at {float} -- When the request was sent, as a UNIX timestamp.
+
+        elapsed {float} -- How long the request took, in seconds.
+
+        Keyword Arguments:
+        ----
+        error {Exception} -- The exception the request raised, if it did. (default: {None})
+        """
+
+        self.account = account
+        self.fetched_at = fetched_at
+        self.elapsed = elapsed
+        self.raw = response
+        self.error = error
+        self.balances = BalanceTable()
+        self.positions = PositionTable()
+        self.orders = OrderTable()
+
+        if not response:
+            return None
+
+        securities_account = response.get('securitiesAccount', response)
+
+        self.balances.add(
+            account=account,
+            account_type=securities_account.get('type'),
+            balances=securities_account.get('currentBalances', {})
+        )
+
+        for position in securities_account.get('positions', []):
+            self.positions.add(account=account, position=position)
+
+        for order in securities_account.get('orderStrategies', []):
+            self.orders.add(account=account, order=order)
+
+    @property
+    def ok(self) -> bool:
+        """`False` if the request for this account failed."""
+
+        return bool(self.raw)
+
+    def __repr__(self) -> str:
+        return '<AccountSnapshot {} positions={} orders={} elapsed={:.3f}s>'.format(
+            self.account, len(self.positions), len(self.orders), self.elapsed
+        )
+
+
+class AccountSnapshots():
+
+    """The snapshots of several accounts, with combined tables across all of them."""
+
+    def __init__(self, snapshots: List[AccountSnapshot], elapsed: float) -> None:
+        """Combines the snapshots.
+
+        Arguments:
+        ----
+        snapshots {List[AccountSnapshot]} -- The snapshot of every account.
+
+        elapsed {float} -- The wall clock time of the whole fetch, in seconds.
+        """
+
+        self.snapshots: Dict[str, AccountSnapshot] = {snapshot.account: snapshot for snapshot in snapshots}
+        self.elapsed = elapsed
+        self.balances = BalanceTable()
+        self.positions = PositionTable()
+        self.orders = OrderTable()
+
+        for snapshot in snapshots:
+            self.balances.extend(snapshot.balances)
+            self.positions.extend(snapshot.positions)
+            self.orders.extend(snapshot.orders)
+
+    def __getitem__(self, account: str) -> AccountSnapshot:
+        return self.snapshots[account]
+
+    def __len__(self) -> int:
+        return len(self.snapshots)
+
+    def timings(self) -> Dict[str, float]:
+        """Returns how long the request of every account took, in seconds."""
+
+        return {account: snapshot.elapsed for account, snapshot in self.snapshots.items()}
+
+    def failed(self) -> List[str]:
+        """Returns the accounts whose request failed."""
+
+        return [account for account, snapshot in self.snapshots.items() if not snapshot.ok]
@@ -0,0 +1,283 @@
+from array import array
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+
+class ActivesGroup():
+
+    """
+        A single ranked list of an ACTIVES message, the most active symbols by
+        trades (group `0`) or by shares (group `1`).
+
+        The ranking is stored as three parallel columns, the rank of a symbol
+        is its position plus one.
+    """
+
+    __slots__ = ('group_id', 'count', 'total_volume', 'symbols', 'volumes', 'percents')
+
+    def __init__(self, group_id: str, count: int, total_volume: int) -> None:
+
+        self.group_id = group_id
+        self.count = count
+        self.total_volume = total_volume
+        self.symbols: List[str] = []
+        self.volumes = array('q')
+        self.percents = array('d')
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __repr__(self) -> str:
+        return '<ActivesGroup {} {}>'.format(self.group_id, self.symbols)
+
+    def ranks(self) -> Dict[str, int]:
+        """Returns the rank of every symbol, starting at 1."""
+
+        return {symbol: rank for rank, symbol in enumerate(self.symbols, start=1)}
+
+    def rows(self) -> List[Tuple[int, str, int, float]]:
+        """Returns the ranking as `(rank, symbol, volume, percent)` rows."""
+
+        return list(zip(range(1, len(self.symbols) + 1), self.symbols, self.volumes, self.percents))
+
+
+class ActivesTable():
+
+    """The ranking tables of one ACTIVES message, for a single venue and duration."""
+
+    __slots__ = ('venue', 'key', 'message_id', 'duration', 'timestamp', 'display_time', 'groups')
+
+    def __init__(self, venue: str, key: str, message_id: str, duration: str, timestamp: str,
+                 display_time: str) -> None:
+
+        self.venue = venue
+        self.key = key
+        self.message_id = message_id
+        self.duration = duration
+        self.timestamp = timestamp
+        self.display_time = display_time
+        self.groups: Dict[str, ActivesGroup] = {}
+
+    def __repr__(self) -> str:
+        return '<ActivesTable {} {} groups={}>'.format(self.venue, self.duration, list(self.groups))
+
+
+class RankChange():
+
+    """
+        A symbol that moved in a ranking. `old_rank` is `None` for a symbol that
+        entered the ranking and `new_rank` is `None` for one that dropped out.
+    """
+
+    __slots__ = ('venue', 'duration', 'group_id', 'symbol', 'old_rank', 'new_rank')
+
+    def __init__(self, venue: str, duration: str, group_id: str, symbol: str, old_rank: int, new_rank: int) -> None:
+
+        self.venue = venue
+        self.duration = duration
+        self.group_id = group_id
+        self.symbol = symbol
+        self.old_rank = old_rank
+        self.new_rank = new_rank
+
+    def __repr__(self) -> str:
+        return '<RankChange {} {} {} {}: {} -> {}>'.format(
+            self.venue, self.duration, self.group_id, self.symbol, self.old_rank, self.new_rank
+        )
+
+
+def _to_int(value: str) -> int:
+
+    try:
+        return int(value)
+    except ValueError:
+        return int(float(value or 0))
+
+
+def parse_actives(service_name: str, content: dict) -> ActivesTable:
+    """Parses the content of an ACTIVES message into its ranking tables.
+
+    The payload, in field `1`, is `;` delimited: the message id, the sample
+    duration, the start time, the display time, the number of groups and then
+    one section per group. Each group is `:` delimited: the group id, the number
+    of entries, the total volume and then a `symbol:volume:percent` triple per
+    entry, already in rank order.
+
+    Arguments:
+    ----
+    service_name {str} -- The service, like `ACTIVES_NASDAQ`.
+
+    content {dict} -- The content item.
+
+    Returns:
+    ----
+    ActivesTable -- The parsed tables.
+    """
+
+    # the values can come padded with spaces, like `11: 40: 00`, symbols never have any.
+    parts = content['1'].replace(' ', '').split(';')
+
+    table = ActivesTable(
+        venue=service_name.replace('ACTIVES_', '', 1),
+        key=content.get('key'),
+        message_id=parts[0],
+        duration=parts[1],
+        timestamp=parts[2],
+        display_time=parts[3]
+    )
+
+    for group_section in parts[5:]:
+
+        if not group_section:
+            continue
+
+        values = group_section.split(':')
+        group = ActivesGroup(group_id=values[0], count=_to_int(values[1]), total_volume=_to_int(values[2]))
+
+        symbols = values[3::3]
+        volumes = values[4::3]
+        percents = values[5::3]
+
+        # a truncated triple at the end is dropped.
+        for symbol, volume, percent in zip(symbols, volumes, percents):
+            group.symbols.append(symbol)
+            group.volumes.append(_to_int(volume))
+            group.percents.append(float(percent or 0))
+
+        table.groups[group.group_id] = group
+
+    return table
+
+
+class ActivesTracker():
+
+    """
+        Keeps the latest ACTIVES ranking of every venue and duration and reports
+        how the rankings move.
+
+        Usage:
+        ----
+            tracker = TDStreamingClient.actives_rankings(callbacks=[print])
+    """
+
+    def __init__(self, callbacks: List[Callable] = None) -> None:
+        """Initalizes the tracker.
+
+        Keyword Arguments:
+        ----
+        callbacks {List[Callable]} -- Functions called with the table and the list of
+            `RankChange` events whenever a ranking changes. (default: {None})
+        """
+
+        self.callbacks = list(callbacks or [])
+
+        # keyed by (venue, duration).
+        self.tables: Dict[Tuple[str, str], ActivesTable] = {}
+
+    def update(self, service_name: str, content: dict) -> List[RankChange]:
+        """Parses an ACTIVES content item and compares it with the previous ranking.
+
+        Arguments:
+        ----
+        service_name {str} -- The service, like `ACTIVES_NASDAQ`.
+
+        content {dict} -- The content item.
+
+        Returns:
+        ----
+        List[RankChange] -- The symbols that entered, left or moved in a ranking. The
+            first table of a venue and duration reports every symbol as entering.
+        """
+
+        table = parse_actives(service_name=service_name, content=content)
+        table_key = (table.venue, table.duration)
+        previous = self.tables.get(table_key)
+        self.tables[table_key] = table
+
+        changes = []
+
+        for group_id, group in table.groups.items():
+
+            previous_group = previous.groups.get(group_id) if previous is not None else None
+
+            # most messages don't change the order at all.
+            if previous_group is not None and previous_group.symbols == group.symbols:
+                continue
+
+            old_ranks = previous_group.ranks() if previous_group is not None else {}
+
+            for new_rank, symbol in enumerate(group.symbols, start=1):
+
+                old_rank = old_ranks.pop(symbol, None)
+
+                if old_rank != new_rank:
+                    changes.append(RankChange(table.venue, table.duration, group_id, symbol, old_rank, new_rank))
+
+            for symbol, old_rank in old_ranks.items():
+                changes.append(RankChange(table.venue, table.duration, group_id, symbol, old_rank, None))
+
+        if changes:
+            for callback in self.callbacks:
+                callback(table, changes)
+
+        return changes
+
+    def process_message(self, message: dict) -> List[RankChange]:
+        """Applies every ACTIVES item of a stream message.
+
+        Arguments:
+        ----
+        message {dict} -- A decoded stream message, other services are skipped.
+
+        Returns:
+        ----
+        List[RankChange] -- The rank changes of every item.
+        """
+
+        if 'data' not in message:
+            return []
+
+        changes = []
+
+        for service_result in message['data']:
+
+            service_name = service_result['service']
+
+            if not service_name.startswith('ACTIVES_'):
+                continue
+
+            for content in service_result['content']:
+                changes.extend(self.update(service_name=service_name, content=content))
+
+        return changes
+
+    def on_record(self, service_name: str, service_timestamp: int, content: dict) -> None:
+        """`StreamHub` callback, applies a single ACTIVES item."""
+
+        self.update(service_name=service_name, content=content)
+
+    def ranking(self, venue: str, duration: str, group_id: str = '0') -> ActivesGroup:
+        """Returns the latest ranking of a venue, duration and group.
+
+        Arguments:
+        ----
+        venue {str} -- The venue, like `NASDAQ`.
+
+        duration {str} -- The sample duration, as sent in the message.
+
+        Keyword Arguments:
+        ----
+        group_id {str} -- The group, `0` for trades and `1` for shares. (default: {'0'})
+
+        Raises:
+        ----
+        KeyError: If the ranking hasn't been received yet.
+
+        Returns:
+        ----
+        ActivesGroup -- The ranking.
+        """
+
+        return self.tables[(venue, duration)].groups[group_id]
@@ -0,0 +1,338 @@
+import time
+import asyncio
+from array import array
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+# the level two services, they all share the same nested book layout.
+BOOK_SERVICES = frozenset(['LISTED_BOOK', 'NASDAQ_BOOK', 'OPTIONS_BOOK', 'FUTURES_BOOK', 'FOREX_BOOK',
+                           'FUTURES_OPTIONS_BOOK'])
+
+NAN = float('nan')
+
+
+class OrderBook():
+
+    """
+        The price levels of a single book, stored in flat arrays.
+
+        Every level two update carries the full list of levels, so the arrays
+        are refilled in place on each update instead of building new objects.
+    """
+
+    __slots__ = ('symbol', 'service', 'book_time', 'bid_prices', 'bid_sizes', 'ask_prices', 'ask_sizes')
+
+    def __init__(self, symbol: str, service: str) -> None:
+
+        self.symbol = symbol
+        self.service = service
+        self.book_time = 0
+        self.bid_prices = array('d')
+        self.bid_sizes = array('d')
+        self.ask_prices = array('d')
+        self.ask_sizes = array('d')
+
+    @staticmethod
+    def _fill(prices: array, sizes: array, levels: list) -> None:
+        """Replaces the contents of a side of the book with the levels of an update."""
+
+        del prices[:]
+        del sizes[:]
+
+        for level in levels:
+            prices.append(float(level['0']))
+            sizes.append(float(level['1']))
+
+    def update(self, content: dict) -> None:
+        """Applies a level two update.
+
+        Arguments:
+        ----
+        content {dict} -- The content of the update, `1` is the book time and `2`
+            and `3` are the bid and ask levels.
+        """
+
+        self.book_time = content.get('1', self.book_time)
+
+        if '2' in content:
+            self._fill(self.bid_prices, self.bid_sizes, content['2'] or ())
+
+        if '3' in content:
+            self._fill(self.ask_prices, self.ask_sizes, content['3'] or ())
+
+
+class BookMetrics():
+
+    """
+        The analytics of a book at a point in time.
+
+        `imbalance` is `(bid size - ask size) / (bid size + ask size)` at the top of
+        the book, between -1 and 1. `microprice` is the mid weighted towards the
+        side with less size. `weighted_mid` is the mid of the size weighted average
+        price of each side over the first `depth_levels` levels.
+    """
+
+    __slots__ = ('symbol', 'service', 'book_time', 'best_bid', 'best_ask', 'bid_size', 'ask_size', 'spread',
+                 'imbalance', 'microprice', 'weighted_mid', 'updates')
+
+    def __init__(self, symbol: str, service: str) -> None:
+
+        self.symbol = symbol
+        self.service = service
+        self.book_time = 0
+        self.best_bid = NAN
+        self.best_ask = NAN
+        self.bid_size = 0.0
+        self.ask_size = 0.0
+        self.spread = NAN
+        self.imbalance = NAN
+        self.microprice = NAN
+        self.weighted_mid = NAN
+        self.updates = 0
+
+    def __repr__(self) -> str:
+        return '<BookMetrics {} bid={} ask={} imbalance={:.4f} microprice={:.4f} weighted_mid={:.4f}>'.format(
+            self.symbol, self.best_bid, self.best_ask, self.imbalance, self.microprice, self.weighted_mid
+        )
+
+    def copy(self) -> 'BookMetrics':
+        metrics = BookMetrics.__new__(BookMetrics)
+
+        for name in self.__slots__:
+            setattr(metrics, name, getattr(self, name))
+
+        return metrics
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def _weighted_price(prices: array, sizes: array, depth_levels: int) -> float:
+    """Returns the size weighted average price of the first levels of a side."""
+
+    total_size = 0.0
+    total_value = 0.0
+
+    for price, size in zip(prices[:depth_levels], sizes[:depth_levels]):
+        total_size += size
+        total_value += price * size
+
+    if total_size == 0.0:
+        return NAN
+
+    return total_value / total_size
+
+
+class BookAnalytics():
+
+    """
+        Computes order book analytics from the level two stream.
+
+        Each update only recomputes the book it belongs to. The latest metrics
+        of every book are kept in `metrics`, and the books that changed are
+        handed to the callbacks at most once per `interval`, so a busy book
+        doesn't flood its consumers. A book that goes quiet still has its last
+        change emitted once the interval is up, by `emit_due` or the
+        `emit_periodically` task the streaming client starts for it.
+
+        Usage:
+        ----
+            analytics = TDStreamingClient.level_two_analytics(interval=0.5, callbacks=[print])
+    """
+
+    def __init__(self, depth_levels: int = 5, interval: float = 1.0, callbacks: List[Callable] = None) -> None:
+        """Initalizes the analytics.
+
+        Keyword Arguments:
+        ----
+        depth_levels {int} -- The number of levels of each side used by the weighted
+            mid. (default: {5})
+
+        interval {float} -- The least number of seconds between two emits, `0` emits
+            on every update. (default: {1.0})
+
+        callbacks {List[Callable]} -- Functions called with the list of `BookMetrics`
+            that changed since the last emit. (default: {None})
+        """
+
+        self.depth_levels = depth_levels
+        self.interval = interval
+        self.callbacks = list(callbacks or [])
+
+        # keyed by (service, symbol), a symbol can be on more than one book.
+        self.books: Dict[Tuple[str, str], OrderBook] = {}
+        self.metrics: Dict[Tuple[str, str], BookMetrics] = {}
+
+        self._changed: Dict[Tuple[str, str], BookMetrics] = {}
+        self._last_emit = 0.0
+
+    def process_message(self, message: dict) -> List[BookMetrics]:
+        """Applies every level two update of a stream message.
+
+        Arguments:
+        ----
+        message {dict} -- A decoded stream message, other services are skipped.
+
+        Returns:
+        ----
+        List[BookMetrics] -- The metrics that were emitted, empty if it wasn't time to emit yet.
+        """
+
+        if 'data' in message:
+            service_results = message['data']
+        elif 'snapshot' in message:
+            service_results = message['snapshot']
+        else:
+            return []
+
+        for service_result in service_results:
+
+            service_name = service_result['service']
+
+            if service_name not in BOOK_SERVICES:
+                continue
+
+            for content in service_result['content']:
+                self.update(service_name=service_name, content=content)
+
+        return self.emit_due()
+
+    def on_record(self, service_name: str, service_timestamp: int, content: dict) -> None:
+        """`StreamHub` callback, applies a single level two update."""
+
+        self.update(service_name=service_name, content=content)
+        self.emit_due()
+
+    def update(self, service_name: str, content: dict) -> BookMetrics:
+        """Applies a single level two update and recomputes the metrics of its book.
+
+        Arguments:
+        ----
+        service_name {str} -- The service of the update, like `NASDAQ_BOOK`.
+
+        content {dict} -- The content of the update.
+
+        Returns:
+        ----
+        BookMetrics -- The metrics of the book.
+        """
+
+        symbol = content['key']
+        book_key = (service_name, symbol)
+        book = self.books.get(book_key)
+
+        if book is None:
+            book = self.books[book_key] = OrderBook(symbol=symbol, service=service_name)
+            self.metrics[book_key] = BookMetrics(symbol=symbol, service=service_name)
+
+        book.update(content=content)
+
+        metrics = self.metrics[book_key]
+        metrics.book_time = book.book_time
+        metrics.updates += 1
+
+        bid_prices = book.bid_prices
+        ask_prices = book.ask_prices
+
+        if bid_prices and ask_prices:
+
+            best_bid = bid_prices[0]
+            best_ask = ask_prices[0]
+            bid_size = book.bid_sizes[0]
+            ask_size = book.ask_sizes[0]
+            top_size = bid_size + ask_size
+
+            metrics.best_bid = best_bid
+            metrics.best_ask = best_ask
+            metrics.bid_size = bid_size
+            metrics.ask_size = ask_size
+            metrics.spread = best_ask - best_bid
+
+            if top_size > 0.0:
+                metrics.imbalance = (bid_size - ask_size) / top_size
+                metrics.microprice = (best_bid * ask_size + best_ask * bid_size) / top_size
+            else:
+                metrics.imbalance = NAN
+                metrics.microprice = (best_bid + best_ask) / 2.0
+
+            metrics.weighted_mid = (
+                _weighted_price(bid_prices, book.bid_sizes, self.depth_levels) +
+                _weighted_price(ask_prices, book.ask_sizes, self.depth_levels)
+            ) / 2.0
+
+        # a one sided book has no mid.
+        else:
+            metrics.best_bid = bid_prices[0] if bid_prices else NAN
+            metrics.best_ask = ask_prices[0] if ask_prices else NAN
+            metrics.bid_size = book.bid_sizes[0] if bid_prices else 0.0
+            metrics.ask_size = book.ask_sizes[0] if ask_prices else 0.0
+            metrics.spread = NAN
+            metrics.imbalance = NAN
+            metrics.microprice = NAN
+            metrics.weighted_mid = NAN
+
+        self._changed[book_key] = metrics
+
+        return metrics
+
+    def emit_due(self) -> List[BookMetrics]:
+        """Emits the changed books if the interval has passed since the last emit.
+
+        Returns:
+        ----
+        List[BookMetrics] -- The metrics that were emitted, empty if there was
+            nothing to emit or it wasn't time yet.
+        """
+
+        if not self._changed:
+            return []
+
+        now = time.monotonic()
+
+        if now - self._last_emit < self.interval:
+            return []
+
+        self._last_emit = now
+
+        return self.flush()
+
+    async def emit_periodically(self) -> None:
+        """Emits the pending changes once their interval is up, even if no other update comes in.
+
+        Updates only emit when they arrive, so without this the last change of a
+        book that goes quiet would wait for the next message. Runs until cancelled,
+        and returns right away when `interval` is `0`, every update emits then.
+        """
+
+        while self.interval > 0:
+
+            delay = self._last_emit + self.interval - time.monotonic()
+
+            await asyncio.sleep(delay if delay > 0 else self.interval)
+
+            self.emit_due()
+
+    def flush(self) -> List[BookMetrics]:
+        """Emits the changed books right away.
+
+        Returns:
+        ----
+        List[BookMetrics] -- The metrics that were emitted, `updates` holds the
+            number of updates folded into each one.
+        """
+
+        emitted = []
+
+        # hand out copies, the live metrics keep changing with the book.
+        for metrics in self._changed.values():
+            emitted.append(metrics.copy())
+            metrics.updates = 0
+
+        self._changed = {}
+
+        for callback in self.callbacks:
+            callback(emitted)
+
+        return emitted
@@ -0,0 +1,163 @@
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Union
+from td.option_chain import OptionChainColumns
+
+# the columns compared between snapshots, the static ones (strike, expiry) never change.
+TRACKED_COLUMNS = (
+    'bid', 'ask', 'last', 'mark', 'bid_size', 'ask_size', 'total_volume', 'open_interest',
+    'volatility', 'delta', 'gamma', 'theta', 'vega', 'rho'
+)
+
+
+class ChainDelta():
+
+    '''
+        The difference between two snapshots of the same option chain.
+
+        `added` and `removed` hold contract symbols, `changed` maps the
+        symbol of every contract that changed to the new values of only
+        the columns that changed.
+    '''
+
+    __slots__ = ('underlying', 'added', 'removed', 'changed')
+
+    def __init__(self, underlying: str, added: List[str], removed: List[str], changed: Dict[str, dict]) -> None:
+
+        self.underlying = underlying
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def __repr__(self) -> str:
+        return '<ChainDelta {} added={} removed={} changed={}>'.format(
+            self.underlying, len(self.added), len(self.removed), len(self.changed)
+        )
+
+
+class OptionChainTracker():
+
+    '''
+        Tracks repeated polls of option chains and reports only what changed.
+
+        The tracker keeps the last snapshot of every underlying in a compact
+        form, a dictionary of contract symbol to a tuple of the tracked
+        columns. Each new poll is turned into the same form and compared with
+        the previous one in a single pass, whole tuples are compared first so
+        only contracts that actually changed are inspected column by column.
+    '''
+
+    def __init__(self, columns: Tuple[str] = TRACKED_COLUMNS) -> None:
+        '''
+            Initalizes the tracker.
+
+            NAME: columns
+            DESC: The `OptionChainColumns` columns to compare, defaults to `TRACKED_COLUMNS`.
+            TYPE: Tuple<String>
+        '''
+
+        self.columns = tuple(columns)
+        self.snapshots: Dict[str, Dict[str, tuple]] = {}
+
+    def _snapshot(self, chain: OptionChainColumns) -> Dict[str, tuple]:
+        '''
+            Turns a chain into its compact form, symbol -> tuple of tracked values.
+        '''
+
+        columns = []
+
+        for column_name in self.columns:
+
+            column = getattr(chain, column_name)
+
+            # NaN never equals itself, store it as None so missing values compare equal.
+            if column.typecode == 'd':
+                column = [None if value != value else value for value in column]
+
+            columns.append(column)
+
+        return dict(zip(chain.symbol, zip(*columns)))
+
+    def update(self, chain: Union[dict, OptionChainColumns], underlying: str = None) -> ChainDelta:
+        '''
+            Compares a new poll of a chain with the previous one and keeps it as the new snapshot.
+
+            NAME: chain
+            DESC: Either a `get_options_chain` response or an `OptionChainColumns`.
+            TYPE: Dictionary | OptionChainColumns
+
+            NAME: underlying
+            DESC: The key to store the snapshot under, defaults to the symbol of the chain.
+            TYPE: String
+
+            RTYPE: ChainDelta, the first poll of an underlying reports every contract as added.
+        '''
+
+        if not isinstance(chain, OptionChainColumns):
+            chain = OptionChainColumns.from_response(response=chain)
+
+        underlying = underlying or chain.underlying
+        current = self._snapshot(chain=chain)
+        previous = self.snapshots.get(underlying, {})
+
+        added = []
+        changed = {}
+        columns = self.columns
+
+        for symbol, values in current.items():
+
+            previous_values = previous.get(symbol)
+
+            if previous_values is None:
+                added.append(symbol)
+            elif previous_values != values:
+                changed[symbol] = {
+                    column_name: value for column_name, value, previous_value in zip(columns, values, previous_values)
+                    if value != previous_value
+                }
+
+        # anything left over in the previous snapshot has disappeared from the chain.
+        if len(previous) + len(added) == len(current):
+            removed = []
+        else:
+            removed = [symbol for symbol in previous if symbol not in current]
+
+        self.snapshots[underlying] = current
+
+        return ChainDelta(underlying=underlying, added=added, removed=removed, changed=changed)
+
+    def snapshot(self, underlying: str) -> Dict[str, dict]:
+        '''
+            Returns the last snapshot of an underlying, keyed by contract symbol.
+
+            NAME: underlying
+            DESC: The underlying symbol.
+            TYPE: String
+
+            RTYPE: Dictionary
+        '''
+
+        if underlying not in self.snapshots:
+            raise KeyError('The underlying you provided is not being tracked.')
+
+        return {
+            symbol: dict(zip(self.columns, values)) for symbol, values in self.snapshots[underlying].items()
+        }
+
+    def clear(self, underlying: str = None) -> None:
+        '''
+            Forgets the snapshot of an underlying, or of every underlying.
+
+            NAME: underlying
+            DESC: The underlying symbol, if `None` every snapshot is removed.
+            TYPE: String
+        '''
+
+        if underlying is None:
+            self.snapshots = {}
+        else:
+            self.snapshots.pop(underlying, None)
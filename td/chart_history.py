@@ -0,0 +1,287 @@
+from array import array
+from typing import Dict
+from typing import List
+from typing import Set
+
+# the candle fields of a CHART_HISTORY_FUTURES snapshot, by field id.
+CHART_HISTORY_FIELDS = (('0', 'datetime'), ('1', 'open'), ('2', 'high'), ('3', 'low'), ('4', 'close'), ('5', 'volume'))
+
+# the longest range a single CHART_HISTORY_FUTURES request covers, in days, per frequency.
+CHART_HISTORY_SPANS = {
+    'm1': 7,
+    'm5': 30,
+    'm10': 60,
+    'm30': 180,
+    'h1': 365,
+    'd1': 3650,
+    'w1': 7300,
+    'n1': 10950
+}
+
+MILLISECONDS_PER_DAY = 24 * 60 * 60 * 1000
+
+
+class CandleColumns():
+
+    """
+        OHLCV candles of a single symbol, stored as one flat array per field.
+
+        Futures history from the streaming API and equity history from
+        `get_price_history` both end up in this shape, so they can be used
+        interchangeably. Candles are kept in time order.
+    """
+
+    __slots__ = ('symbol', 'datetime', 'open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, symbol: str = None) -> None:
+
+        self.symbol = symbol
+        self.datetime = array('q')
+        self.open = array('d')
+        self.high = array('d')
+        self.low = array('d')
+        self.close = array('d')
+        self.volume = array('d')
+
+    def __len__(self) -> int:
+        return len(self.datetime)
+
+    def __repr__(self) -> str:
+        return '<CandleColumns {} candles={}>'.format(self.symbol, len(self))
+
+    def append(self, datetime: int, open: float, high: float, low: float, close: float, volume: float) -> None:
+        """Adds a candle to the end of the columns."""
+
+        self.datetime.append(int(datetime))
+        self.open.append(float(open))
+        self.high.append(float(high))
+        self.low.append(float(low))
+        self.close.append(float(close))
+        self.volume.append(float(volume))
+
+    @classmethod
+    def from_price_history(cls, response: dict) -> 'CandleColumns':
+        """Builds the columns from a `get_price_history` response.
+
+        Arguments:
+        ----
+        response {dict} -- The response, with a `candles` list.
+
+        Returns:
+        ----
+        CandleColumns -- The candles.
+        """
+
+        candles = cls(symbol=response.get('symbol'))
+
+        for candle in response.get('candles', []):
+            candles.append(candle['datetime'], candle['open'], candle['high'], candle['low'], candle['close'],
+                           candle['volume'])
+
+        return candles
+
+    @classmethod
+    def from_chart_history(cls, content: dict) -> 'CandleColumns':
+        """Builds the columns from a single CHART_HISTORY_FUTURES content item.
+
+        Arguments:
+        ----
+        content {dict} -- The content item, the candles are in field `3`.
+
+        Returns:
+        ----
+        CandleColumns -- The candles.
+        """
+
+        candles = cls(symbol=content.get('key'))
+
+        for candle in content.get('3') or []:
+            candles.append(candle['0'], candle['1'], candle['2'], candle['3'], candle['4'], candle['5'])
+
+        return candles
+
+    @classmethod
+    def stitch(cls, parts: List['CandleColumns'], symbol: str = None) -> 'CandleColumns':
+        """Joins several ranges of candles into one, in time order.
+
+        Ranges that follow each other are simply concatenated, overlapping ranges
+        are merged by timestamp, keeping the candle of the later part.
+
+        Arguments:
+        ----
+        parts {List[CandleColumns]} -- The ranges, in any order.
+
+        Keyword Arguments:
+        ----
+        symbol {str} -- The symbol of the result, defaults to the symbol of the
+            first part. (default: {None})
+
+        Returns:
+        ----
+        CandleColumns -- The stitched candles.
+        """
+
+        parts = sorted((part for part in parts if len(part)), key=lambda part: part.datetime[0])
+        stitched = cls(symbol=symbol or next((part.symbol for part in parts), None))
+
+        # the usual case, every range starts after the previous one ends.
+        if all(before.datetime[-1] < after.datetime[0] for before, after in zip(parts, parts[1:])):
+
+            for part in parts:
+                for name in cls.__slots__[1:]:
+                    getattr(stitched, name).extend(getattr(part, name))
+
+            return stitched
+
+        by_time = {}
+
+        for part in parts:
+            for row in zip(part.datetime, part.open, part.high, part.low, part.close, part.volume):
+                by_time[row[0]] = row
+
+        for datetime in sorted(by_time):
+            stitched.append(*by_time[datetime])
+
+        return stitched
+
+    def to_candles(self) -> List[dict]:
+        """Returns the candles the way `get_price_history` does.
+
+        Returns:
+        ----
+        List[dict] -- One dictionary per candle.
+        """
+
+        return [
+            {'open': open, 'high': high, 'low': low, 'close': close, 'volume': volume, 'datetime': datetime}
+            for datetime, open, high, low, close, volume in zip(
+                self.datetime, self.open, self.high, self.low, self.close, self.volume
+            )
+        ]
+
+    def to_price_history(self) -> dict:
+        """Returns the candles as a `get_price_history` response."""
+
+        return {'candles': self.to_candles(), 'symbol': self.symbol, 'empty': len(self) == 0}
+
+
+def split_range(start_time: int, end_time: int, max_span: int) -> List[tuple]:
+    """Splits a time range into consecutive ranges no longer than `max_span`.
+
+    Arguments:
+    ----
+    start_time {int} -- The start, in milliseconds since epoch.
+
+    end_time {int} -- The end, in milliseconds since epoch.
+
+    max_span {int} -- The longest range, in milliseconds.
+
+    Raises:
+    ----
+    ValueError: If the range is empty or `max_span` is not positive.
+
+    Returns:
+    ----
+    List[tuple] -- The `(start_time, end_time)` ranges.
+    """
+
+    if end_time <= start_time or max_span <= 0:
+        raise ValueError('The end time must be after the start time and max_span must be positive.')
+
+    ranges = []
+
+    while start_time < end_time:
+        range_end = min(start_time + max_span, end_time)
+        ranges.append((start_time, range_end))
+        start_time = range_end
+
+    return ranges
+
+
+class ChartHistoryAssembler():
+
+    """
+        Collects CHART_HISTORY_FUTURES snapshots and stitches them per symbol.
+
+        When a range is split over several requests, register the request ids
+        with `expect` and `is_complete` tells when every piece has arrived.
+    """
+
+    def __init__(self) -> None:
+
+        self.parts: Dict[str, List[CandleColumns]] = {}
+        self.pending: Dict[str, Set[str]] = {}
+
+    def expect(self, symbol: str, request_ids: List[str]) -> None:
+        """Registers the requests that make up the history of a symbol.
+
+        Arguments:
+        ----
+        symbol {str} -- The futures symbol, like `/ES`.
+
+        request_ids {List[str]} -- The request ids of the GET requests.
+        """
+
+        self.pending.setdefault(symbol, set()).update(str(request_id) for request_id in request_ids)
+
+    def add(self, content: dict) -> CandleColumns:
+        """Adds a single CHART_HISTORY_FUTURES content item.
+
+        Arguments:
+        ----
+        content {dict} -- The content item, field `0` is the request id.
+
+        Returns:
+        ----
+        CandleColumns -- The candles of the item.
+        """
+
+        candles = CandleColumns.from_chart_history(content=content)
+        self.parts.setdefault(candles.symbol, []).append(candles)
+        self.pending.get(candles.symbol, set()).discard(str(content.get('0')))
+
+        return candles
+
+    def process_message(self, message: dict) -> None:
+        """Adds every CHART_HISTORY_FUTURES item of a stream message.
+
+        Arguments:
+        ----
+        message {dict} -- A decoded stream message, other services are skipped.
+        """
+
+        for service_result in message.get('snapshot', ()):
+            if service_result['service'] == 'CHART_HISTORY_FUTURES':
+                for content in service_result['content']:
+                    self.add(content=content)
+
+    def is_complete(self, symbol: str) -> bool:
+        """Checks if every expected request of a symbol has arrived."""
+
+        return symbol in self.parts and not self.pending.get(symbol)
+
+    def candles(self, symbol: str) -> CandleColumns:
+        """Returns the stitched candles of a symbol.
+
+        Arguments:
+        ----
+        symbol {str} -- The futures symbol, like `/ES`.
+
+        Raises:
+        ----
+        KeyError: If no history has arrived for the symbol.
+
+        Returns:
+        ----
+        CandleColumns -- The candles, in time order.
+        """
+
+        if symbol not in self.parts:
+            raise KeyError('No chart history has been received for {}.'.format(symbol))
+
+        stitched = CandleColumns.stitch(parts=self.parts[symbol], symbol=symbol)
+
+        # keep the stitched result, so the next call doesn't redo the work.
+        self.parts[symbol] = [stitched]
+
+        return stitched
@@ -1,21 +1,37 @@
 import os
 import time
 import json
+import logging
 import datetime
 import pathlib
 import requests
 import urllib.parse
 from . import defaults
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
 from typing import Dict
+from typing import Iterator
 from typing import List
 from typing import Optional
+from typing import Tuple
+from typing import Union
 from typing import Any
+from typing import Callable
 from td.orders import Order
 from td.orders import OrderLeg
+from td.order_batch import OrderResult
+from td.option_chain import OptionChain
+from td.option_chain import OptionChainSpec
+from td.option_chain import OptionChainColumns
+from td.account_snapshot import AccountSnapshot
+from td.account_snapshot import AccountSnapshots
+from td.rate_limiter import RateLimiter
+from td.risk import RiskManager
 from td.stream import TDStreamerClient
 from td.fields import VALID_CHART_VALUES
 from td.fields import ENDPOINT_ARGUMENTS
 
+logger = logging.getLogger(__name__)
 
 
 class TDClient():
@@ -83,6 +99,12 @@ class TDClient():
         # Initalize the client with no streaming session.
         self.streaming_session = None
 
+        # Requests aren't throttled unless a rate limiter is assigned.
+        self.rate_limiter: RateLimiter = None
+
+        # Orders aren't checked before they're sent unless a risk manager is assigned.
+        self.risk_manager: RiskManager = None
+
     def __repr__(self) -> str:
         """Representación de cadena de nuestra instancia de clase TD Ameritrade."""
 
@@ -447,6 +469,10 @@ class TDClient():
         elif endpoint == self.config['token_endpoint']:
             del headers['Authorization']
 
+        # Wait for our turn, if the client is rate limited.
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
         # Handle the request.
         if method == 'get':   
             response = requests.get(url=url, headers=headers, params=params, data=data, json=json, verify=True)
@@ -887,7 +913,7 @@ class TDClient():
         # return the response of the get request.
         return self._make_request(method='get', endpoint=endpoint, params=params)
 
-    def get_options_chain(self, option_chain: Dict) -> Dict:
+    def get_options_chain(self, option_chain: Union[Dict, OptionChain, OptionChainSpec], columnar: bool = False) -> Dict:
         """Returns Option Chain Data and Quotes.
 
         Get option chain for an optionable Symbol using one of two methods. Either,
@@ -901,21 +927,156 @@ class TDClient():
         Arguments:
         --------
             option_chain: Represents a dicitonary containing values to
-                query.
+                query, or an `OptionChain` or `OptionChainSpec` object.
+
+            columnar: If True, the chain is returned as an `OptionChainColumns`
+                object, with one flat array per field and indexes by expiry and
+                strike, instead of the nested response. (default: {False})
 
         Usage:
         --------
             SessionObject.get_options_chain(option_chain={'key1':'value1'})
+            SessionObject.get_options_chain(option_chain={'key1':'value1'}, columnar=True)
         """
 
         # define the endpoint
         endpoint = 'marketdata/chains'
 
+        # grab the query parameters of an OptionChain or OptionChainSpec object.
+        if isinstance(option_chain, (OptionChain, OptionChainSpec)):
+            params = option_chain._get_query_parameters()
+
         # otherwise take the args dictionary.
-        params = option_chain
+        else:
+            params = option_chain
 
-        # return the response of the get request.
-        return self._make_request(method='get', endpoint=endpoint, params=params)
+        # grab the response of the get request.
+        response = self._make_request(method='get', endpoint=endpoint, params=params)
+
+        if columnar and response is not None:
+            return OptionChainColumns.from_response(response=response)
+
+        return response
+
+    def get_options_chains(self, option_chains: List[Union[str, Dict, OptionChain, OptionChainSpec]], parameters: Dict = None,
+                           columnar: bool = False, max_workers: int = 8,
+                           rate_limiter: RateLimiter = None) -> Iterator[Tuple[str, Any]]:
+        """Returns Option Chain Data and Quotes for many symbols at once.
+
+        Fetches the chains concurrently on a pool of threads, while a token bucket keeps
+        the requests under TD Ameritrade's rate limit, and yields every chain as soon as
+        it arrives, so the first chains can be processed while the rest are in flight.
+
+        Documentation:
+        --------
+        https://developer.tdameritrade.com/option-chains/apis/get/marketdata/chains
+
+        Arguments:
+        --------
+            option_chains: The chains to fetch, each one a symbol, a dictionary of
+                query values or an `OptionChain` or `OptionChainSpec` object.
+
+            parameters: Query values shared by every chain, like `strikeCount` or
+                `contractType`. Values set on a chain itself take priority. (default: {None})
+
+            columnar: If True, every chain is returned as an `OptionChainColumns`
+                object. (default: {False})
+
+            max_workers: The number of requests that can be in flight at once. (default: {8})
+
+            rate_limiter: The `RateLimiter` to throttle the requests with. Defaults to the
+                client's rate limiter, or 120 requests per minute if it has none. (default: {None})
+
+        Returns:
+        --------
+            An iterator of `(symbol, chain)` tuples, in the order they complete. The chain
+            is None if the request failed.
+
+        Usage:
+        --------
+            for symbol, chain in SessionObject.get_options_chains(option_chains=['AAPL', 'MSFT'], parameters={'strikeCount': 10}):
+                print(symbol, chain)
+        """
+
+        # build the query values of every chain.
+        queries = []
+
+        for option_chain in option_chains:
+
+            query = dict(parameters or {})
+
+            if isinstance(option_chain, str):
+                query['symbol'] = option_chain
+            elif isinstance(option_chain, (OptionChain, OptionChainSpec)):
+                query.update(option_chain._get_query_parameters())
+            else:
+                query.update(option_chain)
+
+            if 'symbol' not in query:
+                raise KeyError('Every option chain needs a symbol.')
+
+            queries.append(query)
+
+        rate_limiter = self._bulk_rate_limiter(rate_limiter=rate_limiter)
+
+        def fetch(query: dict):
+
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+
+            return self.get_options_chain(option_chain=query, columnar=columnar)
+
+        # Refresh the token once, before the workers share it.
+        self._token_validation(nseconds=60)
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        futures = {}
+
+        try:
+
+            futures = {executor.submit(fetch, query): query['symbol'] for query in queries}
+
+            for future in as_completed(futures):
+
+                # one failing symbol mustn't end the others.
+                try:
+                    chain = future.result()
+                except Exception:
+                    logger.exception('Fetching the option chain of %s failed.', futures[future])
+                    chain = None
+
+                yield futures[future], chain
+
+        finally:
+
+            # don't send what's left if the caller stopped early.
+            for future in futures:
+                future.cancel()
+
+            executor.shutdown(wait=False)
+
+    def _bulk_rate_limiter(self, rate_limiter: RateLimiter = None) -> Optional[RateLimiter]:
+        """Picks the limiter the workers of a bulk request acquire from.
+
+        The client's own limiter is already applied inside every request, so it
+        isn't acquired twice, and a client without one gets a fresh limiter at
+        the default rate.
+
+        Arguments:
+        --------
+            rate_limiter: The limiter passed to the bulk request. (default: {None})
+
+        Returns:
+        --------
+            The limiter to acquire before each request, or None.
+        """
+
+        if rate_limiter is None and self.rate_limiter is None:
+            return RateLimiter()
+        elif rate_limiter is self.rate_limiter:
+            return None
+
+        return rate_limiter
 
     """
     ---------------------------------------------------------------------------------------------------------------
@@ -972,6 +1133,90 @@ class TDClient():
         # return the response of the get request.
         return self._make_request(method='get', endpoint=endpoint, params=params)
 
+    def get_account_snapshots(self, accounts: List[str], fields: List[str] = None,
+                              max_workers: int = 8, rate_limiter: RateLimiter = None) -> AccountSnapshots:
+        """Fetches many accounts at once and normalizes them into tables.
+
+        Every account is its own "Get Account" request, sent concurrently on a pool of
+        threads under the rate limiter, so the whole snapshot takes about as long as the
+        slowest account instead of the sum of all of them. The balances, positions and
+        orders of every account are flattened into `BalanceTable`, `PositionTable` and
+        `OrderTable` columns, per account and combined.
+
+        Documentation:
+        --------
+        https://developer.tdameritrade.com/account-access/apis/get/accounts/%7BaccountId%7D-0
+
+        Arguments:
+        --------
+            accounts {List[str]} -- The account numbers.
+
+            fields {List[str]} -- The extra fields, `positions` and/or `orders`, balances are
+                always included. Defaults to both. (default: {None})
+
+            max_workers {int} -- The number of requests that can be in flight at once. (default: {8})
+
+            rate_limiter {RateLimiter} -- The `RateLimiter` to throttle the requests with. Defaults
+                to the client's rate limiter, or 120 requests per minute if it has none. (default: {None})
+
+        Returns:
+        --------
+            AccountSnapshots -- The snapshot of every account, with the time each request took.
+                An account whose request failed, or raised, has empty tables and `ok` set to
+                False, the others are still returned.
+
+        Usage:
+        --------
+            snapshots = SessionObject.get_account_snapshots(accounts=['AccountOne', 'AccountTwo'])
+            snapshots.positions.rows()
+            snapshots.timings()
+        """
+
+        if fields is None:
+            fields = ['positions', 'orders']
+
+        rate_limiter = self._bulk_rate_limiter(rate_limiter=rate_limiter)
+
+        def fetch(account: str) -> AccountSnapshot:
+
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+
+            fetched_at = time.time()
+            started = time.perf_counter()
+
+            # one failing account mustn't take the others down with it.
+            try:
+                return AccountSnapshot(
+                    account=account,
+                    response=self.get_accounts(account=account, fields=fields),
+                    fetched_at=fetched_at,
+                    elapsed=time.perf_counter() - started
+                )
+            except Exception as error:
+                return AccountSnapshot(
+                    account=account,
+                    response=None,
+                    fetched_at=fetched_at,
+                    elapsed=time.perf_counter() - started,
+                    error=error
+                )
+
+        # Refresh the token once, before the workers share it.
+        self._token_validation(nseconds=60)
+
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            snapshots = list(executor.map(fetch, accounts))
+
+        snapshots = AccountSnapshots(snapshots=snapshots, elapsed=time.perf_counter() - started)
+
+        # keep the risk checks on the latest positions and balances.
+        if self.risk_manager is not None:
+            self.risk_manager.update_snapshots(snapshots=snapshots)
+
+        return snapshots
 
     def get_transactions(self, account: str = None, transaction_type: str = None, symbol: str = None,
                          start_date: str = None, end_date: str = None, transaction_id: str= None) -> Dict:
@@ -1698,17 +1943,205 @@ class TDClient():
         Returns:
         --------
             A response dicitonary.
+
+        Raises:
+        --------
+            RiskCheckError: If a `risk_manager` is assigned and the order fails one of its checks.
         """
 
         # check to see if it's an order object.
         if isinstance(order, Order):
-            order = order._saved_order_to_json()
-        else:
-            order = order
+            order = order.to_dict()
+
+        return self._send_checked(account=account, order=order, send=lambda: self._send_order(account=account, order=order))
+
+    def _send_checked(self, account: str, order: dict, send: Callable[[], dict]) -> dict:
+        """Runs the pre-trade checks on an order, then sends it.
+
+        A failed check raises before anything is sent, and an order whose
+        request fails gives its reservation back to the risk manager.
+        """
+
+        if self.risk_manager is None:
+            return send()
+
+        reservations = self.risk_manager.check(account=account, order=order)
+
+        try:
+            response = send()
+        except Exception:
+            self.risk_manager.release(reservations=reservations)
+            raise
+
+        if response is None:
+            self.risk_manager.release(reservations=reservations)
+
+        return response
+
+    def _send_order(self, account: str, order: dict) -> dict:
+        """Sends an order payload that has already been checked."""
 
         # make the request
         endpoint = 'accounts/{}/orders'.format(account)
         return self._make_request(method='post', endpoint=endpoint, mode='json', json=order, order_details=True)
+
+    def place_orders(self, account: str, orders: List[Union[Order, Dict]], max_workers: int = 8,
+                     rate_limiter: RateLimiter = None, all_or_none: bool = False,
+                     dry_run: bool = False) -> Iterator[OrderResult]:
+        """Places many orders for a specific account at once.
+
+        The orders are sent concurrently on a pool of threads, while a token bucket keeps
+        the requests under TD Ameritrade's rate limit, and every result is yielded as soon
+        as its request completes, with the order id parsed from the `Location` header.
+
+        By default a failed order is reported and the rest of the batch carries on, an order
+        whose request raised keeps the exception in `error`. With
+        `all_or_none`, the first failure stops the batch: the orders that haven't been sent
+        are yielded as SKIPPED, and the ones already placed are cancelled and yielded a
+        second time, as CANCELLED.
+
+        Documentation:
+        --------
+        https://developer.tdameritrade.com/account-access/apis/post/accounts/%7BaccountId%7D/orders-0
+
+        Arguments:
+        --------
+            account {str} -- The account number that you want to place the orders for.
+
+            orders {List[Union[Order, Dict]]} -- The orders, `Order` objects or order payloads.
+
+            max_workers {int} -- The number of requests that can be in flight at once. (default: {8})
+
+            rate_limiter {RateLimiter} -- The `RateLimiter` to throttle the requests with. Defaults
+                to the client's rate limiter, or 120 requests per minute if it has none. (default: {None})
+
+            all_or_none {bool} -- Cancel the placed orders if any order fails. (default: {False})
+
+            dry_run {bool} -- Only build the payloads, nothing is sent. (default: {False})
+
+        Usage:
+        --------
+            for result in SessionObject.place_orders(account='MyAccountID', orders=[order_one, order_two]):
+                print(result.index, result.status, result.order_id)
+
+        Returns:
+        --------
+            An iterator of `OrderResult` objects, in the order they complete. `index` is the
+            position of the order in `orders`.
+
+        Raises:
+        --------
+            RiskCheckError: If a `risk_manager` is assigned and the batch fails one of its checks,
+                nothing is sent.
+        """
+
+        # build every payload up front, so a bad order fails before anything is sent.
+        payloads = [order.to_dict() if isinstance(order, Order) else order for order in orders]
+
+        # the whole batch is checked at once, so it can't get around a limit by splitting an order.
+        reservations = None
+
+        if self.risk_manager is not None:
+            reservations = self.risk_manager.check_many(account=account, orders=payloads, reserve=not dry_run)
+
+        if dry_run:
+            for index, payload in enumerate(payloads):
+                yield OrderResult(index=index, account=account, order=payload, status='DRY_RUN')
+            return
+
+        rate_limiter = self._bulk_rate_limiter(rate_limiter=rate_limiter)
+
+        def place(index: int, payload: dict) -> OrderResult:
+
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+
+            started = time.perf_counter()
+            error = None
+
+            # the batch was checked as a whole above, checking each order again would
+            # lose the positions carried over from the orders before it.
+            try:
+                response = self._send_order(account=account, order=payload)
+            except Exception as request_error:
+                response = None
+                error = request_error
+
+            result = OrderResult(index=index, account=account, order=payload, status='FAILED',
+                                 response=response, elapsed=time.perf_counter() - started, error=error)
+
+            if response is not None:
+                result.status = 'PLACED'
+                result.order_id = response['order_id'] or None
+                result.status_code = response['status_code']
+
+            return result
+
+        def cancel(result: OrderResult) -> OrderResult:
+
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+
+            if self.cancel_order(account=account, order_id=result.order_id) is not None:
+                result.status = 'CANCELLED'
+
+            return result
+
+        def release(index: int) -> None:
+
+            # an order that was never placed gives its reservation back.
+            if reservations is not None:
+                self.risk_manager.release(reservations=reservations[index])
+
+        # Refresh the token once, before the workers share it.
+        self._token_validation(nseconds=60)
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        futures = {}
+        placed = []
+        stopped = False
+
+        try:
+
+            futures = {executor.submit(place, index, payload): index for index, payload in enumerate(payloads)}
+
+            for future in as_completed(futures):
+
+                if future.cancelled():
+                    index = futures[future]
+                    release(index)
+                    yield OrderResult(index=index, account=account, order=payloads[index], status='SKIPPED')
+                    continue
+
+                result = future.result()
+
+                if result.status == 'PLACED':
+                    placed.append(result)
+                else:
+
+                    release(result.index)
+
+                    # whatever hasn't started yet is never sent.
+                    if all_or_none and not stopped:
+                        stopped = True
+                        for other in futures:
+                            other.cancel()
+
+                yield result
+
+            # roll back, an order without an id can't be cancelled and stays PLACED.
+            if stopped:
+                for result in executor.map(cancel, [result for result in placed if result.order_id]):
+                    yield result
+
+        finally:
+
+            # don't send what's left if the caller stopped early.
+            for future, index in futures.items():
+                if future.cancel():
+                    release(index)
+
+            executor.shutdown(wait=False)
     
     def modify_order(self, account: str, order: dict, order_id: str) -> dict:
         """Modifies an exisiting order.
@@ -1732,10 +2165,23 @@ class TDClient():
         Returns:
         --------
             A response dicitonary.
+
+        Raises:
+        --------
+            RiskCheckError: If a `risk_manager` is assigned and the new order fails one of its checks.
         """
-        # make the request
+        # check to see if it's an order object.
+        if isinstance(order, Order):
+            order = order.to_dict()
+
+        # make the request, once the pre-trade checks pass.
         endpoint = 'accounts/{account_id}/orders/{order_id}'.format(account_id=account, order_id=order_id)
-        return self._make_request(method='put', endpoint=endpoint, mode='json', json=order, order_details=True)
+
+        return self._send_checked(
+            account=account,
+            order=order,
+            send=lambda: self._make_request(method='put', endpoint=endpoint, mode='json', json=order, order_details=True)
+        )
 
     def get_saved_order(self, account: str, saved_order_id: str = None) -> Dict:
         """Grabs a saved order.
@@ -1820,13 +2266,13 @@ class TDClient():
 
         # check to see if it's an order object.
         if isinstance(saved_order, Order):
-            order = order._saved_order_to_json()
+            order = saved_order.to_dict()
         else:
-            order = order
+            order = saved_order
 
         # make the request
         endpoint = 'accounts/{}/savedorders'.format(account)
-        return self._make_request(method='post', endpoint=endpoint, mode='json', data=order, order_details=True)
+        return self._make_request(method='post', endpoint=endpoint, mode='json', json=order, order_details=True)
 
     def _create_token_timestamp(self, token_timestamp: str) -> int:
         """Parses the token and converts it to a timestamp.
@@ -0,0 +1,542 @@
+import math
+import itertools
+from array import array
+from typing import Dict
+from typing import List
+from typing import Sequence
+from typing import Union
+from td.option_chain import OptionChainColumns
+from td.records import StreamRecord
+from td.records import decode_record
+
+# the pricing models, Black-Scholes for stocks & indexes and Black-76 for futures.
+MODELS = ('black_scholes', 'black76')
+
+GREEK_NAMES = ('price', 'delta', 'gamma', 'theta', 'vega', 'rho')
+
+# the bracket the implied volatility solver searches in.
+MIN_VOLATILITY = 1e-4
+MAX_VOLATILITY = 10.0
+
+DAYS_PER_YEAR = 365.0
+MILLISECONDS_PER_YEAR = DAYS_PER_YEAR * 24 * 60 * 60 * 1000
+
+NAN = float('nan')
+SQRT_2 = math.sqrt(2.0)
+INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)
+
+Values = Union[float, Sequence[float]]
+
+
+def _norm_cdf(x: float) -> float:
+    return 0.5 * math.erfc(-x / SQRT_2)
+
+
+def _norm_pdf(x: float) -> float:
+    return INV_SQRT_2PI * math.exp(-0.5 * x * x)
+
+
+def _columns(*values) -> tuple:
+    """Lines up a mix of sequences and scalars, scalars are repeated for every contract.
+
+    Returns:
+    ----
+    tuple -- The number of contracts, followed by an iterator for every argument.
+
+    Raises:
+    ----
+    ValueError: If the sequences are not all the same length.
+    """
+
+    sizes = {len(value) for value in values if not isinstance(value, (int, float))}
+
+    if len(sizes) > 1:
+        raise ValueError('Every sequence must have the same length, got lengths {}.'.format(sorted(sizes)))
+
+    size = sizes.pop() if sizes else 1
+
+    return (size,) + tuple(
+        itertools.repeat(value, size) if isinstance(value, (int, float)) else iter(value) for value in values
+    )
+
+
+def _cost_of_carry(model: str, rate: float, dividend_yield: float) -> float:
+    """Returns the cost of carry of a model, futures don't carry anything."""
+
+    if model == 'black_scholes':
+        return rate - dividend_yield
+    elif model == 'black76':
+        return 0.0
+    else:
+        raise ValueError('The model you provided is not valid, use one of: {}.'.format(', '.join(MODELS)))
+
+
+def _price_and_vega(is_call: bool, underlying: float, strike: float, time_to_expiry: float,
+                    volatility: float, rate: float, carry: float) -> tuple:
+    """Prices a single contract with the generalized Black-Scholes formula.
+
+    Returns:
+    ----
+    tuple -- The price and the vega, per 1.00 of volatility.
+    """
+
+    if time_to_expiry <= 0.0 or volatility <= 0.0:
+        forward = underlying * math.exp(carry * max(time_to_expiry, 0.0))
+        intrinsic = forward - strike if is_call else strike - forward
+        return max(intrinsic, 0.0) * math.exp(-rate * max(time_to_expiry, 0.0)), 0.0
+
+    sqrt_time = math.sqrt(time_to_expiry)
+    volatility_time = volatility * sqrt_time
+    carry_discount = math.exp((carry - rate) * time_to_expiry)
+    rate_discount = math.exp(-rate * time_to_expiry)
+
+    d1 = (math.log(underlying / strike) + (carry + 0.5 * volatility * volatility) * time_to_expiry) / volatility_time
+    d2 = d1 - volatility_time
+
+    if is_call:
+        price = underlying * carry_discount * _norm_cdf(d1) - strike * rate_discount * _norm_cdf(d2)
+    else:
+        price = strike * rate_discount * _norm_cdf(-d2) - underlying * carry_discount * _norm_cdf(-d1)
+
+    return price, underlying * carry_discount * _norm_pdf(d1) * sqrt_time
+
+
+def option_greeks(is_call: Union[bool, Sequence[bool]], underlying: Values, strike: Values,
+                  time_to_expiry: Values, volatility: Values, rate: Values = 0.0,
+                  dividend_yield: Values = 0.0, model: str = 'black_scholes') -> Dict[str, array]:
+    """Prices a batch of contracts and calculates their greeks.
+
+    Every argument can either be a sequence, with one value per contract, or a
+    single value that is shared by every contract. The greeks use the same units
+    as TD Ameritrade: theta is per calendar day, vega and rho are per 1% move.
+
+    Arguments:
+    ----
+    is_call {Union[bool, Sequence[bool]]} -- `True` for calls, `False` for puts.
+
+    underlying {Values} -- The underlying price, the futures price for `black76`.
+
+    strike {Values} -- The strike price.
+
+    time_to_expiry {Values} -- The time to expiration, in years.
+
+    volatility {Values} -- The volatility, as a decimal (0.20 for 20%).
+
+    Keyword Arguments:
+    ----
+    rate {Values} -- The risk free rate, as a decimal. (default: {0.0})
+
+    dividend_yield {Values} -- The continuous dividend yield, as a decimal. Ignored
+        by `black76`. (default: {0.0})
+
+    model {str} -- Either `black_scholes` or `black76`. (default: {'black_scholes'})
+
+    Raises:
+    ----
+    ValueError: If the model is not valid, or the sequences have different lengths.
+
+    Returns:
+    ----
+    Dict[str, array] -- The `price`, `delta`, `gamma`, `theta`, `vega` and `rho` columns.
+    """
+
+    _cost_of_carry(model=model, rate=0.0, dividend_yield=0.0)
+
+    size, is_calls, underlyings, strikes, times, volatilities, rates, dividend_yields = _columns(
+        is_call, underlying, strike, time_to_expiry, volatility, rate, dividend_yield
+    )
+
+    greeks = {name: array('d', bytes(8 * size)) for name in GREEK_NAMES}
+    prices, deltas, gammas, thetas, vegas, rhos = (greeks[name] for name in GREEK_NAMES)
+
+    for index in range(size):
+
+        contract_call = next(is_calls)
+        spot = next(underlyings)
+        strike_price = next(strikes)
+        time_left = next(times)
+        sigma = next(volatilities)
+        risk_free = next(rates)
+        carry = _cost_of_carry(model=model, rate=risk_free, dividend_yield=next(dividend_yields))
+
+        # missing inputs, a NaN from the chain for example, give NaN greeks.
+        if not (spot > 0.0 and strike_price > 0.0 and time_left == time_left and sigma == sigma):
+            for column in greeks.values():
+                column[index] = NAN
+            continue
+
+        # expired, or no volatility at all, leaves only the intrinsic value.
+        if time_left <= 0.0 or sigma <= 0.0:
+            prices[index], _ = _price_and_vega(contract_call, spot, strike_price, time_left, sigma, risk_free, carry)
+            in_the_money = spot > strike_price if contract_call else spot < strike_price
+            deltas[index] = (1.0 if contract_call else -1.0) if in_the_money else 0.0
+            continue
+
+        sqrt_time = math.sqrt(time_left)
+        volatility_time = sigma * sqrt_time
+        carry_discount = math.exp((carry - risk_free) * time_left)
+        rate_discount = math.exp(-risk_free * time_left)
+
+        d1 = (math.log(spot / strike_price) + (carry + 0.5 * sigma * sigma) * time_left) / volatility_time
+        d2 = d1 - volatility_time
+        pdf_d1 = _norm_pdf(d1)
+
+        # the parts shared by calls and puts.
+        decay = -spot * carry_discount * pdf_d1 * sigma / (2.0 * sqrt_time)
+        gammas[index] = carry_discount * pdf_d1 / (spot * volatility_time)
+        vegas[index] = spot * carry_discount * pdf_d1 * sqrt_time / 100.0
+
+        if contract_call:
+            cdf_d1 = _norm_cdf(d1)
+            cdf_d2 = _norm_cdf(d2)
+            price = spot * carry_discount * cdf_d1 - strike_price * rate_discount * cdf_d2
+            deltas[index] = carry_discount * cdf_d1
+            theta = decay - (carry - risk_free) * spot * carry_discount * cdf_d1 - risk_free * strike_price * rate_discount * cdf_d2
+            rho = time_left * strike_price * rate_discount * cdf_d2
+        else:
+            cdf_d1 = _norm_cdf(-d1)
+            cdf_d2 = _norm_cdf(-d2)
+            price = strike_price * rate_discount * cdf_d2 - spot * carry_discount * cdf_d1
+            deltas[index] = -carry_discount * cdf_d1
+            theta = decay + (carry - risk_free) * spot * carry_discount * cdf_d1 + risk_free * strike_price * rate_discount * cdf_d2
+            rho = -time_left * strike_price * rate_discount * cdf_d2
+
+        # a futures option's price only depends on the rate through discounting.
+        if model == 'black76':
+            rho = -time_left * price
+
+        prices[index] = price
+        thetas[index] = theta / DAYS_PER_YEAR
+        rhos[index] = rho / 100.0
+
+    return greeks
+
+
+def implied_volatility(prices: Values, is_call: Union[bool, Sequence[bool]], underlying: Values,
+                       strike: Values, time_to_expiry: Values, rate: Values = 0.0,
+                       dividend_yield: Values = 0.0, model: str = 'black_scholes',
+                       initial_volatility: Values = None, tolerance: float = 1e-6,
+                       max_iterations: int = 50) -> array:
+    """Solves the implied volatility of a batch of contracts.
+
+    Every contract starts with a Newton step, and falls back to bisecting its
+    bracket whenever Newton would step outside of it or vega is too flat to
+    trust. Each iteration only touches the contracts that haven't converged yet.
+
+    Arguments:
+    ----
+    prices {Values} -- The option prices to solve for, usually the mark.
+
+    is_call {Union[bool, Sequence[bool]]} -- `True` for calls, `False` for puts.
+
+    underlying {Values} -- The underlying price, the futures price for `black76`.
+
+    strike {Values} -- The strike price.
+
+    time_to_expiry {Values} -- The time to expiration, in years.
+
+    Keyword Arguments:
+    ----
+    rate {Values} -- The risk free rate, as a decimal. (default: {0.0})
+
+    dividend_yield {Values} -- The continuous dividend yield, as a decimal. (default: {0.0})
+
+    model {str} -- Either `black_scholes` or `black76`. (default: {'black_scholes'})
+
+    initial_volatility {Values} -- The starting guess, as a decimal. If `None`, the
+        Brenner-Subrahmanyam approximation is used. (default: {None})
+
+    tolerance {float} -- The largest price error accepted. (default: {1e-6})
+
+    max_iterations {int} -- The most iterations any contract gets. (default: {50})
+
+    Raises:
+    ----
+    ValueError: If the model is not valid, or the sequences have different lengths.
+
+    Returns:
+    ----
+    array -- The implied volatilities, as decimals. Contracts priced outside of the
+        no-arbitrage bounds, or that did not converge, are NaN.
+    """
+
+    _cost_of_carry(model=model, rate=0.0, dividend_yield=0.0)
+
+    size, targets, is_calls, underlyings, strikes, times, rates, dividend_yields, guesses = _columns(
+        prices, is_call, underlying, strike, time_to_expiry, rate, dividend_yield,
+        NAN if initial_volatility is None else initial_volatility
+    )
+
+    volatilities = array('d', bytes(8 * size))
+
+    # the state of every contract that still needs solving.
+    active: List[list] = []
+
+    for index in range(size):
+
+        target = next(targets)
+        contract_call = next(is_calls)
+        spot = next(underlyings)
+        strike_price = next(strikes)
+        time_left = next(times)
+        risk_free = next(rates)
+        carry = _cost_of_carry(model=model, rate=risk_free, dividend_yield=next(dividend_yields))
+        guess = next(guesses)
+
+        volatilities[index] = NAN
+
+        if not (target > 0.0 and spot > 0.0 and strike_price > 0.0 and time_left > 0.0):
+            continue
+
+        # a price at or below intrinsic, or above the upper bound, has no volatility.
+        lower_bound, _ = _price_and_vega(contract_call, spot, strike_price, time_left, 0.0, risk_free, carry)
+        upper_bound = spot * math.exp((carry - risk_free) * time_left) if contract_call else strike_price * math.exp(-risk_free * time_left)
+
+        if not lower_bound < target < upper_bound:
+            continue
+
+        if not MIN_VOLATILITY < guess < MAX_VOLATILITY:
+            forward = spot * math.exp(carry * time_left)
+            guess = math.sqrt(2.0 * math.pi / time_left) * target * math.exp(risk_free * time_left) / forward
+            guess = min(max(guess, 0.05), 2.0)
+
+        active.append([index, target, contract_call, spot, strike_price, time_left, risk_free, carry,
+                       guess, MIN_VOLATILITY, MAX_VOLATILITY])
+
+    for _ in range(max_iterations):
+
+        if not active:
+            break
+
+        still_active = []
+
+        for state in active:
+
+            index, target, contract_call, spot, strike_price, time_left, risk_free, carry, sigma, low, high = state
+            price, vega = _price_and_vega(contract_call, spot, strike_price, time_left, sigma, risk_free, carry)
+            difference = price - target
+
+            if abs(difference) < tolerance:
+                volatilities[index] = sigma
+                continue
+
+            # price rises with volatility, so the bracket always shrinks towards the answer.
+            if difference > 0.0:
+                high = sigma
+            else:
+                low = sigma
+
+            if high - low < 1e-10:
+                volatilities[index] = sigma
+                continue
+
+            next_sigma = sigma - difference / vega if vega > 1e-10 else low
+
+            if not low < next_sigma < high:
+                next_sigma = 0.5 * (low + high)
+
+            state[8] = next_sigma
+            state[9] = low
+            state[10] = high
+            still_active.append(state)
+
+        active = still_active
+
+    return volatilities
+
+
+def _chain_time_to_expiry(chain: OptionChainColumns, as_of: int = None) -> array:
+    """Returns the time to expiration of every contract in a columnar chain, in years."""
+
+    if as_of is None:
+        return array('d', (days / DAYS_PER_YEAR for days in chain.days_to_expiration))
+
+    return array('d', ((expiration - as_of) / MILLISECONDS_PER_YEAR for expiration in chain.expiration_date))
+
+
+def _chain_rate(chain: OptionChainColumns, rate: float = None) -> float:
+    """Returns the rate to use for a chain, TD reports it as a percentage."""
+
+    if rate is not None:
+        return rate
+
+    if chain.interest_rate == chain.interest_rate:
+        return chain.interest_rate / 100.0
+
+    return 0.0
+
+
+def chain_implied_volatility(chain: OptionChainColumns, prices: Union[str, Sequence[float]] = 'mark',
+                             rate: float = None, dividend_yield: float = 0.0, model: str = 'black_scholes',
+                             as_of: int = None, tolerance: float = 1e-6, max_iterations: int = 50) -> array:
+    """Solves the implied volatility of every contract in a columnar option chain.
+
+    Arguments:
+    ----
+    chain {OptionChainColumns} -- The chain, from `get_options_chain(columnar=True)`.
+
+    Keyword Arguments:
+    ----
+    prices {Union[str, Sequence[float]]} -- Either the name of a chain column to
+        solve for, like `mark` or `last`, or the prices themselves. (default: {'mark'})
+
+    rate {float} -- The risk free rate, as a decimal. If `None`, the chain's
+        interest rate is used. (default: {None})
+
+    dividend_yield {float} -- The continuous dividend yield, as a decimal. (default: {0.0})
+
+    model {str} -- Either `black_scholes` or `black76`. (default: {'black_scholes'})
+
+    as_of {int} -- The time to measure expirations from, in milliseconds since
+        epoch. If `None`, the chain's whole days to expiration are used. (default: {None})
+
+    tolerance {float} -- The largest price error accepted. (default: {1e-6})
+
+    max_iterations {int} -- The most iterations any contract gets. (default: {50})
+
+    Returns:
+    ----
+    array -- The implied volatilities, as decimals, one per chain row.
+    """
+
+    if isinstance(prices, str):
+        prices = getattr(chain, prices)
+
+    # TD's own volatility, in percent, makes a good first guess.
+    guesses = array('d', (volatility / 100.0 for volatility in chain.volatility))
+
+    return implied_volatility(
+        prices=prices,
+        is_call=chain.is_call,
+        underlying=chain.underlying_price,
+        strike=chain.strike,
+        time_to_expiry=_chain_time_to_expiry(chain=chain, as_of=as_of),
+        rate=_chain_rate(chain=chain, rate=rate),
+        dividend_yield=dividend_yield,
+        model=model,
+        initial_volatility=guesses,
+        tolerance=tolerance,
+        max_iterations=max_iterations
+    )
+
+
+def chain_greeks(chain: OptionChainColumns, volatility: Sequence[float] = None, rate: float = None,
+                 dividend_yield: float = 0.0, model: str = 'black_scholes', as_of: int = None) -> Dict[str, array]:
+    """Calculates the greeks of every contract in a columnar option chain.
+
+    Arguments:
+    ----
+    chain {OptionChainColumns} -- The chain, from `get_options_chain(columnar=True)`.
+
+    Keyword Arguments:
+    ----
+    volatility {Sequence[float]} -- The volatility of every row, as decimals, usually
+        from `chain_implied_volatility`. If `None`, the chain's volatility column is
+        used. (default: {None})
+
+    rate {float} -- The risk free rate, as a decimal. If `None`, the chain's
+        interest rate is used. (default: {None})
+
+    dividend_yield {float} -- The continuous dividend yield, as a decimal. (default: {0.0})
+
+    model {str} -- Either `black_scholes` or `black76`. (default: {'black_scholes'})
+
+    as_of {int} -- The time to measure expirations from, in milliseconds since
+        epoch. If `None`, the chain's whole days to expiration are used. (default: {None})
+
+    Returns:
+    ----
+    Dict[str, array] -- The `price`, `delta`, `gamma`, `theta`, `vega` and `rho` columns.
+    """
+
+    if volatility is None:
+        volatility = array('d', (value / 100.0 for value in chain.volatility))
+
+    return option_greeks(
+        is_call=chain.is_call,
+        underlying=chain.underlying_price,
+        strike=chain.strike,
+        time_to_expiry=_chain_time_to_expiry(chain=chain, as_of=as_of),
+        volatility=volatility,
+        rate=_chain_rate(chain=chain, rate=rate),
+        dividend_yield=dividend_yield,
+        model=model
+    )
+
+
+def record_greeks(records: Sequence[Union[StreamRecord, dict]], rate: float = 0.0, dividend_yield: float = 0.0,
+                  model: str = 'black_scholes', prices: str = 'mark', tolerance: float = 1e-6,
+                  max_iterations: int = 50) -> Dict[str, array]:
+    """Solves the implied volatility and greeks of a batch of streamed option quotes.
+
+    The quotes are `LEVELONE_OPTION` records, either typed records or the raw
+    content. Stream updates only carry the fields that changed, so pass the latest
+    full view of every contract, conflated or merged with `StreamRecord.update`.
+
+    Arguments:
+    ----
+    records {Sequence[Union[StreamRecord, dict]]} -- The option quotes.
+
+    Keyword Arguments:
+    ----
+    rate {float} -- The risk free rate, as a decimal. (default: {0.0})
+
+    dividend_yield {float} -- The continuous dividend yield, as a decimal. (default: {0.0})
+
+    model {str} -- Either `black_scholes` or `black76`. (default: {'black_scholes'})
+
+    prices {str} -- The record field to solve for, like `mark` or `last_price`. (default: {'mark'})
+
+    tolerance {float} -- The largest price error accepted. (default: {1e-6})
+
+    max_iterations {int} -- The most iterations any contract gets. (default: {50})
+
+    Returns:
+    ----
+    Dict[str, array] -- The `volatility`, `price`, `delta`, `gamma`, `theta`, `vega`
+        and `rho` columns, in the same order as the records.
+    """
+
+    # raw content is turned into typed records so fields can be read by name.
+    records = [
+        record if isinstance(record, StreamRecord) else decode_record('OPTION', record) for record in records
+    ]
+
+    def column(field_name: str) -> array:
+        values = (getattr(record, field_name) for record in records)
+        return array('d', (NAN if value is None else float(value) for value in values))
+
+    is_call = [record.contract_type == 'C' for record in records]
+    underlying = column('underlying_price')
+    strike = column('strike_price')
+    time_to_expiry = array('d', (days / DAYS_PER_YEAR for days in column('days_to_expiration')))
+    guesses = array('d', (value / 100.0 for value in column('volatility')))
+
+    volatilities = implied_volatility(
+        prices=column(prices),
+        is_call=is_call,
+        underlying=underlying,
+        strike=strike,
+        time_to_expiry=time_to_expiry,
+        rate=rate,
+        dividend_yield=dividend_yield,
+        model=model,
+        initial_volatility=guesses,
+        tolerance=tolerance,
+        max_iterations=max_iterations
+    )
+
+    greeks = option_greeks(
+        is_call=is_call,
+        underlying=underlying,
+        strike=strike,
+        time_to_expiry=time_to_expiry,
+        volatility=volatilities,
+        rate=rate,
+        dividend_yield=dividend_yield,
+        model=model
+    )
+
+    greeks['volatility'] = volatilities
+
+    return greeks
@@ -0,0 +1,323 @@
+import json
+import sqlite3
+import datetime
+from typing import Iterable
+from typing import List
+from td.client import TDClient
+
+# `get_transactions` won't return more than a year at a time.
+MAX_WINDOW_DAYS = 365
+
+LEDGER_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS transactions (
+    transaction_id INTEGER PRIMARY KEY,
+    account TEXT NOT NULL,
+    date TEXT NOT NULL,
+    transaction_date TEXT,
+    type TEXT,
+    sub_type TEXT,
+    symbol TEXT,
+    underlying TEXT,
+    net_amount REAL,
+    description TEXT,
+    raw TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transactions_account_date ON transactions (account, date);
+CREATE INDEX IF NOT EXISTS transactions_symbol_date ON transactions (symbol, date);
+CREATE INDEX IF NOT EXISTS transactions_type_date ON transactions (type, date);
+CREATE INDEX IF NOT EXISTS transactions_underlying_date ON transactions (underlying, date);
+CREATE TABLE IF NOT EXISTS sync_state (
+    account TEXT PRIMARY KEY,
+    synced_through TEXT NOT NULL,
+    synced_at TEXT NOT NULL
+);
+'''
+
+TRANSACTION_COLUMNS = (
+    'transaction_id', 'account', 'date', 'transaction_date', 'type', 'sub_type',
+    'symbol', 'underlying', 'net_amount', 'description', 'raw'
+)
+
+
+def _underlying(instrument: dict) -> str:
+    """Returns the underlying of an option, or the symbol itself for anything else."""
+
+    return instrument.get('underlyingSymbol') or instrument.get('symbol')
+
+
+def _to_date(value) -> datetime.date:
+    """Converts a `yyyy-MM-dd` string, a datetime or a date to a date."""
+
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    elif isinstance(value, datetime.date):
+        return value
+
+    return datetime.datetime.strptime(value[:10], '%Y-%m-%d').date()
+
+
+def date_windows(start_date, end_date, max_days: int = MAX_WINDOW_DAYS) -> List[tuple]:
+    """Splits a date range into windows that `get_transactions` accepts.
+
+    Arguments:
+    ----
+    start_date {str|datetime.date} -- The first day, as `yyyy-MM-dd` or a date.
+
+    end_date {str|datetime.date} -- The last day, included.
+
+    Keyword Arguments:
+    ----
+    max_days {int} -- The most days a window covers. (default: {MAX_WINDOW_DAYS})
+
+    Returns:
+    ----
+    List[tuple] -- The `(start_date, end_date)` windows as `yyyy-MM-dd` strings,
+        both days included, oldest first.
+    """
+
+    start_date = _to_date(start_date)
+    end_date = _to_date(end_date)
+    windows = []
+
+    while start_date <= end_date:
+        window_end = min(start_date + datetime.timedelta(days=max_days - 1), end_date)
+        windows.append((start_date.isoformat(), window_end.isoformat()))
+        start_date = window_end + datetime.timedelta(days=1)
+
+    return windows
+
+
+class TransactionLedger():
+
+    """
+        A local SQLite copy of the transaction history of one or more accounts.
+
+        Transactions are keyed by their transaction id, so fetching the same
+        range twice never creates duplicates. The ledger remembers the last day
+        it synced for every account, so `sync` only asks for what's new, and
+        queries by symbol, type and date are answered locally through indexes.
+        Option transactions are also stored under their underlying, so a query
+        for `AAPL` finds the AAPL options too.
+
+        Usage:
+        ----
+            ledger = TransactionLedger(client=TDSession, path='transactions.db')
+            ledger.sync(account='MyAccountNumber')
+            ledger.query(account='MyAccountNumber', symbol='AAPL', start_date='2020-01-01')
+    """
+
+    def __init__(self, client: TDClient, path: str = 'transactions.db') -> None:
+        """Opens, or creates, the ledger.
+
+        Arguments:
+        ----
+        client {TDClient} -- A logged in client, used to fetch transactions.
+
+        Keyword Arguments:
+        ----
+        path {str} -- The SQLite database file, `:memory:` for a throwaway
+            ledger. (default: {'transactions.db'})
+        """
+
+        self.client = client
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(LEDGER_SCHEMA)
+
+    def close(self) -> None:
+        """Closes the database."""
+
+        self.connection.close()
+
+    def __enter__(self) -> 'TransactionLedger':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def add(self, account: str, transactions: Iterable[dict]) -> int:
+        """Stores transactions, skipping the ones already in the ledger.
+
+        Arguments:
+        ----
+        account {str} -- The account the transactions belong to.
+
+        transactions {Iterable[dict]} -- The transactions, as returned by `get_transactions`.
+
+        Returns:
+        ----
+        int -- The number of new transactions.
+        """
+
+        rows = []
+
+        for transaction in transactions:
+
+            instrument = transaction.get('transactionItem', {}).get('instrument', {})
+            transaction_date = transaction.get('transactionDate') or transaction.get('settlementDate') or ''
+
+            rows.append((
+                transaction['transactionId'],
+                account,
+                transaction_date[:10],
+                transaction_date,
+                transaction.get('type'),
+                transaction.get('transactionSubType'),
+                instrument.get('symbol') or instrument.get('underlyingSymbol'),
+                _underlying(instrument),
+                transaction.get('netAmount'),
+                transaction.get('description'),
+                json.dumps(transaction)
+            ))
+
+        changes_before = self.connection.total_changes
+
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR IGNORE INTO transactions ({}) VALUES ({})'.format(
+                    ', '.join(TRANSACTION_COLUMNS), ', '.join('?' * len(TRANSACTION_COLUMNS))
+                ),
+                rows
+            )
+
+        return self.connection.total_changes - changes_before
+
+    def synced_through(self, account: str) -> str:
+        """Returns the last day synced for an account, as `yyyy-MM-dd`, or `None`."""
+
+        row = self.connection.execute(
+            'SELECT synced_through FROM sync_state WHERE account = ?', (account,)
+        ).fetchone()
+
+        return row['synced_through'] if row else None
+
+    def sync(self, account: str, start_date: str = None, end_date: str = None) -> int:
+        """Fetches the transactions the ledger doesn't have yet.
+
+        The range starts on the last day synced, which is fetched again since it
+        may not have been over, or on `start_date` for an account that was never
+        synced. Ranges longer than a year are split into one request per year.
+
+        Arguments:
+        ----
+        account {str} -- The account number.
+
+        Keyword Arguments:
+        ----
+        start_date {str} -- The first day to fetch for a new account, as `yyyy-MM-dd`.
+            Defaults to one year ago. (default: {None})
+
+        end_date {str} -- The last day to fetch, defaults to today. (default: {None})
+
+        Returns:
+        ----
+        int -- The number of new transactions.
+        """
+
+        end_date = _to_date(end_date or datetime.date.today())
+        synced_through = self.synced_through(account=account)
+
+        if synced_through is not None:
+            start_date = _to_date(synced_through)
+        elif start_date is not None:
+            start_date = _to_date(start_date)
+        else:
+            start_date = end_date - datetime.timedelta(days=MAX_WINDOW_DAYS - 1)
+
+        added = 0
+
+        for window_start, window_end in date_windows(start_date=start_date, end_date=end_date):
+
+            transactions = self.client.get_transactions(
+                account=account,
+                transaction_type='ALL',
+                start_date=window_start,
+                end_date=window_end
+            )
+
+            # a failed request leaves the state where it was, so the next sync retries it.
+            if transactions is None:
+                break
+
+            added += self.add(account=account, transactions=transactions)
+
+            with self.connection:
+                self.connection.execute(
+                    'INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?)',
+                    (account, window_end, datetime.datetime.now().isoformat())
+                )
+
+        return added
+
+    def sync_accounts(self, accounts: List[str], start_date: str = None, end_date: str = None) -> dict:
+        """Syncs several accounts.
+
+        Arguments:
+        ----
+        accounts {List[str]} -- The account numbers.
+
+        Keyword Arguments:
+        ----
+        start_date {str} -- The first day to fetch for new accounts. (default: {None})
+
+        end_date {str} -- The last day to fetch, defaults to today. (default: {None})
+
+        Returns:
+        ----
+        dict -- The number of new transactions per account.
+        """
+
+        return {
+            account: self.sync(account=account, start_date=start_date, end_date=end_date) for account in accounts
+        }
+
+    def query(self, account: str = None, symbol: str = None, transaction_type: str = None,
+              start_date: str = None, end_date: str = None) -> List[dict]:
+        """Finds stored transactions, oldest first.
+
+        Keyword Arguments:
+        ----
+        account {str} -- Only this account. (default: {None})
+
+        symbol {str} -- Only this symbol, or the options on it. (default: {None})
+
+        transaction_type {str} -- Only this type, like `TRADE` or `DIVIDEND_OR_INTEREST`. (default: {None})
+
+        start_date {str} -- Only on or after this day, as `yyyy-MM-dd`. (default: {None})
+
+        end_date {str} -- Only on or before this day, as `yyyy-MM-dd`. (default: {None})
+
+        Returns:
+        ----
+        List[dict] -- The transactions, as returned by `get_transactions`.
+        """
+
+        conditions = []
+        parameters = []
+
+        for column, value in (('account', account), ('type', transaction_type)):
+            if value is not None:
+                conditions.append('{} = ?'.format(column))
+                parameters.append(value)
+
+        if symbol is not None:
+            conditions.append('(symbol = ? OR underlying = ?)')
+            parameters.extend([symbol, symbol])
+
+        if start_date is not None:
+            conditions.append('date >= ?')
+            parameters.append(_to_date(start_date).isoformat())
+
+        if end_date is not None:
+            conditions.append('date <= ?')
+            parameters.append(_to_date(end_date).isoformat())
+
+        statement = 'SELECT raw FROM transactions'
+
+        if conditions:
+            statement += ' WHERE ' + ' AND '.join(conditions)
+
+        statement += ' ORDER BY date, transaction_id'
+
+        return [json.loads(row['raw']) for row in self.connection.execute(statement, parameters)]
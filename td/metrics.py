@@ -0,0 +1,152 @@
+from array import array
+
+
+class LatencyHistogram():
+
+    """
+        A low overhead, HDR style latency histogram.
+
+        Values are stored in log-linear buckets: every power of two range is
+        split into `2 ** significant_bits` equal sub-buckets, which keeps the
+        relative error of any reported value below `1 / 2 ** significant_bits`
+        while using a fixed, small amount of memory. Recording a value is a
+        couple of integer operations and one array increment.
+
+        Values are integers, the streaming client records microseconds.
+    """
+
+    __slots__ = ('significant_bits', 'sub_bucket_count', 'highest_value', 'counts',
+                 'total_count', 'total', 'min_value', 'max_value')
+
+    def __init__(self, significant_bits: int = 5, highest_value: int = 3600 * 1000 * 1000) -> None:
+        """Initalizes the histogram.
+
+        Keyword Arguments:
+        ----
+        significant_bits {int} -- The number of bits of precision kept for every
+            value, 5 bits gives roughly 3% precision. (default: {5})
+
+        highest_value {int} -- The largest value that can be recorded, larger values
+            are clamped to it. Defaults to one hour in microseconds. (default: {3600 * 1000 * 1000})
+        """
+
+        self.significant_bits = significant_bits
+        self.sub_bucket_count = 1 << significant_bits
+        self.highest_value = highest_value
+
+        self.counts = array('Q', bytes(8 * (self._index(highest_value) + 1)))
+        self.total_count = 0
+        self.total = 0
+        self.min_value = None
+        self.max_value = None
+
+    def _index(self, value: int) -> int:
+        """Returns the bucket index of a value."""
+
+        if value < self.sub_bucket_count:
+            return value
+
+        shift = value.bit_length() - self.significant_bits - 1
+        return ((shift + 1) << self.significant_bits) + (value >> shift) - self.sub_bucket_count
+
+    def _value_at(self, index: int) -> int:
+        """Returns the highest value that falls in a bucket."""
+
+        if index < 2 * self.sub_bucket_count:
+            return index
+
+        shift = (index >> self.significant_bits) - 1
+        sub_bucket = (index & (self.sub_bucket_count - 1)) + self.sub_bucket_count
+        return ((sub_bucket + 1) << shift) - 1
+
+    def record(self, value: int) -> None:
+        """Records a single value.
+
+        Arguments:
+        ----
+        value {int} -- The value to record. Negative values, from clock skew
+            for example, are recorded as 0.
+        """
+
+        value = int(value)
+
+        if value < 0:
+            value = 0
+        elif value > self.highest_value:
+            value = self.highest_value
+
+        self.counts[self._index(value)] += 1
+        self.total_count += 1
+        self.total += value
+
+        if self.min_value is None or value < self.min_value:
+            self.min_value = value
+
+        if self.max_value is None or value > self.max_value:
+            self.max_value = value
+
+    def percentile(self, percentile: float) -> int:
+        """Returns the value at a percentile.
+
+        Arguments:
+        ----
+        percentile {float} -- The percentile, between 0 and 100.
+
+        Returns:
+        ----
+        int -- The value, or 0 if nothing has been recorded.
+        """
+
+        if self.total_count == 0:
+            return 0
+
+        # the rank of the value we're after, at least the first one.
+        rank = max(1, int(round(self.total_count * percentile / 100.0)))
+        running_count = 0
+
+        for index, count in enumerate(self.counts):
+
+            running_count += count
+
+            if running_count >= rank:
+                return min(self._value_at(index), self.max_value)
+
+        return self.max_value
+
+    def mean(self) -> float:
+        """Returns the mean of the recorded values."""
+
+        if self.total_count == 0:
+            return 0.0
+
+        return self.total / self.total_count
+
+    def reset(self) -> None:
+        """Clears every recorded value."""
+
+        for index in range(len(self.counts)):
+            self.counts[index] = 0
+
+        self.total_count = 0
+        self.total = 0
+        self.min_value = None
+        self.max_value = None
+
+    def snapshot(self) -> dict:
+        """Summarizes the histogram.
+
+        Returns:
+        ----
+        dict -- The count, min, max, mean and the 50th, 90th, 99th and 99.9th percentiles.
+        """
+
+        return {
+            'count': self.total_count,
+            'min': self.min_value or 0,
+            'max': self.max_value or 0,
+            'mean': self.mean(),
+            'p50': self.percentile(50.0),
+            'p90': self.percentile(90.0),
+            'p99': self.percentile(99.0),
+            'p999': self.percentile(99.9)
+        }
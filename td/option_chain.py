@@ -1,5 +1,10 @@
 import json
+from array import array
 from enum import Enum
+from types import MappingProxyType
+from typing import Dict
+from typing import List
+from typing import Tuple
 from collections import OrderedDict
 
 
@@ -19,48 +24,45 @@ class OptionChain():
 
     '''
 
+    # the option chain will have multiple arguments you can assign to it, and each of those arguments has multiple possible values.
+    # this table, will help with argument, and argument_value validation. It's built once and shared by every instance, where each
+    # argument_name is the key, and the value is a tuple of possible values.
+    ARGUMENT_TYPES = MappingProxyType({
+        'strategy':  ('SINGLE', 'ANALYTICAL', 'COVERED', 'VERTICAL', 'CALENDAR', 'STRANGLE',
+                      'STRADDLE', 'BUTTERFLY', 'CONDOR', 'DIAGONAL', 'COLLAR', 'ROLL'),
+        'includeQuotes': ('TRUE', 'FALSE'),
+        'range': ('ITM', 'NTM', 'OTM', 'SAK', 'SBK', 'SNK', 'ALL'),
+        'expMonth': ('ALL', 'JAN', 'FEB', 'MAR', 'APR', 'MAY',
+                     'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC'),
+        'optionType': ('S', 'NS', 'ALL')
+    })
+
+    # the parameters that we will take when a new object is initalized, in the order they're sent.
+    QUERY_PARAMETERS = ('apikey', 'symbol', 'contractType', 'strikeCount', 'includeQuotes', 'strategy',
+                        'interval', 'strike', 'range', 'fromDate', 'toDate', 'volatility', 'underlyingPrice',
+                        'interestRate', 'daysToExpiration', 'expMonth', 'optionType')
+
+    # the values that can't be set with a "SINGLE" strategy.
+    SINGLE_EXCLUDED = ('volatility', 'underlyingPrice', 'interestRate', 'daysToExpiration')
+
+    # frozen sets of the tables above, so every check is a single hash lookup.
+    _ARGUMENT_VALUES = MappingProxyType({key: frozenset(values) for key, values in ARGUMENT_TYPES.items()})
+    _QUERY_PARAMETER_NAMES = frozenset(QUERY_PARAMETERS)
+    _SINGLE_EXCLUDED = frozenset(SINGLE_EXCLUDED)
+
     def __init__(self, **kwargs):
         '''
             Initalizes the Option Chain Object and override any default values that are
             passed through.
         '''
 
-        # the option chain will have multiple arguments you can assign to it, and each of those arguments has multiple possible values.
-        # this dictionary, will help with argument, and argument_value validation. The layou is simple, create a dictionary where each
-        # argument_name is the key, and the value is a list of possible values.
-        self.argument_types = {
-            'strategy':  ['SINGLE', 'ANALYTICAL', 'COVERED', 'VERTICAL', 'CALENDAR', 'STRANGLE',
-                          'STRADDLE', 'BUTTERFLY', 'CONDOR', 'DIAGONAL', 'COLLAR', 'ROLL'],
-            'includeQuotes': ['TRUE', 'FALSE'],
-            'range': ['ITM', 'NTM', 'OTM', 'SAK', 'SBK', 'SNK', 'ALL'],
-            'expMonth': ['ALL', 'JAN', 'FEB', 'MAR', 'APR', 'MAY',
-                         'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'DEC'],
-            'optionType': ['S', 'NS', 'ALL']
-        }
-
-        # define the parameters that we will take when a new object is initalized.
-        self.query_parameters = {'apikey': None,
-                                 'symbol': None,
-                                 'contractType': None,
-                                 'strikeCount': None,
-                                 'includeQuotes': None,
-                                 'strategy': None,
-                                 'interval': None,
-                                 'strike': None,
-                                 'range': None,
-                                 'fromDate': None,
-                                 'toDate': None,
-                                 'volatility': None,
-                                 'underlyingPrice': None,
-                                 'interestRate': None,
-                                 'daysToExpiration': None,
-                                 'expMonth': None,
-                                 'optionType': None}
+        self.argument_types = self.ARGUMENT_TYPES
+        self.query_parameters = dict.fromkeys(self.QUERY_PARAMETERS)
 
         # THIS WILL BE A TWO STEP VALIDATION
         # Step One: Make sure none of the kwargs are invalid. No sense of trying to validate an incorrect argument.
         for key in kwargs:
-            if key not in self.query_parameters:
+            if key not in self._QUERY_PARAMETER_NAMES:
                 print("WARNING: The argument, {} is an unkown argument.".format(key))
                 raise KeyError('Invalid Argument Name.')
 
@@ -80,34 +82,26 @@ class OptionChain():
         '''
 
         # An easy check is to see if they try to use an invalid parameter for the "strategy" argument.
-        if 'strategy' in keyword_args.keys() and keyword_args['strategy'] == 'SINGLE':
-
-            # The following values values should not be set
-            values_to_exclude = [
-                'volatility', 'underlyingPrice', 'interestRate', 'daysToExpiration']
-
-            # validate all the keys are being used.
-            all_keys = [key in keyword_args for key in values_to_exclude]
+        if keyword_args.get('strategy') == 'SINGLE' and not self._SINGLE_EXCLUDED.isdisjoint(keyword_args):
+            print('\nFor the "strategy" argument you specified "SINGLE", the following values must be excluded from the Option Chain: {} \n'.format(
+                ', '.join(self.SINGLE_EXCLUDED)))
+            raise KeyError('Invalid Value.')
 
-            # any will return TRUE if any of the values in the 'all_keys' list are FALSE.
-            if any(all_keys):
-                print('\nFor the "strategy" argument you specified "SINGLE", the following values must be excluded from the Option Chain: {} \n'.format(
-                    ', '.join(values_to_exclude)))
-                raise KeyError('Invalid Value.')
+        argument_values = self._ARGUMENT_VALUES
 
         # if we didn't fail early then check the remainder of the values.
         for key, value in keyword_args.items():
 
             # first make sure the argument_name is valid.
-            if key in self.query_parameters.keys():
+            if key in self._QUERY_PARAMETER_NAMES:
 
                 # next step is to validate if the argument_value is valid. Keep in mind though not every argument will have multiple possible values.
-                if (key in self.argument_types.keys() and (value not in self.argument_types[key])):
+                if key in argument_values and value not in argument_values[key]:
                     print('\nThe value "{}" you assigned to field "{}" is not valid, please provide one of the following valid values: {}\n'.format(
                         value, key, ', '.join(self.argument_types[key])))
                     raise KeyError('Invalid Field Value.')
 
-            elif key not in self.query_parameters.keys():
+            else:
                 print(
                     'The argument "{}" passed through is invalid, please provide a valid argument.'.format(key))
                 raise KeyError('Invalid Argument Name Value.')
@@ -142,13 +136,13 @@ class OptionChain():
         '''
 
         # validate the key can be used.
-        if key_name not in self.query_parameters:
+        if key_name not in self._QUERY_PARAMETER_NAMES:
             print('The key "{}" you provided is invalid for the OptionChain Object please provide on of the following valid keys: {}'.format(
                 key_name, ', '.join(self.query_parameters.keys())))
             raise KeyError('Invalid Key Supplied.')
 
         # If possible, validate that the value can be used.
-        if key_name in self.argument_types.keys() and key_value not in self.argument_types[key_name]:
+        if key_name in self._ARGUMENT_VALUES and key_value not in self._ARGUMENT_VALUES[key_name]:
             print('The value "{}" you provided for key {} is invalid for the OptionChain Object please provide on of the following valid values: {}'.format(
                 key_value, key_name, ', '.join(self.argument_types[key_name])))
             raise ValueError('Invalid Value Supplied.')
@@ -161,3 +155,368 @@ class OptionChain():
         # for any Enum member
         if isinstance(item, Enum):
             item = item.name
+
+
+class OptionChainSpec():
+
+    '''
+        An immutable, hashable `Get Option Chains` request.
+
+        Built for scans that create thousands of chain requests. The arguments
+        are validated once against the `OptionChain` tables, the query parameters
+        are built once and the spec can't be changed afterwards, so it can be
+        used as a dictionary key or cache key. Use `replace` to derive a new
+        spec, for example the same parameters for another symbol.
+    '''
+
+    __slots__ = ('_items', '_query_parameters', '_hash')
+
+    def __init__(self, **kwargs):
+        '''
+            Validates the arguments and freezes the spec, takes the same arguments as `OptionChain`.
+        '''
+
+        argument_values = OptionChain._ARGUMENT_VALUES
+        parameters = {}
+
+        # a single pass: the name, then the value, `None` just means not set.
+        for key, value in kwargs.items():
+
+            if key not in _PARAMETER_ORDER:
+                raise KeyError('The argument "{}" is invalid, please provide one of: {}.'.format(
+                    key, ', '.join(OptionChain.QUERY_PARAMETERS)))
+
+            if value is None:
+                continue
+
+            if key in argument_values and value not in argument_values[key]:
+                raise KeyError('The value "{}" for "{}" is invalid, please provide one of: {}.'.format(
+                    value, key, ', '.join(OptionChain.ARGUMENT_TYPES[key])))
+
+            parameters[key] = value
+
+        if parameters.get('strategy') == 'SINGLE' and not OptionChain._SINGLE_EXCLUDED.isdisjoint(parameters):
+            raise KeyError('A "SINGLE" strategy can not be combined with: {}.'.format(', '.join(OptionChain.SINGLE_EXCLUDED)))
+
+        # keep the parameters in a fixed order, so equal specs hash the same.
+        items = tuple(sorted(parameters.items(), key=_parameter_position))
+
+        _set_items(self, items)
+        _set_query_parameters(self, MappingProxyType(parameters))
+        _set_hash(self, hash(items))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('OptionChainSpec objects are immutable, use `replace` instead.')
+
+    def __delattr__(self, name):
+        raise AttributeError('OptionChainSpec objects are immutable, use `replace` instead.')
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+
+        if not isinstance(other, OptionChainSpec):
+            return NotImplemented
+
+        return self._items == other._items
+
+    def __repr__(self):
+        return 'OptionChainSpec({})'.format(', '.join('{}={!r}'.format(key, value) for key, value in self._items))
+
+    def __getitem__(self, key):
+        return self._query_parameters[key]
+
+    @property
+    def symbol(self):
+        return self._query_parameters.get('symbol')
+
+    def _get_query_parameters(self):
+        '''
+            Returns the query parameters, built once when the spec was created.
+
+            RTYPE: Mapping, a read-only view of the parameters.
+        '''
+
+        return self._query_parameters
+
+    def replace(self, **kwargs):
+        '''
+            Returns a new spec with some of the arguments changed, an argument set
+            to `None` is removed.
+
+            RTYPE: OptionChainSpec
+        '''
+
+        arguments = dict(self._items)
+        arguments.update(kwargs)
+
+        return OptionChainSpec(**arguments)
+
+    @classmethod
+    def from_option_chain(cls, option_chain: OptionChain):
+        '''
+            Freezes an `OptionChain` object into a spec.
+
+            NAME: option_chain
+            DESC: The option chain to freeze.
+            TYPE: OptionChain
+
+            RTYPE: OptionChainSpec
+        '''
+
+        return cls(**option_chain._get_query_parameters())
+
+
+# the position of every parameter, used to sort a spec's items.
+_PARAMETER_ORDER = {key: position for position, key in enumerate(OptionChain.QUERY_PARAMETERS)}
+
+
+def _parameter_position(item: tuple) -> int:
+    return _PARAMETER_ORDER[item[0]]
+
+
+# the spec is immutable, so its slots are filled in through their descriptors.
+_set_items = OptionChainSpec._items.__set__
+_set_query_parameters = OptionChainSpec._query_parameters.__set__
+_set_hash = OptionChainSpec._hash.__set__
+
+
+# the columns of an `OptionChainColumns` object: the column name, the key in
+# the contract dictionary and the array type code.
+OPTION_CHAIN_COLUMNS = (
+    ('strike', 'strikePrice', 'd'),
+    ('expiration_date', 'expirationDate', 'q'),
+    ('days_to_expiration', 'daysToExpiration', 'q'),
+    ('bid', 'bid', 'd'),
+    ('ask', 'ask', 'd'),
+    ('last', 'last', 'd'),
+    ('mark', 'mark', 'd'),
+    ('bid_size', 'bidSize', 'q'),
+    ('ask_size', 'askSize', 'q'),
+    ('total_volume', 'totalVolume', 'q'),
+    ('open_interest', 'openInterest', 'q'),
+    ('volatility', 'volatility', 'd'),
+    ('delta', 'delta', 'd'),
+    ('gamma', 'gamma', 'd'),
+    ('theta', 'theta', 'd'),
+    ('vega', 'vega', 'd'),
+    ('rho', 'rho', 'd'),
+    ('time_value', 'timeValue', 'd'),
+    ('theoretical_value', 'theoreticalOptionValue', 'd'),
+    ('multiplier', 'multiplier', 'd'),
+    ('quote_time', 'quoteTimeInLong', 'q'),
+)
+
+NAN = float('nan')
+
+
+class OptionChainColumns():
+
+    '''
+        A flat, columnar representation of a `Get Option Chains` response.
+
+        TD Ameritrade returns option chains as `callExpDateMap -> expiry ->
+        strike -> [contract]`. This class walks that structure once and stores
+        every contract as a row across a set of compact `array` columns, one per
+        field in `OPTION_CHAIN_COLUMNS`, plus the `symbol`, `expiry` and `is_call`
+        columns. Rows can be found through the expiry, strike and contract indexes.
+    '''
+
+    def __init__(self, underlying: str = None, underlying_price: float = NAN, interest_rate: float = NAN,
+                 underlying_volatility: float = NAN) -> None:
+        '''
+            Initalizes an empty chain, use `from_response` to build one from
+            a `get_options_chain` response.
+        '''
+
+        self.underlying = underlying
+        self.underlying_price = underlying_price
+        self.interest_rate = interest_rate
+        self.underlying_volatility = underlying_volatility
+
+        # the columns.
+        self.symbol = []
+        self.expiry = []
+        self.is_call = array('b')
+
+        # keep the bound appends around, they're used for every contract.
+        self._appenders = []
+
+        for column_name, contract_key, type_code in OPTION_CHAIN_COLUMNS:
+            column = array(type_code)
+            setattr(self, column_name, column)
+            self._appenders.append((contract_key, column.append, _to_float if type_code == 'd' else _to_int))
+
+        # the indexes.
+        self.symbol_index: Dict[str, int] = {}
+        self.expiry_index: Dict[str, List[int]] = {}
+        self.strike_index: Dict[float, List[int]] = {}
+
+        # adjusted and non-standard contracts can share an expiry, strike and side
+        # with the standard one, so every match is kept.
+        self.contract_index: Dict[Tuple[str, float, bool], List[int]] = {}
+
+    @classmethod
+    def from_response(cls, response: dict) -> 'OptionChainColumns':
+        '''
+            Builds the columns from a `get_options_chain` response in a single pass.
+
+            NAME: response
+            DESC: The response of a `get_options_chain` request.
+            TYPE: Dictionary
+
+            RTYPE: OptionChainColumns
+        '''
+
+        chain = cls(
+            underlying=response.get('symbol'),
+            underlying_price=_to_float(response.get('underlyingPrice')),
+            interest_rate=_to_float(response.get('interestRate')),
+            underlying_volatility=_to_float(response.get('volatility'))
+        )
+
+        for map_name in ('callExpDateMap', 'putExpDateMap'):
+            for expiry_key, strikes in (response.get(map_name) or {}).items():
+
+                # the keys look like `2020-04-17:3`, the date and the days to expiration.
+                expiry = expiry_key.split(':')[0]
+
+                for contracts in strikes.values():
+                    for contract in contracts:
+                        chain.append(expiry=expiry, contract=contract)
+
+        return chain
+
+    def append(self, expiry: str, contract: dict) -> int:
+        '''
+            Adds a single contract to the columns and indexes.
+
+            NAME: expiry
+            DESC: The expiration date of the contract, as `YYYY-MM-DD`.
+            TYPE: String
+
+            NAME: contract
+            DESC: The contract dictionary from the option chain response.
+            TYPE: Dictionary
+
+            RTYPE: Integer, the row of the new contract.
+        '''
+
+        row = len(self.symbol)
+        symbol = contract.get('symbol')
+        is_call = contract.get('putCall') == 'CALL'
+        strike = _to_float(contract.get('strikePrice'))
+
+        self.symbol.append(symbol)
+        self.expiry.append(expiry)
+        self.is_call.append(is_call)
+
+        for contract_key, column_append, convert in self._appenders:
+            column_append(convert(contract.get(contract_key)))
+
+        self.symbol_index[symbol] = row
+        self.expiry_index.setdefault(expiry, []).append(row)
+        self.strike_index.setdefault(strike, []).append(row)
+        self.contract_index.setdefault((expiry, strike, is_call), []).append(row)
+
+        return row
+
+    def __len__(self) -> int:
+        return len(self.symbol)
+
+    def expiries(self) -> List[str]:
+        '''
+            Returns the expiration dates in the chain, sorted.
+
+            RTYPE: List<String>
+        '''
+
+        return sorted(self.expiry_index)
+
+    def strikes(self, expiry: str = None) -> List[float]:
+        '''
+            Returns the strikes in the chain, or for one expiration date, sorted.
+
+            NAME: expiry
+            DESC: Only return the strikes of this expiration date.
+            TYPE: String
+
+            RTYPE: List<Float>
+        '''
+
+        if expiry is None:
+            return sorted(self.strike_index)
+
+        return sorted({self.strike[row] for row in self.expiry_index.get(expiry, [])})
+
+    def rows(self, expiry: str = None, strike: float = None) -> List[int]:
+        '''
+            Returns the rows matching an expiration date, a strike or both.
+
+            NAME: expiry
+            DESC: The expiration date, as `YYYY-MM-DD`.
+            TYPE: String
+
+            NAME: strike
+            DESC: The strike price.
+            TYPE: Float
+
+            RTYPE: List<Integer>
+        '''
+
+        if expiry is not None and strike is not None:
+            return (
+                self.contract_index.get((expiry, float(strike), True), []) +
+                self.contract_index.get((expiry, float(strike), False), [])
+            )
+        elif expiry is not None:
+            return list(self.expiry_index.get(expiry, []))
+        elif strike is not None:
+            return list(self.strike_index.get(float(strike), []))
+
+        return list(range(len(self)))
+
+    def row(self, row: int) -> dict:
+        '''
+            Returns a single row as a dictionary.
+
+            NAME: row
+            DESC: The row number.
+            TYPE: Integer
+
+            RTYPE: Dictionary
+        '''
+
+        row_dict = {
+            'symbol': self.symbol[row],
+            'expiry': self.expiry[row],
+            'is_call': bool(self.is_call[row])
+        }
+
+        for column_name, _, _ in OPTION_CHAIN_COLUMNS:
+            row_dict[column_name] = getattr(self, column_name)[row]
+
+        return row_dict
+
+
+def _to_float(value) -> float:
+    '''
+        Converts a response value to a float, missing values become NaN.
+    '''
+
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return NAN
+
+
+def _to_int(value) -> int:
+    '''
+        Converts a response value to an integer, missing values become 0.
+    '''
+
+    try:
+        return int(value)
+    except (TypeError, ValueError, OverflowError):
+        return 0
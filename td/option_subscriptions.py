@@ -0,0 +1,295 @@
+import asyncio
+from typing import List
+from typing import Set
+from typing import Tuple
+from td.option_chain import OptionChainColumns
+from td.stream import TDStreamerClient
+from td.stream_hub import StreamHub
+
+
+class ContractSelector():
+
+    '''
+        Picks the contracts worth streaming out of a columnar option chain.
+
+        A contract is selected when its strike is within a band around the
+        underlying price, its days to expiration are inside a window and,
+        optionally, the absolute value of its delta is inside a band.
+    '''
+
+    def __init__(self, strike_range: float = 0.10, min_days: int = 0, max_days: int = 60,
+                 min_delta: float = None, max_delta: float = None, contract_type: str = 'ALL') -> None:
+        '''
+            Initalizes the selector.
+
+            NAME: strike_range
+            DESC: How far strikes can be from the underlying price, as a fraction of it,
+                  0.10 keeps strikes within 10% of spot.
+            TYPE: Float
+
+            NAME: min_days
+            DESC: The fewest days to expiration a contract can have.
+            TYPE: Integer
+
+            NAME: max_days
+            DESC: The most days to expiration a contract can have.
+            TYPE: Integer
+
+            NAME: min_delta
+            DESC: The smallest absolute delta a contract can have, `None` for no limit.
+            TYPE: Float
+
+            NAME: max_delta
+            DESC: The largest absolute delta a contract can have, `None` for no limit.
+            TYPE: Float
+
+            NAME: contract_type
+            DESC: Either `CALL`, `PUT` or `ALL`.
+            TYPE: String
+        '''
+
+        if contract_type not in ('CALL', 'PUT', 'ALL'):
+            raise ValueError('The contract type must be one of CALL, PUT or ALL.')
+
+        if strike_range < 0 or min_days > max_days:
+            raise ValueError('The strike range must be positive and min_days can not be more than max_days.')
+
+        self.strike_range = strike_range
+        self.min_days = min_days
+        self.max_days = max_days
+        self.min_delta = min_delta
+        self.max_delta = max_delta
+        self.contract_type = contract_type
+
+    def select(self, chain: OptionChainColumns, underlying_price: float = None) -> List[str]:
+        '''
+            Returns the symbols of the contracts that pass every filter.
+
+            NAME: chain
+            DESC: The chain to select from.
+            TYPE: OptionChainColumns
+
+            NAME: underlying_price
+            DESC: The price to center the strikes on, defaults to the chain's underlying price.
+            TYPE: Float
+
+            RTYPE: List<String>
+        '''
+
+        if underlying_price is None:
+            underlying_price = chain.underlying_price
+
+        lowest_strike = underlying_price * (1.0 - self.strike_range)
+        highest_strike = underlying_price * (1.0 + self.strike_range)
+        min_delta = self.min_delta
+        max_delta = self.max_delta
+        check_delta = min_delta is not None or max_delta is not None
+        wanted_call = {'CALL': 1, 'PUT': 0}.get(self.contract_type)
+
+        selected = []
+
+        for symbol, strike, days, delta, is_call in zip(chain.symbol, chain.strike, chain.days_to_expiration,
+                                                         chain.delta, chain.is_call):
+
+            if not lowest_strike <= strike <= highest_strike:
+                continue
+
+            if not self.min_days <= days <= self.max_days:
+                continue
+
+            if wanted_call is not None and is_call != wanted_call:
+                continue
+
+            if check_delta:
+
+                # a missing delta (NaN) can't be inside any band.
+                delta = abs(delta)
+
+                if delta != delta:
+                    continue
+                if min_delta is not None and delta < min_delta:
+                    continue
+                if max_delta is not None and delta > max_delta:
+                    continue
+
+            selected.append(symbol)
+
+        return selected
+
+
+class OptionSubscriptionManager():
+
+    '''
+        Keeps a streaming option subscription in line with a contract selector.
+
+        Only the difference between the contracts that are subscribed and the
+        ones the selector wants is sent, through the `ADD` and `UNSUBS` commands,
+        so the rest of the stream is never interrupted. Once the underlying
+        price has moved far enough from where the last selection was made,
+        the selection is run again and the subscription rebalanced.
+    '''
+
+    def __init__(self, streaming_client: TDStreamerClient, selector: ContractSelector, fields: List = None,
+                 rebalance_threshold: float = 0.01) -> None:
+        '''
+            Initalizes the manager.
+
+            NAME: streaming_client
+            DESC: The streaming client the option subscription lives on.
+            TYPE: TDStreamerClient
+
+            NAME: selector
+            DESC: The selector that decides which contracts to stream.
+            TYPE: ContractSelector
+
+            NAME: fields
+            DESC: The `level_one_option` fields to stream, defaults to every field.
+            TYPE: List<int> | List<str>
+
+            NAME: rebalance_threshold
+            DESC: How far the underlying has to move, as a fraction of the price at the
+                  last selection, before the subscription is rebalanced.
+            TYPE: Float
+        '''
+
+        self.streaming_client = streaming_client
+        self.selector = selector
+        self.fields = fields
+        self.rebalance_threshold = rebalance_threshold
+
+        self.chain: OptionChainColumns = None
+        self.subscribed: Set[str] = set()
+        self.reference_price = None
+        self.rebalance_count = 0
+
+        self._rebalancing = False
+        self._pending_price = None
+
+    async def rebalance(self, chain: OptionChainColumns = None, underlying_price: float = None) -> Tuple[List[str], List[str]]:
+        '''
+            Runs the selection and sends the subscription changes.
+
+            NAME: chain
+            DESC: A newly fetched chain, defaults to the last chain used.
+            TYPE: OptionChainColumns
+
+            NAME: underlying_price
+            DESC: The price to select around, defaults to the chain's underlying price.
+            TYPE: Float
+
+            RTYPE: Tuple<List<String>, List<String>>, the symbols added and removed.
+        '''
+
+        if chain is not None:
+            self.chain = chain
+
+        if self.chain is None:
+            raise ValueError('A chain is required for the first rebalance.')
+
+        if underlying_price is None:
+            underlying_price = self.chain.underlying_price
+
+        wanted = set(self.selector.select(chain=self.chain, underlying_price=underlying_price))
+        added = sorted(wanted - self.subscribed)
+        removed = sorted(self.subscribed - wanted)
+
+        # Drop the old contracts first, so we never stream more than we need.
+        if removed:
+            await self.streaming_client.remove_subscription(service='OPTION', symbols=removed)
+
+        if added:
+            await self.streaming_client.add_subscription(service='OPTION', symbols=added, fields=self.fields)
+
+        self.subscribed = wanted
+        self.reference_price = underlying_price
+        self.rebalance_count += 1
+
+        return added, removed
+
+    def needs_rebalance(self, underlying_price: float) -> bool:
+        '''
+            Checks if the underlying has moved past the rebalance threshold.
+
+            NAME: underlying_price
+            DESC: The latest underlying price.
+            TYPE: Float
+
+            RTYPE: Boolean
+        '''
+
+        if self.reference_price is None or not underlying_price:
+            return False
+
+        return abs(underlying_price - self.reference_price) >= self.reference_price * self.rebalance_threshold
+
+    async def update_price(self, underlying_price: float) -> None:
+        '''
+            Rebalances if the new underlying price is far enough from the last one.
+            Updates that arrive during a rebalance are folded into a single follow up.
+
+            NAME: underlying_price
+            DESC: The latest underlying price.
+            TYPE: Float
+        '''
+
+        if self._rebalancing:
+            self._pending_price = underlying_price
+            return None
+
+        if not self.needs_rebalance(underlying_price=underlying_price):
+            return None
+
+        self._rebalancing = True
+
+        try:
+
+            await self.rebalance(underlying_price=underlying_price)
+
+            # keep going while the price kept moving during the last rebalance.
+            while self._pending_price is not None:
+
+                underlying_price, self._pending_price = self._pending_price, None
+
+                if self.needs_rebalance(underlying_price=underlying_price):
+                    await self.rebalance(underlying_price=underlying_price)
+
+        finally:
+            self._rebalancing = False
+
+    def watch(self, hub: StreamHub, service: str = 'QUOTE', price_field: str = '3') -> int:
+        '''
+            Follows the underlying through a stream hub, the underlying quote has to
+            be part of the stream already.
+
+            NAME: hub
+            DESC: The hub the underlying quotes are published on.
+            TYPE: StreamHub
+
+            NAME: service
+            DESC: The service the underlying is streamed on, `QUOTE` or `LEVELONE_FUTURES`.
+            TYPE: String
+
+            NAME: price_field
+            DESC: The field id of the price to follow, defaults to the last price.
+            TYPE: String
+
+            RTYPE: Integer, the hub subscription id.
+        '''
+
+        if self.chain is None:
+            raise ValueError('Call `rebalance` with a chain before watching the underlying.')
+
+        def on_quote(service_name, service_timestamp, content):
+
+            price = content.get(price_field)
+
+            if price is None:
+                return None
+
+            # most ticks don't move the price far enough, so skip scheduling them.
+            if self._rebalancing:
+                self._pending_price = float(price)
+            elif self.needs_rebalance(underlying_price=float(price)):
+                asyncio.ensure_future(self.update_price(underlying_price=float(price)))
+
+        return hub.subscribe(service=service, symbols=[self.chain.underlying], callback=on_quote)
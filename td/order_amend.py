@@ -0,0 +1,319 @@
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Union
+from td.client import TDClient
+from td.fast_orders import FastOrderPath
+from td.fast_orders import OrderTemplate
+from td.orders import Order
+
+logger = logging.getLogger(__name__)
+
+
+class AmendChain():
+
+    """
+        The replace chain of a single order.
+
+        Every replace gives the order a new id, `order_id` is the id of the
+        live order and `history` every id it has had, starting with the
+        original one. `pending` is the latest intent that hasn't been sent,
+        intents that are superseded before they're sent are counted in
+        `coalesced` and never reach the API.
+    """
+
+    __slots__ = ('order_id', 'history', 'pending', 'in_flight', 'last_sent', 'sent', 'coalesced', 'failed',
+                 'last_error')
+
+    def __init__(self, order_id: str) -> None:
+
+        self.order_id = order_id
+        self.history = [order_id]
+        self.pending = None
+        self.in_flight = False
+        self.last_sent = 0.0
+        self.sent = 0
+        self.coalesced = 0
+        self.failed = 0
+        self.last_error = None
+
+    def __repr__(self) -> str:
+        return '<AmendChain {} replaces={} sent={} coalesced={} failed={}{}{}>'.format(
+            self.order_id, len(self.history) - 1, self.sent, self.coalesced, self.failed,
+            ' pending' if self.pending is not None else '', ' in_flight' if self.in_flight else ''
+        )
+
+    @property
+    def original_order_id(self) -> str:
+        return self.history[0]
+
+    @property
+    def idle(self) -> bool:
+        """`True` if there's nothing waiting to be sent and no replace in flight."""
+
+        return self.pending is None and not self.in_flight
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__ if name != 'pending'}
+
+
+class OrderAmendManager():
+
+    """
+        Throttles and coalesces the replaces of working orders.
+
+        Chasing a price means replacing the same order many times a second,
+        and most of those replaces are superseded before they would land.
+        `amend` only records the latest intent of an order, a dispatcher
+        thread sends it once the order has no replace in flight and at
+        least `min_interval` seconds have passed since its last one. Any
+        intent that comes in meanwhile replaces the one waiting, so only the
+        latest price is ever sent.
+
+        A replace gives the order a new id, it's read from the response and
+        the chain follows it, so the next replace goes to the live order
+        even when `amend` is called with one of its older ids.
+
+        Usage:
+        ----
+            with OrderAmendManager(client=TDSession, account='MyAccountNumber', min_interval=0.5) as amender:
+                for price in chased_prices:
+                    amender.amend(order_id=order_id, order=exit_template, price=price)
+                amender.flush()
+    """
+
+    def __init__(self, client: TDClient, account: str, min_interval: float = 0.5,
+                 fast_path: FastOrderPath = None, max_workers: int = 4, callbacks: List[Callable] = None) -> None:
+        """Initalizes the manager and starts its dispatcher thread.
+
+        Arguments:
+        ----
+        client {TDClient} -- A logged in client, replaces are sent with `modify_order`.
+
+        account {str} -- The account of the orders.
+
+        Keyword Arguments:
+        ----
+        min_interval {float} -- The minimum number of seconds between two replaces of
+            the same order. (default: {0.5})
+
+        fast_path {FastOrderPath} -- Sends the replaces of `OrderTemplate` intents through
+            this path instead of `modify_order`. (default: {None})
+
+        max_workers {int} -- The number of replaces, of different orders, that can be in
+            flight at once. (default: {4})
+
+        callbacks {List[Callable]} -- Functions called as `callback(chain, event)` after every
+            replace, `event` is `REPLACED` or `FAILED`. They run on a worker thread, an
+            exception a callback raises is logged. (default: {None})
+        """
+
+        if min_interval < 0:
+            raise ValueError('min_interval must be 0 or greater.')
+
+        self.client = client
+        self.account = account
+        self.min_interval = min_interval
+        self.fast_path = fast_path
+        self.callbacks = list(callbacks or [])
+
+        self.chains: Dict[str, AmendChain] = {}
+
+        # every id an order has had, pointing to its chain.
+        self._by_order_id: Dict[str, AmendChain] = {}
+
+        self._condition = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._closed = False
+
+        self._dispatcher = threading.Thread(target=self._dispatch, name='OrderAmendManager', daemon=True)
+        self._dispatcher.start()
+
+    def __enter__(self) -> 'OrderAmendManager':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def chain(self, order_id: Union[str, int]) -> AmendChain:
+        """Returns the chain of an order, by any of its ids, `None` if it was never amended."""
+
+        with self._condition:
+            return self._by_order_id.get(str(order_id))
+
+    def current_order_id(self, order_id: Union[str, int]) -> str:
+        """Returns the id of the live order, given any id it has had."""
+
+        chain = self.chain(order_id)
+
+        return chain.order_id if chain is not None else str(order_id)
+
+    def amend(self, order_id: Union[str, int], order: Union[dict, Order, OrderTemplate], **values) -> AmendChain:
+        """Records the latest intent for an order, it's sent as soon as the order can be replaced.
+
+        Arguments:
+        ----
+        order_id {Union[str, int]} -- The id of the order, the live one or any earlier id of its chain.
+
+        order {Union[dict, Order, OrderTemplate]} -- The new order, a payload, an `Order` or
+            an `OrderTemplate`.
+
+        Keyword Arguments:
+        ----
+        **values -- The slot values, when `order` is an `OrderTemplate`.
+
+        Raises:
+        ----
+        ValueError: If the manager is closed.
+
+        Returns:
+        ----
+        AmendChain -- The chain of the order.
+        """
+
+        if isinstance(order, Order):
+            order = order.to_dict()
+
+        with self._condition:
+
+            if self._closed:
+                raise ValueError('The OrderAmendManager is closed.')
+
+            order_id = str(order_id)
+            chain = self._by_order_id.get(order_id)
+
+            if chain is None:
+                chain = self.chains[order_id] = self._by_order_id[order_id] = AmendChain(order_id=order_id)
+
+            if chain.pending is not None:
+                chain.coalesced += 1
+
+            chain.pending = (order, values)
+            self._condition.notify_all()
+
+        return chain
+
+    def discard(self, order_id: Union[str, int]) -> bool:
+        """Drops the intent waiting for an order, a replace already in flight still lands.
+
+        Returns:
+        ----
+        bool -- `True` if an intent was dropped.
+        """
+
+        with self._condition:
+
+            chain = self._by_order_id.get(str(order_id))
+
+            if chain is None or chain.pending is None:
+                return False
+
+            chain.pending = None
+            self._condition.notify_all()
+
+            return True
+
+    def flush(self, timeout: float = None) -> bool:
+        """Waits until every intent has been sent and every replace has landed.
+
+        Keyword Arguments:
+        ----
+        timeout {float} -- The number of seconds to wait at most, `None` waits for
+            as long as it takes. (default: {None})
+
+        Returns:
+        ----
+        bool -- `False` if the timeout ran out first.
+        """
+
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: all(chain.idle for chain in self.chains.values()), timeout=timeout
+            )
+
+    def close(self, flush: bool = True, timeout: float = None) -> None:
+        """Stops the dispatcher, after sending what's waiting unless `flush` is `False`."""
+
+        if flush:
+            self.flush(timeout=timeout)
+
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+        self._dispatcher.join()
+        self._executor.shutdown(wait=True)
+
+    def _dispatch(self) -> None:
+        """Sends the intents of the orders that are due, then sleeps until the next one is."""
+
+        with self._condition:
+
+            while not self._closed:
+
+                now = time.monotonic()
+                wake_at = None
+
+                for chain in self.chains.values():
+
+                    if chain.pending is None or chain.in_flight:
+                        continue
+
+                    due = chain.last_sent + self.min_interval
+
+                    if due <= now:
+                        intent, chain.pending = chain.pending, None
+                        chain.in_flight = True
+                        chain.last_sent = now
+                        self._executor.submit(self._replace, chain, chain.order_id, intent)
+                    elif wake_at is None or due < wake_at:
+                        wake_at = due
+
+                self._condition.wait(timeout=None if wake_at is None else wake_at - now)
+
+    def _replace(self, chain: AmendChain, order_id: str, intent: tuple) -> None:
+        """Sends a single replace and moves the chain to the new order id."""
+
+        order, values = intent
+        new_order_id = None
+        error = None
+
+        try:
+            if isinstance(order, OrderTemplate) and self.fast_path is not None:
+                result = self.fast_path.replace(order_id=order_id, template=order, **values)
+                new_order_id = result.order_id if result.ok else None
+                error = result.response
+            else:
+                payload = order.to_dict(**values) if isinstance(order, OrderTemplate) else order
+                response = self.client.modify_order(account=self.account, order=payload, order_id=order_id)
+                new_order_id = response['order_id'] if response else None
+        except Exception as exception:
+            error = exception
+
+        with self._condition:
+
+            chain.in_flight = False
+            chain.sent += 1
+
+            if new_order_id:
+                event = 'REPLACED'
+                chain.order_id = new_order_id
+                chain.history.append(new_order_id)
+                self._by_order_id[new_order_id] = chain
+            else:
+                event = 'FAILED'
+                chain.failed += 1
+                chain.last_error = error
+
+            self._condition.notify_all()
+
+        # this runs on a worker thread, nobody would ever see the exception.
+        for callback in self.callbacks:
+            try:
+                callback(chain, event)
+            except Exception:
+                logger.exception('An order amend callback failed on %s of order %s.', event, chain.original_order_id)
@@ -0,0 +1,46 @@
+class OrderResult():
+
+    """
+        The outcome of a single order of a batch.
+
+        `status` is one of:
+
+            PLACED -- The order was accepted, `order_id` is its id.
+            FAILED -- The request failed, `response` holds what came back, if anything,
+                and `error` the exception it raised, if it did.
+            SKIPPED -- The order was never sent, because an earlier order of an
+                all or none batch failed.
+            CANCELLED -- The order was placed, then cancelled because another
+                order of an all or none batch failed.
+            DRY_RUN -- The order was only built, nothing was sent.
+    """
+
+    __slots__ = ('index', 'account', 'order', 'status', 'order_id', 'status_code', 'response', 'elapsed', 'error')
+
+    def __init__(self, index: int, account: str, order: dict, status: str, order_id: str = None,
+                 status_code: int = None, response: dict = None, elapsed: float = 0.0,
+                 error: Exception = None) -> None:
+
+        self.index = index
+        self.account = account
+        self.order = order
+        self.status = status
+        self.order_id = order_id
+        self.status_code = status_code
+        self.response = response
+        self.elapsed = elapsed
+        self.error = error
+
+    def __repr__(self) -> str:
+        return '<OrderResult {} {} order_id={} elapsed={:.3f}s>'.format(
+            self.index, self.status, self.order_id, self.elapsed
+        )
+
+    @property
+    def ok(self) -> bool:
+        """`True` if the order was placed, or built in a dry run."""
+
+        return self.status in ('PLACED', 'DRY_RUN')
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
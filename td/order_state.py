@@ -0,0 +1,405 @@
+import asyncio
+import time
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Set
+from td.account_activity import AccountActivity
+from td.account_activity import parse_activity_content
+from td.account_activity import parse_activity_message
+
+# the statuses an order can still change from.
+OPEN_STATUSES = frozenset([
+    'AWAITING_PARENT_ORDER', 'AWAITING_CONDITION', 'AWAITING_MANUAL_REVIEW', 'ACCEPTED', 'AWAITING_UR_OUT',
+    'PENDING_ACTIVATION', 'QUEUED', 'WORKING', 'PENDING_CANCEL', 'PENDING_REPLACE'
+])
+
+# the status an ACCT_ACTIVITY message type moves its order to, fills are handled on their own.
+ACTIVITY_STATUSES = {
+    'OrderEntryRequest': 'QUEUED',
+    'OrderRoute': 'WORKING',
+    'OrderActivation': 'WORKING',
+    'OrderCancelRequest': 'PENDING_CANCEL',
+    'OrderCancelReplaceRequest': 'QUEUED',
+    'UROUT': 'CANCELED',
+    'OrderRejection': 'REJECTED'
+}
+
+# the message types that add to the filled quantity.
+FILL_MESSAGE_TYPES = frozenset(['OrderFill', 'OrderPartialFill', 'ManualExecution'])
+
+
+def _number(value, default: float = 0.0) -> float:
+
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class OrderState():
+
+    """The current state of a single order."""
+
+    __slots__ = ('order_id', 'account', 'symbol', 'instruction', 'order_type', 'status', 'quantity',
+                 'filled_quantity', 'remaining_quantity', 'price', 'average_fill_price', 'entered_time',
+                 'replaces', 'updated_at', 'execution_ids')
+
+    def __init__(self, order_id: int, account: str = None) -> None:
+
+        self.order_id = order_id
+        self.account = account
+        self.symbol = None
+        self.instruction = None
+        self.order_type = None
+        self.status = None
+        self.quantity = 0.0
+        self.filled_quantity = 0.0
+        self.remaining_quantity = 0.0
+        self.price = None
+        self.average_fill_price = None
+        self.entered_time = None
+        self.replaces = None
+        self.updated_at = 0.0
+
+        # the fills already applied, so a replayed one isn't counted twice.
+        self.execution_ids: Set[str] = set()
+
+    def __repr__(self) -> str:
+        return '<OrderState {} {} {} {} filled={}/{}>'.format(
+            self.order_id, self.status, self.instruction, self.symbol, self.filled_quantity, self.quantity
+        )
+
+    @property
+    def is_open(self) -> bool:
+        return self.status in OPEN_STATUSES
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class OrderStateManager():
+
+    """
+        Keeps an in-memory view of every order, driven by the ACCT_ACTIVITY stream.
+
+        The orders are loaded with a single `get_orders_query` call, after that
+        every ACCT_ACTIVITY message updates the order it belongs to, so the view
+        stays current without polling. A reconciliation poll, much less frequent
+        than polling would need to be, catches anything the stream missed.
+
+        Usage:
+        ----
+            order_state = OrderStateManager(client=TDSession, account='MyAccountNumber', callbacks=[print])
+            TDStreamingClient.order_updates(order_state=order_state)
+    """
+
+    def __init__(self, client, account: str = None, callbacks: List[Callable] = None, load: bool = True) -> None:
+        """Initalizes the manager and loads the current orders.
+
+        Arguments:
+        ----
+        client {TDClient} -- A logged in client, used to load and reconcile the orders.
+
+        Keyword Arguments:
+        ----
+        account {str} -- The account to track, `None` tracks every linked account. (default: {None})
+
+        callbacks {List[Callable]} -- Functions called as `callback(order, event)` whenever an
+            order changes, `event` is the ACCT_ACTIVITY message type, `Load` or `Reconcile`. (default: {None})
+
+        load {bool} -- Whether to load the orders right away. (default: {True})
+        """
+
+        self.client = client
+        self.account = account
+        self.callbacks = list(callbacks or [])
+
+        self.orders: Dict[int, OrderState] = {}
+        self._by_status: Dict[str, Set[int]] = {}
+        self._by_symbol: Dict[str, Set[int]] = {}
+
+        self.last_reconciled = 0.0
+
+        if load:
+            self.reconcile(event='Load')
+
+    def _index(self, order: OrderState, status: str, symbol: str) -> None:
+        """Moves an order to its new status and symbol in the indexes."""
+
+        if order.status != status and status is not None:
+            if order.status is not None:
+                self._by_status[order.status].discard(order.order_id)
+            self._by_status.setdefault(status, set()).add(order.order_id)
+            order.status = status
+
+        if order.symbol != symbol and symbol is not None:
+            if order.symbol is not None:
+                self._by_symbol[order.symbol].discard(order.order_id)
+            self._by_symbol.setdefault(symbol, set()).add(order.order_id)
+            order.symbol = symbol
+
+    def _get_or_create(self, order_id: int, account: str) -> OrderState:
+
+        order = self.orders.get(order_id)
+
+        if order is None:
+            order = self.orders[order_id] = OrderState(order_id=order_id, account=account)
+
+        return order
+
+    def _notify(self, order: OrderState, event: str) -> None:
+
+        order.updated_at = time.time()
+
+        for callback in self.callbacks:
+            callback(order, event)
+
+    def get(self, order_id: int) -> OrderState:
+        """Returns an order by its id, `None` if it's not known."""
+
+        return self.orders.get(int(order_id))
+
+    def by_status(self, status: str) -> List[OrderState]:
+        """Returns the orders in a status, like `WORKING`."""
+
+        return [self.orders[order_id] for order_id in self._by_status.get(status, ())]
+
+    def by_symbol(self, symbol: str) -> List[OrderState]:
+        """Returns the orders of a symbol."""
+
+        return [self.orders[order_id] for order_id in self._by_symbol.get(symbol, ())]
+
+    def open_orders(self) -> List[OrderState]:
+        """Returns the orders that can still change."""
+
+        return [
+            self.orders[order_id] for status in OPEN_STATUSES for order_id in self._by_status.get(status, ())
+        ]
+
+    def apply_order(self, order_dict: dict, event: str = 'Reconcile', fetched_at: float = None) -> bool:
+        """Applies an order as returned by the REST API, and its child orders.
+
+        An order the stream updated after `fetched_at` is left alone, since the
+        REST copy is older than what the view already has, and an order that's
+        done is never moved back to an open status.
+
+        Arguments:
+        ----
+        order_dict {dict} -- The order, from `get_orders_query` or `get_orders`.
+
+        Keyword Arguments:
+        ----
+        event {str} -- The event passed to the callbacks. (default: {'Reconcile'})
+
+        fetched_at {float} -- When the request for the order was sent, as a UNIX
+            timestamp, `None` applies the order regardless. (default: {None})
+
+        Returns:
+        ----
+        bool -- Whether anything changed.
+        """
+
+        changed = False
+
+        for child in order_dict.get('childOrderStrategies', []):
+            changed = self.apply_order(order_dict=child, event=event, fetched_at=fetched_at) or changed
+
+        if 'orderId' not in order_dict:
+            return changed
+
+        order = self._get_or_create(order_id=int(order_dict['orderId']), account=str(order_dict.get('accountId', '')))
+        legs = order_dict.get('orderLegCollection') or [{}]
+
+        if fetched_at is not None and order.updated_at > fetched_at:
+            return changed
+
+        if order.status is not None and not order.is_open and order_dict.get('status') in OPEN_STATUSES:
+            return changed
+
+        before = (order.status, order.filled_quantity, order.remaining_quantity)
+
+        order.instruction = legs[0].get('instruction')
+        order.order_type = order_dict.get('orderType')
+        order.quantity = _number(order_dict.get('quantity'))
+        order.filled_quantity = _number(order_dict.get('filledQuantity'))
+        order.remaining_quantity = _number(order_dict.get('remainingQuantity'), order.quantity - order.filled_quantity)
+        order.price = order_dict.get('price', order_dict.get('stopPrice'))
+        order.entered_time = order_dict.get('enteredTime')
+
+        self._index(order=order, status=order_dict.get('status'), symbol=legs[0].get('instrument', {}).get('symbol'))
+
+        if before != (order.status, order.filled_quantity, order.remaining_quantity):
+            self._notify(order=order, event=event)
+            changed = True
+
+        return changed
+
+    def apply_activity(self, activity: AccountActivity) -> OrderState:
+        """Applies a single parsed ACCT_ACTIVITY message.
+
+        Arguments:
+        ----
+        activity {AccountActivity} -- The message, from `parse_activity`.
+
+        Returns:
+        ----
+        OrderState -- The order that changed, `None` for messages that aren't about an order
+            and for fills that were already applied.
+        """
+
+        if activity is None or activity.order_id is None:
+            return None
+
+        message_type = activity.message_type
+        order = self._get_or_create(order_id=activity.order_id, account=activity.account)
+        status = order.status
+
+        # a replayed fill, already in the filled quantity.
+        if message_type in FILL_MESSAGE_TYPES and activity.execution_id is not None:
+            if activity.execution_id in order.execution_ids:
+                return None
+            order.execution_ids.add(activity.execution_id)
+
+        # the first message of a new order carries its details.
+        if order.quantity == 0.0:
+            order.instruction = activity.instruction
+            order.order_type = activity.order_type
+            order.quantity = activity.quantity or 0.0
+            order.remaining_quantity = order.quantity - order.filled_quantity
+            order.price = activity.limit_price if activity.limit_price is not None else activity.stop_price
+            order.entered_time = activity.entered_time
+
+        if message_type in FILL_MESSAGE_TYPES:
+
+            quantity = activity.execution_quantity or 0.0
+            price = activity.execution_price
+
+            if order.average_fill_price is None or order.filled_quantity == 0.0:
+                order.average_fill_price = price
+            elif quantity and price is not None:
+                order.average_fill_price = (
+                    order.average_fill_price * order.filled_quantity + price * quantity
+                ) / (order.filled_quantity + quantity)
+
+            order.filled_quantity += quantity
+
+            if activity.leaves_quantity is not None:
+                order.remaining_quantity = activity.leaves_quantity
+            else:
+                order.remaining_quantity = max(order.quantity - order.filled_quantity, 0.0)
+
+            status = 'FILLED' if message_type == 'OrderFill' or order.remaining_quantity == 0.0 else 'WORKING'
+
+        elif message_type == 'OrderCancelReplaceRequest':
+
+            status = ACTIVITY_STATUSES[message_type]
+
+            if activity.original_order_id is not None:
+                order.replaces = activity.original_order_id
+                original = self.orders.get(order.replaces)
+                if original is not None and original.is_open:
+                    self._index(order=original, status='PENDING_REPLACE', symbol=original.symbol)
+                    self._notify(order=original, event=message_type)
+
+        elif message_type in ACTIVITY_STATUSES:
+
+            status = ACTIVITY_STATUSES[message_type]
+
+            if status == 'CANCELED' or status == 'REJECTED':
+                order.remaining_quantity = 0.0
+
+            # the replacement is live, so the original is done.
+            if status == 'WORKING' and order.replaces is not None and order.replaces in self.orders:
+                original = self.orders[order.replaces]
+                if original.status == 'PENDING_REPLACE':
+                    self._index(order=original, status='REPLACED', symbol=original.symbol)
+                    self._notify(order=original, event=message_type)
+
+        # a cancel that came too late leaves the order working.
+        elif message_type == 'TooLateToCancel' and status == 'PENDING_CANCEL':
+            status = 'WORKING'
+
+        self._index(order=order, status=status, symbol=activity.symbol or order.symbol)
+        self._notify(order=order, event=message_type)
+
+        return order
+
+    def process_message(self, message: dict) -> List[OrderState]:
+        """Applies every ACCT_ACTIVITY item of a stream message.
+
+        Arguments:
+        ----
+        message {dict} -- A decoded stream message, other services are skipped.
+
+        Returns:
+        ----
+        List[OrderState] -- The orders that changed.
+        """
+
+        changed = []
+
+        for activity in parse_activity_message(message=message):
+            order = self.apply_activity(activity=activity)
+            if order is not None:
+                changed.append(order)
+
+        return changed
+
+    def on_record(self, service_name: str, service_timestamp: int, content: dict) -> None:
+        """`StreamHub` callback, applies a single ACCT_ACTIVITY item."""
+
+        self.apply_activity(activity=parse_activity_content(content=content))
+
+    def _fetch_orders(self) -> list:
+
+        return self.client.get_orders_query(account=self.account) or []
+
+    def _apply_orders(self, orders: list, event: str, fetched_at: float = None) -> int:
+
+        changed = 0
+
+        for order_dict in orders:
+            changed += self.apply_order(order_dict=order_dict, event=event, fetched_at=fetched_at)
+
+        self.last_reconciled = time.time()
+
+        return changed
+
+    def reconcile(self, event: str = 'Reconcile') -> int:
+        """Fetches the orders from the REST API and corrects the view.
+
+        Keyword Arguments:
+        ----
+        event {str} -- The event passed to the callbacks. (default: {'Reconcile'})
+
+        Returns:
+        ----
+        int -- The number of orders that were out of date.
+        """
+
+        fetched_at = time.time()
+
+        return self._apply_orders(orders=self._fetch_orders(), event=event, fetched_at=fetched_at)
+
+    async def reconcile_periodically(self, interval: float = 60.0) -> None:
+        """Reconciles the view every `interval` seconds, until cancelled.
+
+        The request runs in the default executor so the receive loop isn't
+        blocked, and the result is applied back on the event loop, so the
+        stream and the reconciliation never update the view at the same time.
+        The stream keeps going while the request is out, so the orders it
+        updated in the meantime keep their newer state, see `apply_order`.
+
+        Keyword Arguments:
+        ----
+        interval {float} -- The number of seconds between two polls. (default: {60.0})
+        """
+
+        loop = asyncio.get_event_loop()
+
+        while True:
+            await asyncio.sleep(interval)
+            fetched_at = time.time()
+            orders = await loop.run_in_executor(None, self._fetch_orders)
+            self._apply_orders(orders=orders, event='Reconcile', fetched_at=fetched_at)
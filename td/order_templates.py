@@ -0,0 +1,614 @@
+import re
+import json
+import logging
+import pathlib
+from enum import Enum
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Tuple
+from typing import Union
+from td.enums import COMPLEX_ORDER_STRATEGY_TYPE
+from td.enums import DURATION
+from td.enums import ORDER_ASSET_TYPE
+from td.enums import ORDER_INSTRUCTIONS
+from td.enums import ORDER_SESSION
+from td.enums import ORDER_STRATEGY_TYPE
+from td.enums import ORDER_TYPE
+from td.enums import POSITION_EFFECT
+from td.enums import PRICE_LINK_BASIS
+from td.enums import PRICE_LINK_TYPE
+from td.enums import QUANTITY_TYPE
+from td.enums import REQUESTED_DESTINATION
+from td.enums import SPECIAL_INSTRUCTIONS
+from td.enums import STOP_PRICE_LINK_BASIS
+from td.enums import STOP_PRICE_LINK_TYPE
+from td.enums import STOP_TYPE
+from td.enums import TAX_LOT_METHOD
+from td.fast_orders import OrderTemplate
+from td.fast_orders import _set_path
+
+logger = logging.getLogger(__name__)
+
+# the key of a spec that names its template, it's removed before the order is validated.
+SPEC_NAME_KEY = 'name'
+
+# the enum every field of an order is checked against.
+ORDER_FIELD_ENUMS = {
+    'orderType': ORDER_TYPE,
+    'session': ORDER_SESSION,
+    'duration': DURATION,
+    'orderStrategyType': ORDER_STRATEGY_TYPE,
+    'complexOrderStrategyType': COMPLEX_ORDER_STRATEGY_TYPE,
+    'requestedDestination': REQUESTED_DESTINATION,
+    'stopPriceLinkBasis': STOP_PRICE_LINK_BASIS,
+    'stopPriceLinkType': STOP_PRICE_LINK_TYPE,
+    'stopType': STOP_TYPE,
+    'priceLinkBasis': PRICE_LINK_BASIS,
+    'priceLinkType': PRICE_LINK_TYPE,
+    'taxLotMethod': TAX_LOT_METHOD,
+    'specialInstruction': SPECIAL_INSTRUCTIONS
+}
+
+# the enum every field of an order leg is checked against.
+LEG_FIELD_ENUMS = {
+    'instruction': ORDER_INSTRUCTIONS,
+    'positionEffect': POSITION_EFFECT,
+    'quantityType': QUANTITY_TYPE
+}
+
+# the price fields of an order, and the name of their slot.
+PRICE_FIELDS = {
+    'price': 'price',
+    'stopPrice': 'stop_price',
+    'stopPriceOffset': 'stop_price_offset',
+    'activationPrice': 'activation_price'
+}
+
+# the order types that can't be sent without a given field.
+REQUIRED_PRICE_FIELDS = {
+    'LIMIT': ('price',),
+    'STOP': ('stopPrice',),
+    'STOP_LIMIT': ('price', 'stopPrice'),
+    'TRAILING_STOP': ('stopPriceOffset',),
+    'TRAILING_STOP_LIMIT': ('stopPriceOffset',),
+    'NET_DEBIT': ('price',),
+    'NET_CREDIT': ('price',)
+}
+
+# strings and comments, strings come first so a `//` inside a string is left alone.
+_COMMENT_PATTERN = re.compile(r'("(?:\\.|[^"\\])*")|//[^\n]*|/\*.*?\*/', re.DOTALL)
+
+# trailing commas left behind once the comments are gone.
+_TRAILING_COMMA_PATTERN = re.compile(r'("(?:\\.|[^"\\])*")|,(\s*[}\]])')
+
+
+def strip_comments(text: str) -> str:
+    """Removes the `//` and `/* */` comments, and any trailing commas, from a JSONC document.
+
+    Arguments:
+    ----
+    text {str} -- The JSONC document.
+
+    Returns:
+    ----
+    str -- The document as plain JSON.
+    """
+
+    text = _COMMENT_PATTERN.sub(lambda match: match.group(1) or '', text)
+
+    return _TRAILING_COMMA_PATTERN.sub(lambda match: match.group(1) or match.group(2), text)
+
+
+def spec_name(path: Union[str, pathlib.Path]) -> str:
+    """Turns the file name of a sample order into a template name.
+
+    For example `order - stop limit.jsonc` becomes `stop_limit` and
+    `conditional order - trigger - OTA OCO.jsonc` becomes `trigger_ota_oco`.
+    """
+
+    name = pathlib.Path(path).stem.lower()
+    name = re.sub(r'^(conditional order|order)\s*-\s*', '', name)
+
+    return re.sub(r'[^a-z0-9]+', '_', name).strip('_')
+
+
+def _check_enum(errors: List[str], where: str, field: str, value, enum: Enum) -> None:
+
+    if isinstance(value, Enum):
+        value = value.name
+
+    if value not in enum.__members__:
+        errors.append('{}.{}: {!r} is not a valid {}'.format(where, field, value, enum.__name__))
+
+
+def _check_number(errors: List[str], where: str, field: str, value) -> None:
+
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        errors.append('{}.{}: {!r} is not a number'.format(where, field, value))
+
+
+def validate_order(payload: dict, where: str = 'order') -> List[str]:
+    """Checks an order payload against the enums in `td.enums`.
+
+    Every order of the payload is checked, its children included: the enum
+    fields have to hold one of the values of their enum, prices and quantities
+    have to be numbers, the order types that need a price have one, and every
+    order strategy has the legs or the child orders it needs.
+
+    Arguments:
+    ----
+    payload {dict} -- The order payload.
+
+    Keyword Arguments:
+    ----
+    where {str} -- The name the errors start with. (default: {'order'})
+
+    Returns:
+    ----
+    List[str] -- Every problem found, with the path to the field, empty if the order is valid.
+    """
+
+    errors = []
+
+    if not isinstance(payload, dict):
+        return ['{}: expected an object, got {!r}'.format(where, payload)]
+
+    for field, enum in ORDER_FIELD_ENUMS.items():
+        if field in payload:
+            _check_enum(errors, where, field, payload[field], enum)
+
+    for field in PRICE_FIELDS:
+        if field in payload:
+            _check_number(errors, where, field, payload[field])
+
+    strategy = payload.get('orderStrategyType')
+    legs = payload.get('orderLegCollection', [])
+    children = payload.get('childOrderStrategies', [])
+
+    if strategy is None:
+        errors.append('{}.orderStrategyType: missing'.format(where))
+
+    if strategy in ('SINGLE', 'TRIGGER'):
+
+        if 'orderType' not in payload:
+            errors.append('{}.orderType: missing'.format(where))
+
+        if not legs:
+            errors.append('{}.orderLegCollection: a {} order needs at least one leg'.format(where, strategy))
+
+    if strategy == 'TRIGGER' and not children:
+        errors.append('{}.childOrderStrategies: a TRIGGER order needs a child order'.format(where))
+
+    if strategy == 'OCO' and len(children) < 2:
+        errors.append('{}.childOrderStrategies: an OCO order needs at least two child orders'.format(where))
+
+    for field in REQUIRED_PRICE_FIELDS.get(payload.get('orderType'), ()):
+        if field not in payload:
+            errors.append('{}.{}: a {} order needs one'.format(where, field, payload['orderType']))
+
+    for index, leg in enumerate(legs):
+
+        leg_where = '{}.orderLegCollection[{}]'.format(where, index)
+
+        for field, enum in LEG_FIELD_ENUMS.items():
+            if field in leg:
+                _check_enum(errors, leg_where, field, leg[field], enum)
+
+        if 'instruction' not in leg:
+            errors.append('{}.instruction: missing'.format(leg_where))
+
+        if 'quantity' in leg:
+            _check_number(errors, leg_where, 'quantity', leg['quantity'])
+        else:
+            errors.append('{}.quantity: missing'.format(leg_where))
+
+        instrument = leg.get('instrument', {})
+
+        if 'symbol' not in instrument:
+            errors.append('{}.instrument.symbol: missing'.format(leg_where))
+
+        if 'assetType' in instrument:
+            _check_enum(errors, leg_where, 'instrument.assetType', instrument['assetType'], ORDER_ASSET_TYPE)
+        else:
+            errors.append('{}.instrument.assetType: missing'.format(leg_where))
+
+    for index, child in enumerate(children):
+        errors.extend(validate_order(child, where='{}.childOrderStrategies[{}]'.format(where, index)))
+
+    return errors
+
+
+def _copy_payload(node):
+    """Copies the objects and arrays of a JSON payload, the strings and numbers they hold are immutable."""
+
+    if type(node) is dict:
+        return {key: _copy_payload(value) for key, value in node.items()}
+
+    if type(node) is list:
+        return [_copy_payload(value) for value in node]
+
+    return node
+
+
+def _build_payload(template: OrderTemplate, values: dict) -> dict:
+    """Builds a fresh payload from a template, with the given slots filled in.
+
+    The slot names have to be checked beforehand, see `_check_values`.
+    """
+
+    payload = _copy_payload(template.payload)
+    slots = template.slots
+
+    for name, value in values.items():
+        for path in slots[name]:
+            _set_path(payload, path, value)
+
+    return payload
+
+
+def _walk_orders(payload: dict, path: tuple = (), prefix: str = ''):
+    """Yields every order of a payload, depth first, with its path and slot name prefix."""
+
+    yield payload, path, prefix
+
+    for index, child in enumerate(payload.get('childOrderStrategies', [])):
+        yield from _walk_orders(
+            payload=child,
+            path=path + ('childOrderStrategies', index),
+            prefix='{}{}_'.format(prefix or 'child_', index)
+        )
+
+
+def order_slots(payload: dict) -> Dict[str, List[tuple]]:
+    """Finds the slots of an order payload and its child orders.
+
+    The legs give `symbol` and `quantity`. When every leg of the payload
+    trades the same symbol, or the same quantity, a single slot fills all of
+    them, so the exits of a bracket follow the entry. Otherwise every leg has
+    its own slot, numbered depth first, like `symbol_0` and `quantity_1`.
+
+    The prices of the top order are `price`, `stop_price`, `stop_price_offset`
+    and `activation_price`, the ones of a child order carry its position, like
+    `child_0_price`, and `child_0_1_stop_price` for the second child of the first.
+
+    Arguments:
+    ----
+    payload {dict} -- The order payload.
+
+    Returns:
+    ----
+    Dict[str, List[tuple]] -- The paths of every slot, keyed by slot name.
+    """
+
+    slots = {}
+    symbol_paths = []
+    quantity_paths = []
+
+    for order, path, prefix in _walk_orders(payload=payload):
+
+        for field, slot in PRICE_FIELDS.items():
+            if field in order:
+                slots[prefix + slot] = [path + (field,)]
+
+        for index, leg in enumerate(order.get('orderLegCollection', [])):
+
+            leg_path = path + ('orderLegCollection', index)
+
+            if 'symbol' in leg.get('instrument', {}):
+                symbol_paths.append((leg['instrument']['symbol'], leg_path + ('instrument', 'symbol')))
+
+            if 'quantity' in leg:
+                quantity_paths.append((leg['quantity'], leg_path + ('quantity',)))
+
+    for slot, paths in (('symbol', symbol_paths), ('quantity', quantity_paths)):
+
+        if len(set(value for value, _ in paths)) == 1:
+            slots[slot] = [path for _, path in paths]
+        else:
+            for index, (_, path) in enumerate(paths):
+                slots['{}_{}'.format(slot, index)] = [path]
+
+    return slots
+
+
+class OrderTemplateLibrary():
+
+    """
+        A library of named order templates, loaded once from order specs.
+
+        Every spec is validated against the enums in `td.enums`, then compiled
+        into an `OrderTemplate`, serialized a single time with slots for the
+        symbols, quantities and prices. Building an order is filling in the
+        slots, so orders for a whole basket can be built in bulk for next to
+        nothing per order, as payloads for `TDClient.place_orders` or as bodies
+        for `FastOrderPath.place`.
+
+        Specs that don't validate are not compiled, their errors are logged
+        and kept in `errors` so a single bad sample doesn't take the rest down
+        with it, unless the library is loaded with `strict`.
+
+        Usage:
+        ----
+            library = OrderTemplateLibrary.from_directory(directory='samples/orders')
+            payloads = library.build_many('trigger_oco', [
+                {'symbol': 'MSFT', 'quantity': 10, 'child_0_price': 210.0, 'child_1_price': 190.0, 'child_1_stop_price': 191.0},
+                {'symbol': 'AAPL', 'quantity': 5, 'child_0_price': 330.0, 'child_1_price': 300.0, 'child_1_stop_price': 301.0}
+            ])
+    """
+
+    def __init__(self) -> None:
+
+        self.templates: Dict[str, OrderTemplate] = {}
+        self.errors: Dict[str, List[str]] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.templates
+
+    def __len__(self) -> int:
+        return len(self.templates)
+
+    def __repr__(self) -> str:
+        return '<OrderTemplateLibrary templates={} errors={}>'.format(len(self.templates), len(self.errors))
+
+    @classmethod
+    def from_directory(cls, directory: Union[str, pathlib.Path], strict: bool = False) -> 'OrderTemplateLibrary':
+        """Loads every `.json` and `.jsonc` order spec of a directory.
+
+        Arguments:
+        ----
+        directory {Union[str, pathlib.Path]} -- The directory of the specs, like the
+            `samples/orders` directory of the repository.
+
+        Keyword Arguments:
+        ----
+        strict {bool} -- Raise on the first spec that doesn't load. (default: {False})
+
+        Raises:
+        ----
+        ValueError: If `strict` is set and a spec doesn't load.
+
+        Returns:
+        ----
+        OrderTemplateLibrary -- The library, the specs that didn't load are in `errors`.
+        """
+
+        library = cls()
+
+        for path in sorted(pathlib.Path(directory).iterdir()):
+            if path.suffix in ('.json', '.jsonc'):
+                library.load_file(path=path, strict=strict)
+
+        return library
+
+    def load_file(self, path: Union[str, pathlib.Path], strict: bool = False) -> List[str]:
+        """Loads the order specs of a single file.
+
+        A file holds a single order, or a list of them. A single order is
+        named after the file, see `spec_name`, unless it has a `name` key.
+        Every order of a list needs a `name` key, like `limit_buy`, an order
+        without one isn't loaded. The `name` key is not part of the order.
+
+        Arguments:
+        ----
+        path {Union[str, pathlib.Path]} -- The spec file.
+
+        Keyword Arguments:
+        ----
+        strict {bool} -- Raise if a spec doesn't validate. (default: {False})
+
+        Returns:
+        ----
+        List[str] -- The names of the templates that were added.
+        """
+
+        name = spec_name(path)
+        text = pathlib.Path(path).read_text(encoding='utf-8')
+
+        try:
+            specs = json.loads(strip_comments(text))
+        except ValueError as error:
+            return self._reject(name=name, errors=['{}: {}'.format(name, error)], strict=strict)
+
+        is_list = isinstance(specs, list)
+        names = []
+
+        for index, spec in enumerate(specs if is_list else [specs]):
+
+            entry_name = spec.get(SPEC_NAME_KEY) if isinstance(spec, dict) else None
+
+            if entry_name is None and is_list:
+                self._reject(
+                    name='{}[{}]'.format(name, index),
+                    errors=['{}[{}]: an order of a list needs a {!r} key'.format(name, index, SPEC_NAME_KEY)],
+                    strict=strict
+                )
+                continue
+
+            if entry_name is not None:
+                spec = {key: value for key, value in spec.items() if key != SPEC_NAME_KEY}
+            else:
+                entry_name = name
+
+            if entry_name in names or entry_name in self.templates:
+                self._reject(
+                    name=entry_name,
+                    errors=['{}: the name is already taken, in {}'.format(entry_name, pathlib.Path(path).name)],
+                    strict=strict
+                )
+                continue
+
+            if self.add(name=entry_name, payload=spec, strict=strict):
+                names.append(entry_name)
+
+        return names
+
+    def _reject(self, name: str, errors: List[str], strict: bool) -> list:
+
+        if strict:
+            raise ValueError('Invalid order spec {}:\n{}'.format(name, '\n'.join(errors)))
+
+        logger.warning('Skipped the order spec %s:\n%s', name, '\n'.join(errors))
+        self.errors[name] = errors
+
+        return []
+
+    def add(self, name: str, payload: dict, slots: Dict[str, List[tuple]] = None, strict: bool = True) -> bool:
+        """Validates an order payload and compiles it into a template.
+
+        Arguments:
+        ----
+        name {str} -- The name of the template, replaces any template of the same name.
+
+        payload {dict} -- The order payload, its values are the defaults of the slots.
+
+        Keyword Arguments:
+        ----
+        slots {Dict[str, List[tuple]]} -- The paths of the slots, keyed by slot name.
+            Defaults to `order_slots`. (default: {None})
+
+        strict {bool} -- Raise if the payload doesn't validate, otherwise the errors are
+            kept in `errors`. (default: {True})
+
+        Raises:
+        ----
+        ValueError: If `strict` is set and the payload doesn't validate.
+
+        Returns:
+        ----
+        bool -- `True` if the template was added.
+        """
+
+        errors = validate_order(payload=payload, where=name)
+
+        if errors:
+            self._reject(name=name, errors=errors, strict=strict)
+            return False
+
+        template = OrderTemplate(order=payload, slots=order_slots(payload) if slots is None else slots)
+
+        self.errors.pop(name, None)
+        self.templates[name] = template
+
+        return True
+
+    def template(self, name: str) -> OrderTemplate:
+        """Returns a template, for `FastOrderPath.place`.
+
+        Raises:
+        ----
+        KeyError: If there's no template with that name.
+        """
+
+        try:
+            return self.templates[name]
+        except KeyError:
+            raise KeyError('No order template named {!r}, the templates are: {}'.format(
+                name, ', '.join(sorted(self.templates))
+            ))
+
+    def slots(self, name: str) -> Dict[str, object]:
+        """Returns the slots of a template, with their default value."""
+
+        return dict(self.template(name).defaults)
+
+    def _check_values(self, template: OrderTemplate, name: str, values: dict) -> None:
+
+        unknown = values.keys() - template.defaults.keys()
+
+        if unknown:
+            raise KeyError('Order template {!r} has no slot {}, the slots are: {}'.format(
+                name, ', '.join(sorted(unknown)), ', '.join(sorted(template.defaults))
+            ))
+
+    def render(self, name: str, **values) -> bytes:
+        """Builds the JSON body of an order from a template.
+
+        Arguments:
+        ----
+        name {str} -- The name of the template.
+
+        Keyword Arguments:
+        ----
+        **values -- The slot values, slots that aren't given keep the value of the spec.
+
+        Raises:
+        ----
+        KeyError: If the template or one of the slots doesn't exist.
+
+        Returns:
+        ----
+        bytes -- The JSON body.
+        """
+
+        template = self.template(name)
+        self._check_values(template, name, values)
+
+        return template.render(**values)
+
+    def build(self, name: str, **values) -> dict:
+        """Builds an order payload from a template, for `TDClient.place_order`.
+
+        Arguments:
+        ----
+        name {str} -- The name of the template.
+
+        Keyword Arguments:
+        ----
+        **values -- The slot values, slots that aren't given keep the value of the spec.
+
+        Raises:
+        ----
+        KeyError: If the template or one of the slots doesn't exist.
+
+        Returns:
+        ----
+        dict -- The order payload.
+        """
+
+        template = self.template(name)
+        self._check_values(template, name, values)
+
+        return _build_payload(template, values)
+
+    def build_many(self, name: str, rows: Iterable[dict], as_bytes: bool = False) -> List[Union[dict, bytes]]:
+        """Builds an order per row of a basket, from a single template.
+
+        The template is looked up and the slot names checked once, for the first row
+        that has a given set of slots, rather than for every order.
+
+        Arguments:
+        ----
+        name {str} -- The name of the template.
+
+        rows {Iterable[dict]} -- The slot values of every order.
+
+        Keyword Arguments:
+        ----
+        as_bytes {bool} -- Return the JSON bodies, instead of the payloads. (default: {False})
+
+        Raises:
+        ----
+        KeyError: If the template or one of the slots doesn't exist.
+
+        Returns:
+        ----
+        List[Union[dict, bytes]] -- The orders, in the order of `rows`.
+        """
+
+        template = self.template(name)
+        render = template.render
+        checked: set = set()
+        orders = []
+
+        for values in rows:
+
+            keys: Tuple[str] = tuple(values)
+
+            if keys not in checked:
+                self._check_values(template, name, values)
+                checked.add(keys)
+
+            orders.append(render(**values) if as_bytes else _build_payload(template, values))
+
+        return orders
@@ -1,6 +1,21 @@
 import json
 from enum import Enum
-from collections import OrderedDict
+from types import MappingProxyType
+
+# compact separators, the API doesn't need the whitespace.
+_encode_json = json.JSONEncoder(separators=(',', ':')).encode
+
+
+def _freeze(table):
+    '''
+        Turns a validation table into its read-only form, dictionaries become
+        mapping proxies and lists of values become frozensets.
+    '''
+
+    if isinstance(table, dict):
+        return MappingProxyType({key: _freeze(value) for key, value in table.items()})
+
+    return frozenset(table)
 
 
 class OrderLeg():
@@ -10,19 +25,21 @@ class OrderLeg():
         about the order.
     '''
 
+    __slots__ = ('template',)
+
+    # Define the order Leg arguments used for validation, shared by every leg.
+    order_leg_arguments = _freeze({
+        'instruction': ['BUY', 'SELL', 'BUY_TO_COVER', 'SELL_SHORT', 'BUY_TO_OPEN', 'BUY_TO_CLOSE', 'SELL_TO_OPEN', 'SELL_TO_CLOSE', 'EXCHANGE'],
+        'assetType': ['EQUITY', 'OPTION', 'INDEX', 'MUTUAL_FUND', 'CASH_EQUIVALENT', 'FIXED_INCOME', 'CURRENCY'],
+        'quantityType': ['ALL_SHARES', 'DOLLARS', 'SHARES']
+    })
+
     def __init__(self, **kwargs):
         '''
             Initalizes the OrderLeg Object and override any default values that are
             passed through.
         '''
 
-        # Define the order Leg arguments used for validation.
-        self.order_leg_arguments = {
-            'instruction': ['BUY', 'SELL', 'BUY_TO_COVER', 'SELL_SHORT', 'BUY_TO_OPEN', 'BUY_TO_CLOSE', 'SELL_TO_OPEN', 'SELL_TO_CLOSE', 'EXCHANGE'],
-            'assetType': ['EQUITY', 'OPTION', 'INDEX', 'MUTUAL_FUND', 'CASH_EQUIVALENT', 'FIXED_INCOME', 'CURRENCY'],
-            'quantityType': ['ALL_SHARES', 'DOLLARS', 'SHARES']
-        }
-
         # If the user provides a template use that otherwise create a blank template.
         if 'template' in kwargs.keys():
             self.template = kwargs['template']
@@ -134,82 +151,87 @@ class OrderLeg():
             RTYPE: OrderLeg Object.
         '''
 
-        # copy it and return a new OrderLeg Object.
-        template_copy = self.template.copy()
-        return OrderLeg(template=template_copy)
+        # copy it and return a new OrderLeg Object, without going through the keyword arguments.
+        order_leg = OrderLeg.__new__(OrderLeg)
+        order_leg.template = self.template.copy()
+        return order_leg
 
 
 class Order():
 
-    def __init__(self, **kwargs):
-        '''
-            Initalizes the SavedOrder Object and override any default values that are
-            passed through.
-        '''
-
-        self.saved_order_arguments = {
-
-            'session': ['NORMAL', 'AM', 'PM', 'SEAMLESS'],
-            'duration': ['DAY', 'GOOD_TILL_CANCEL', 'FILL_OR_KILL'],
-            'requestedDestination': ['INET', 'ECN_ARCA', 'CBOE', 'AMEX', 'PHLX', 'ISE', 'BOX', 'NYSE', 'NASDAQ', 'BATS', 'C2', 'AUTO'],
-            'complexOrderStrategyType': ['NONE', 'COVERED', 'VERTICAL', 'BACK_RATIO', 'CALENDAR', 'DIAGONAL', 'STRADDLE',
-                                         'STRANGLE', 'COLLAR_SYNTHETIC', 'BUTTERFLY', 'CONDOR', 'IRON_CONDOR', 'VERTICAL_ROLL',
-                                         'COLLAR_WITH_STOCK', 'DOUBLE_DIAGONAL', 'UNBALANCED_BUTTERFLY', 'UNBALANCED_CONDOR',
-                                         'UNBALANCED_IRON_CONDOR', 'UNBALANCED_VERTICAL_ROLL', 'CUSTOM'],
-
-            'stopPriceLinkBasis': ['MANUAL', 'BASE', 'TRIGGER', 'LAST', 'BID', 'ASK', 'ASK_BID', 'MARK', 'AVERAGE'],
-            'stopPriceLinkType': ['VALUE', 'PERCENT', 'TICK'],
-            'stopType': ['STANDARD', 'BID', 'ASK', 'LAST', 'MARK'],
-
-            'priceLinkBasis': ['MANUAL', 'BASE', 'TRIGGER', 'LAST', 'BID', 'ASK', 'ASK_BID', 'MARK', 'AVERAGE'],
-            'priceLinkType': ['VALUE', 'PERCENT', 'TICK'],
-
-            'orderType': ['MARKET', 'LIMIT', 'STOP', 'STOP_LIMIT', 'TRAILING_STOP', 'MARKET_ON_CLOSE',
-                          'EXERCISE', 'TRAILING_STOP_LIMIT', 'NET_DEBIT', 'NET_CREDIT', 'NET_ZERO'],
-            'orderLegType': ['EQUITY', 'OPTION', 'INDEX', 'MUTUAL_FUND', 'CASH_EQUIVALENT', 'FIXED_INCOME', 'CURRENCY'],
-            'orderStrategyType': ['SINGLE', 'OCO', 'TRIGGER'],
-
-            'instruction': ['BUY', 'SELL', 'BUY_TO_COVER', 'SELL_SHORT', 'BUY_TO_OPEN', 'BUY_TO_CLOSE', 'SELL_TO_OPEN', 'SELL_TO_CLOSE', 'EXCHANGE'],
-            'positionEffect': ['OPENING', 'CLOSING', 'AUTOMATIC'],
-            'quantityType': ['ALL_SHARES', 'DOLLARS', 'SHARES'],
-            'taxLotMethod': ['FIFO', 'LIFO', 'HIGH_COST', 'LOW_COST', 'AVERAGE_COST', 'SPECIFIC_LOT'],
-            'specialInstruction': ['ALL_OR_NONE', 'DO_NOT_REDUCE', 'ALL_OR_NONE_DO_NOT_REDUCE'],
-
-            'status': ['AWAITING_PARENT_ORDER', 'AWAITING_CONDITION', 'AWAITING_MANUAL_REVIEW', 'ACCEPTED', 'AWAITING_UR_OUT',
-                       'PENDING_ACTIVATION', 'QUEUED', 'WORKING', 'REJECTED', 'PENDING_CANCEL', 'CANCELED', 'PENDING_REPLACE',
-                       'REPLACED', 'FILLED', 'EXPIRED']
-        }
-
-        self.instrument_sub_class_arguments = {
-            'Option': {
-                'assetType': ['EQUITY', 'OPTION', 'INDEX', 'MUTUAL_FUND', 'CASH_EQUIVALENT', 'FIXED_INCOME', 'CURRENCY'],
-                'type': ['VANILLA', 'BINARY', 'BARRIER'],
-                'putCall': ['PUT', 'CALL'],
-                'optionDeliverables': {
-                    'currencyType': ['USD', 'CAD', 'EUR', 'JPY'],
-                    'assetType': ['EQUITY', 'OPTION', 'INDEX', 'MUTUAL_FUND', 'CASH_EQUIVALENT', 'FIXED_INCOME', 'CURRENCY']
-                }
-            },
-            'MutualFund': {
-                'assetType': ['EQUITY', 'OPTION', 'INDEX', 'MUTUAL_FUND', 'CASH_EQUIVALENT', 'FIXED_INCOME', 'CURRENCY'],
-                'type': ['NOT_APPLICABLE', 'OPEN_END_NON_TAXABLE', 'OPEN_END_TAXABLE', 'NO_LOAD_NON_TAXABLE', 'NO_LOAD_TAXABLE']
-            },
-            'CashEquivalent': {
-                'assetType': ['EQUITY', 'OPTION', 'INDEX', 'MUTUAL_FUND', 'CASH_EQUIVALENT', 'FIXED_INCOME', 'CURRENCY'],
-                'type': ['SAVINGS', 'MONEY_MARKET_FUND']
-            },
-            'Equity': {
-                'assetType': ['EQUITY', 'OPTION', 'INDEX', 'MUTUAL_FUND', 'CASH_EQUIVALENT', 'FIXED_INCOME', 'CURRENCY']
-            },
-            'FixedIncome': {
+    __slots__ = ('template', 'order_legs_collection', 'child_order_strategies', 'order_legs_count',
+                 'child_order_count')
+
+    # The arguments used for validation, built once and shared by every order.
+    saved_order_arguments = _freeze({
+
+        'session': ['NORMAL', 'AM', 'PM', 'SEAMLESS'],
+        'duration': ['DAY', 'GOOD_TILL_CANCEL', 'FILL_OR_KILL'],
+        'requestedDestination': ['INET', 'ECN_ARCA', 'CBOE', 'AMEX', 'PHLX', 'ISE', 'BOX', 'NYSE', 'NASDAQ', 'BATS', 'C2', 'AUTO'],
+        'complexOrderStrategyType': ['NONE', 'COVERED', 'VERTICAL', 'BACK_RATIO', 'CALENDAR', 'DIAGONAL', 'STRADDLE',
+                                     'STRANGLE', 'COLLAR_SYNTHETIC', 'BUTTERFLY', 'CONDOR', 'IRON_CONDOR', 'VERTICAL_ROLL',
+                                     'COLLAR_WITH_STOCK', 'DOUBLE_DIAGONAL', 'UNBALANCED_BUTTERFLY', 'UNBALANCED_CONDOR',
+                                     'UNBALANCED_IRON_CONDOR', 'UNBALANCED_VERTICAL_ROLL', 'CUSTOM'],
+
+        'stopPriceLinkBasis': ['MANUAL', 'BASE', 'TRIGGER', 'LAST', 'BID', 'ASK', 'ASK_BID', 'MARK', 'AVERAGE'],
+        'stopPriceLinkType': ['VALUE', 'PERCENT', 'TICK'],
+        'stopType': ['STANDARD', 'BID', 'ASK', 'LAST', 'MARK'],
+
+        'priceLinkBasis': ['MANUAL', 'BASE', 'TRIGGER', 'LAST', 'BID', 'ASK', 'ASK_BID', 'MARK', 'AVERAGE'],
+        'priceLinkType': ['VALUE', 'PERCENT', 'TICK'],
+
+        'orderType': ['MARKET', 'LIMIT', 'STOP', 'STOP_LIMIT', 'TRAILING_STOP', 'MARKET_ON_CLOSE',
+                      'EXERCISE', 'TRAILING_STOP_LIMIT', 'NET_DEBIT', 'NET_CREDIT', 'NET_ZERO'],
+        'orderLegType': ['EQUITY', 'OPTION', 'INDEX', 'MUTUAL_FUND', 'CASH_EQUIVALENT', 'FIXED_INCOME', 'CURRENCY'],
+        'orderStrategyType': ['SINGLE', 'OCO', 'TRIGGER'],
+
+        'instruction': ['BUY', 'SELL', 'BUY_TO_COVER', 'SELL_SHORT', 'BUY_TO_OPEN', 'BUY_TO_CLOSE', 'SELL_TO_OPEN', 'SELL_TO_CLOSE', 'EXCHANGE'],
+        'positionEffect': ['OPENING', 'CLOSING', 'AUTOMATIC'],
+        'quantityType': ['ALL_SHARES', 'DOLLARS', 'SHARES'],
+        'taxLotMethod': ['FIFO', 'LIFO', 'HIGH_COST', 'LOW_COST', 'AVERAGE_COST', 'SPECIFIC_LOT'],
+        'specialInstruction': ['ALL_OR_NONE', 'DO_NOT_REDUCE', 'ALL_OR_NONE_DO_NOT_REDUCE'],
+
+        'status': ['AWAITING_PARENT_ORDER', 'AWAITING_CONDITION', 'AWAITING_MANUAL_REVIEW', 'ACCEPTED', 'AWAITING_UR_OUT',
+                   'PENDING_ACTIVATION', 'QUEUED', 'WORKING', 'REJECTED', 'PENDING_CANCEL', 'CANCELED', 'PENDING_REPLACE',
+                   'REPLACED', 'FILLED', 'EXPIRED']
+    })
+
+    instrument_sub_class_arguments = _freeze({
+        'Option': {
+            'assetType': ['EQUITY', 'OPTION', 'INDEX', 'MUTUAL_FUND', 'CASH_EQUIVALENT', 'FIXED_INCOME', 'CURRENCY'],
+            'type': ['VANILLA', 'BINARY', 'BARRIER'],
+            'putCall': ['PUT', 'CALL'],
+            'optionDeliverables': {
+                'currencyType': ['USD', 'CAD', 'EUR', 'JPY'],
                 'assetType': ['EQUITY', 'OPTION', 'INDEX', 'MUTUAL_FUND', 'CASH_EQUIVALENT', 'FIXED_INCOME', 'CURRENCY']
             }
+        },
+        'MutualFund': {
+            'assetType': ['EQUITY', 'OPTION', 'INDEX', 'MUTUAL_FUND', 'CASH_EQUIVALENT', 'FIXED_INCOME', 'CURRENCY'],
+            'type': ['NOT_APPLICABLE', 'OPEN_END_NON_TAXABLE', 'OPEN_END_TAXABLE', 'NO_LOAD_NON_TAXABLE', 'NO_LOAD_TAXABLE']
+        },
+        'CashEquivalent': {
+            'assetType': ['EQUITY', 'OPTION', 'INDEX', 'MUTUAL_FUND', 'CASH_EQUIVALENT', 'FIXED_INCOME', 'CURRENCY'],
+            'type': ['SAVINGS', 'MONEY_MARKET_FUND']
+        },
+        'Equity': {
+            'assetType': ['EQUITY', 'OPTION', 'INDEX', 'MUTUAL_FUND', 'CASH_EQUIVALENT', 'FIXED_INCOME', 'CURRENCY']
+        },
+        'FixedIncome': {
+            'assetType': ['EQUITY', 'OPTION', 'INDEX', 'MUTUAL_FUND', 'CASH_EQUIVALENT', 'FIXED_INCOME', 'CURRENCY']
         }
+    })
 
-        self.order_activity_arguments = {
-            'activityType': ['EXECUTION', 'ORDER_ACTION'],
-            'executionType': ['FILL']
-        }
+    order_activity_arguments = _freeze({
+        'activityType': ['EXECUTION', 'ORDER_ACTION'],
+        'executionType': ['FILL']
+    })
+
+    def __init__(self, **kwargs):
+        '''
+            Initalizes the Order Object and override any default values that are
+            passed through.
+        '''
 
         # defines the empty template for our order
         self.template = {}
@@ -454,32 +476,44 @@ class Order():
 
     def _grab_order(self):
         '''
-            Grabs all the info passed through to the order object, creates an Ordered Dicitonary,
-            checks for OrderLegCollection and grabs their values, and checks for ChildOrderStartegies
-            and grabs their values.
+            Grabs all the info passed through to the order object, checks for OrderLegCollection
+            and grabs their values, and checks for ChildOrderStartegies and grabs their values.
+
+            RTYPE: Dict
+        '''
+
+        return self.to_dict()
 
-            RTYPE: OrderedDict
+    def to_dict(self):
         '''
+            Returns the order payload, the way the TD API expects it.
 
-        # Create an OrderedDict
-        data = OrderedDict(self.template.items())
+            RTYPE: Dict
+        '''
+
+        data = self.template.copy()
 
         # Grab any OrderLegCollections that exist.
-        if len(list(self.order_legs_collection.values())) > 0:
-            self.template['orderLegCollection'] = list(
-                self.order_legs_collection.values())
-            data['orderLegCollection'] = list(
-                self.order_legs_collection.values())
+        if self.order_legs_collection:
+            data['orderLegCollection'] = list(self.order_legs_collection.values())
 
         # Grab any ChildOrderStrategies that exist.
-        if len(list(self.child_order_strategies.values())) > 0:
-            self.template['childOrderStrategies'] = list(
-                self.child_order_strategies.values())
-            data['childOrderStrategies'] = list(
-                self.child_order_strategies.values())
+        if self.child_order_strategies:
+            data['childOrderStrategies'] = list(self.child_order_strategies.values())
 
         return data
 
+    def to_json(self):
+        '''
+            Serializes the order payload straight to JSON, in a single pass of the
+            C encoder. The legs and child orders are encoded as they are stored,
+            the only copy made is the shallow one of the top level.
+
+            RTYPE: String
+        '''
+
+        return _encode_json(self.to_dict())
+
     def add_order_leg(self, order_leg=None):
         '''
             Adds a blank OrderLeg Object to the OrderLegs Collection.
@@ -489,8 +523,13 @@ class Order():
             TYPE: OrderLeg
         '''
 
-        # First define the key.
-        key_id = "order_leg_" + str(len(self.order_legs_collection) + 1)
+        # First define the key, skipping the ones still taken after a leg was deleted.
+        key_number = len(self.order_legs_collection) + 1
+
+        while "order_leg_" + str(key_number) in self.order_legs_collection:
+            key_number = key_number + 1
+
+        key_id = "order_leg_" + str(key_number)
 
         # Add it to the collection.
         self.order_legs_collection[key_id] = order_leg.template
@@ -523,14 +562,13 @@ class Order():
             raise KeyError(
                 'The OrderLeg key you provided does not exist in the OrderLeg collection.')
 
-        # Otherwise delete it based on the index.
+        # Otherwise delete it based on the index, the legs are kept in the order they were added.
         elif index is not None:
-            for index_key, key in enumerate(sorted(self.order_legs_collection.items(), key=lambda t: t[0]).keys()):
-                if index == index_key:
-                    del self.order_legs_collection[index.key]
-                else:
-                    raise ValueError(
-                        "The index you provided does not exist in the OrderLeg collection, please provide a valid index.")
+            if not 0 <= index < len(self.order_legs_collection):
+                raise ValueError(
+                    "The index you provided does not exist in the OrderLeg collection, please provide a valid index.")
+
+            del self.order_legs_collection[list(self.order_legs_collection)[index]]
 
         # Update the count.
         self.order_legs_count = self.order_legs_count - 1
@@ -540,7 +578,7 @@ class Order():
             Converts the order to a valid JSON string
             to be submitted to the TD API.
         '''
-        return json.dumps(self._grab_order())
+        return self.to_json()
 
     def create_child_order_strategy(self):
         '''
@@ -560,9 +598,13 @@ class Order():
             TYPE: Order Object
         '''
 
-        # Create the key.
-        key_id = "child_order_strategy_" + \
-            str(len(self.child_order_strategies) + 1)
+        # Create the key, skipping the ones still taken after a child order was deleted.
+        key_number = len(self.child_order_strategies) + 1
+
+        while "child_order_strategy_" + str(key_number) in self.child_order_strategies:
+            key_number = key_number + 1
+
+        key_id = "child_order_strategy_" + str(key_number)
 
         # Add it to the Child Order Strategies Collection.
         self.child_order_strategies[key_id] = child_order_strategy._grab_order(
@@ -594,14 +636,13 @@ class Order():
             raise KeyError(
                 'The ChildOrderStrategy key you provided does not exist in the ChildOrderStrategy collection.')
 
-        # Otherwise delete it based on the index.
+        # Otherwise delete it based on the index, the child orders are kept in the order they were added.
         elif index is not None:
-            for index_key, key in enumerate(sorted(self.child_order_strategies.items(), key=lambda t: t[0]).keys()):
-                if index == index_key:
-                    del self.child_order_strategies[index.key]
-                else:
-                    raise ValueError(
-                        "The index you provided does not exist in the ChildOrderStrategy collection, please provide a valid index.")
+            if not 0 <= index < len(self.child_order_strategies):
+                raise ValueError(
+                    "The index you provided does not exist in the ChildOrderStrategy collection, please provide a valid index.")
+
+            del self.child_order_strategies[list(self.child_order_strategies)[index]]
 
         # Update the count.
         self.child_order_count = self.child_order_count - 1
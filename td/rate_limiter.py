@@ -0,0 +1,97 @@
+import time
+import threading
+
+
+class RateLimiter():
+
+    """
+        A thread-safe token bucket.
+
+        The bucket holds up to `max_calls` tokens and refills continuously at
+        `max_calls / period` tokens per second. Every request takes one token,
+        so short bursts are allowed while the average rate never goes over the
+        limit. TD Ameritrade allows 120 non-order requests per minute.
+    """
+
+    def __init__(self, max_calls: int = 120, period: float = 60.0) -> None:
+        """Initalizes the rate limiter with a full bucket.
+
+        Keyword Arguments:
+        ----
+        max_calls {int} -- The number of calls allowed per period. (default: {120})
+
+        period {float} -- The length of the period, in seconds. (default: {60.0})
+
+        Raises:
+        ----
+        ValueError: If `max_calls` or `period` is not positive.
+        """
+
+        if max_calls <= 0 or period <= 0:
+            raise ValueError('Both max_calls and period must be greater than 0.')
+
+        self.max_calls = max_calls
+        self.period = period
+        self.refill_rate = max_calls / period
+
+        self._tokens = float(max_calls)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        """Adds the tokens earned since the last refill, must hold the lock."""
+
+        now = time.monotonic()
+        self._tokens = min(self.max_calls, self._tokens + (now - self._last_refill) * self.refill_rate)
+        self._last_refill = now
+
+    def try_acquire(self) -> bool:
+        """Takes a token if one is available, without waiting.
+
+        Returns:
+        ----
+        bool -- `True` if a token was taken.
+        """
+
+        with self._lock:
+
+            self._refill()
+
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+
+            return False
+
+    def acquire(self) -> float:
+        """Takes a token, waiting for one if the bucket is empty.
+
+        Returns:
+        ----
+        float -- The number of seconds spent waiting.
+        """
+
+        waited = 0.0
+
+        while True:
+
+            with self._lock:
+
+                self._refill()
+
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return waited
+
+                # sleep just long enough for the next token.
+                wait = (1.0 - self._tokens) / self.refill_rate
+
+            time.sleep(wait)
+            waited += wait
+
+    def __enter__(self) -> 'RateLimiter':
+        self.acquire()
+        return self
+
+    def __exit__(self, *args) -> None:
+        return None
@@ -0,0 +1,262 @@
+from typing import Dict
+from td.fields import STREAM_FIELD_IDS
+
+# the stream services that have a flat record, and their `STREAM_FIELD_IDS` endpoint.
+SERVICE_ENDPOINTS = {
+    'QUOTE': 'level_one_quote',
+    'OPTION': 'level_one_option',
+    'LEVELONE_FUTURES': 'level_one_futures',
+    'LEVELONE_FOREX': 'level_one_forex',
+    'LEVELONE_FUTURES_OPTIONS': 'level_one_futures_options',
+    'NEWS_HEADLINE': 'news_headline',
+    'TIMESALE_EQUITY': 'timesale',
+    'TIMESALE_FUTURES': 'timesale',
+    'TIMESALE_FOREX': 'timesale',
+    'TIMESALE_OPTIONS': 'timesale',
+    'CHART_EQUITY': 'chart_equity',
+    'CHART_FUTURES': 'chart_futures',
+    'CHART_OPTIONS': 'chart_options',
+    'ACCT_ACTIVITY': 'account_activity'
+}
+
+# keys that show up in the content next to the numeric fields.
+EXTRA_FIELDS = {
+    'key': 'symbol',
+    'seq': 'sequence',
+    'delayed': 'delayed',
+    'assetMainType': 'asset-main-type',
+    'assetSubType': 'asset-sub-type',
+    'cusip': 'cusip',
+    'conflated': 'conflated'
+}
+
+
+def _attribute_name(field_name: str) -> str:
+    """Converts a field name, like `bid-price`, to an attribute name, like `bid_price`.
+
+    Names that start with a number have the number moved to the end, so
+    `52-week-high` becomes `week_high_52`.
+    """
+
+    parts = field_name.replace('_', '-').split('-')
+
+    if parts[0][:1].isdigit():
+        parts = parts[1:] + parts[:1]
+
+    return '_'.join(parts)
+
+
+class StreamRecord():
+
+    """
+        Base class of the typed stream records.
+
+        Records store each field in a slot named after the human-readable
+        field name, so `record.bid_price` instead of `content['1']`. Fields
+        that were not part of the update read as `None`.
+    """
+
+    __slots__ = ()
+
+    # filled in for every generated class.
+    service_endpoint = None
+    field_ids = {}
+    field_names = ()
+    _setters = {}
+    _content_ids = ()
+
+    def __getattr__(self, name: str):
+
+        # an empty slot just means the field wasn't in this update.
+        if name in self.field_names:
+            return None
+
+        raise AttributeError("'{}' object has no attribute '{}'".format(type(self).__name__, name))
+
+    def __repr__(self) -> str:
+        return '<{} {}>'.format(type(self).__name__, self.to_dict())
+
+    def get(self, field: str, default=None):
+        """Returns a field by its field id, like `'1'` or `'key'`, or by its attribute name.
+
+        Arguments:
+        ----
+        field {str} -- The field id or attribute name.
+
+        Keyword Arguments:
+        ----
+        default {object} -- Returned if the field is not set. (default: {None})
+        """
+
+        value = getattr(self, self.field_ids.get(field, field), None)
+
+        if value is None:
+            return default
+
+        return value
+
+    def update(self, record: 'StreamRecord') -> None:
+        """Copies every field that is set on another record of the same type onto this one.
+
+        Arguments:
+        ----
+        record {StreamRecord} -- The newer record.
+        """
+
+        for field_name in record.field_names:
+            value = getattr(record, field_name)
+            if value is not None:
+                setattr(self, field_name, value)
+
+    def to_dict(self) -> dict:
+        """Returns the fields that are set, keyed by their attribute name."""
+
+        return {field_name: getattr(self, field_name) for field_name in self.field_names
+                if getattr(self, field_name) is not None}
+
+    def to_content(self) -> dict:
+        """Returns the fields that are set, keyed by their stream field id, like the raw content."""
+
+        content = {}
+
+        for field_id, field_name in self._content_ids:
+            value = getattr(self, field_name)
+            if value is not None:
+                content[field_id] = value
+
+        return content
+
+
+def _build_record_class(class_name: str, endpoint: str) -> type:
+    """Creates a slotted record class for a `STREAM_FIELD_IDS` endpoint.
+
+    Arguments:
+    ----
+    class_name {str} -- The name of the new class.
+
+    endpoint {str} -- The `STREAM_FIELD_IDS` endpoint, like `level_one_quote`.
+
+    Returns:
+    ----
+    type -- The record class.
+    """
+
+    field_ids = {}
+
+    for field_id, field_name in STREAM_FIELD_IDS[endpoint].items():
+        field_ids[field_id] = _attribute_name(field_name)
+
+    for field_id, field_name in EXTRA_FIELDS.items():
+        field_ids.setdefault(field_id, _attribute_name(field_name))
+
+    # several ids can point to the same name, `0` and `key` are both the symbol.
+    field_names = tuple(dict.fromkeys(field_ids.values()))
+
+    record_class = type(class_name, (StreamRecord,), {
+        '__slots__': field_names,
+        'service_endpoint': endpoint,
+        'field_ids': field_ids,
+        'field_names': field_names
+    })
+
+    # Setting a slot through its descriptor skips the attribute name lookup.
+    record_class._setters = {
+        field_id: getattr(record_class, field_name).__set__ for field_id, field_name in field_ids.items()
+    }
+
+    # the id each field uses in the raw content, `key` rather than `0` for the symbol.
+    content_ids = {}
+
+    for field_id, field_name in field_ids.items():
+        if field_name not in content_ids or field_id in EXTRA_FIELDS:
+            content_ids[field_name] = field_id
+
+    record_class._content_ids = tuple((field_id, field_name) for field_name, field_id in content_ids.items())
+
+    return record_class
+
+
+LevelOneQuoteRecord = _build_record_class('LevelOneQuoteRecord', 'level_one_quote')
+LevelOneOptionRecord = _build_record_class('LevelOneOptionRecord', 'level_one_option')
+LevelOneFuturesRecord = _build_record_class('LevelOneFuturesRecord', 'level_one_futures')
+LevelOneForexRecord = _build_record_class('LevelOneForexRecord', 'level_one_forex')
+LevelOneFuturesOptionsRecord = _build_record_class('LevelOneFuturesOptionsRecord', 'level_one_futures_options')
+NewsHeadlineRecord = _build_record_class('NewsHeadlineRecord', 'news_headline')
+TimesaleRecord = _build_record_class('TimesaleRecord', 'timesale')
+ChartEquityRecord = _build_record_class('ChartEquityRecord', 'chart_equity')
+ChartFuturesRecord = _build_record_class('ChartFuturesRecord', 'chart_futures')
+ChartOptionsRecord = _build_record_class('ChartOptionsRecord', 'chart_options')
+AccountActivityRecord = _build_record_class('AccountActivityRecord', 'account_activity')
+
+RECORD_CLASSES: Dict[str, type] = {
+    record_class.service_endpoint: record_class for record_class in (
+        LevelOneQuoteRecord, LevelOneOptionRecord, LevelOneFuturesRecord, LevelOneForexRecord,
+        LevelOneFuturesOptionsRecord, NewsHeadlineRecord, TimesaleRecord, ChartEquityRecord,
+        ChartFuturesRecord, ChartOptionsRecord, AccountActivityRecord
+    )
+}
+
+# the record class of every service, looked up once per content item.
+SERVICE_RECORD_CLASSES: Dict[str, type] = {
+    service_name: RECORD_CLASSES[endpoint] for service_name, endpoint in SERVICE_ENDPOINTS.items()
+}
+
+
+def decode_record(service_name: str, content: dict) -> StreamRecord:
+    """Decodes a single content item into its typed record.
+
+    Arguments:
+    ----
+    service_name {str} -- The service the content came from, like `QUOTE`.
+
+    content {dict} -- The content item.
+
+    Returns:
+    ----
+    StreamRecord -- The record, or the content itself if the service has no
+        record class. Unknown fields are dropped.
+    """
+
+    record_class = SERVICE_RECORD_CLASSES.get(service_name)
+
+    if record_class is None:
+        return content
+
+    record = record_class()
+    setters = record_class._setters
+
+    for field_id, value in content.items():
+        setter = setters.get(field_id)
+        if setter is not None:
+            setter(record, value)
+
+    return record
+
+
+def decode_records(message: dict) -> dict:
+    """Replaces the content of every service result in a message with typed records, in place.
+
+    Arguments:
+    ----
+    message {dict} -- A decoded stream message.
+
+    Returns:
+    ----
+    dict -- The same message.
+    """
+
+    if 'data' in message:
+        service_results = message['data']
+    elif 'snapshot' in message:
+        service_results = message['snapshot']
+    else:
+        return message
+
+    for service_result in service_results:
+
+        service_name = service_result['service']
+
+        if service_name in SERVICE_RECORD_CLASSES:
+            service_result['content'] = [decode_record(service_name, content) for content in service_result['content']]
+
+    return message
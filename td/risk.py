@@ -0,0 +1,690 @@
+import threading
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Set
+from typing import Tuple
+from typing import Union
+from td.account_activity import AccountActivity
+from td.account_activity import parse_activity_content
+from td.account_activity import parse_activity_message
+from td.account_snapshot import AccountSnapshot
+from td.account_snapshot import AccountSnapshots
+from td.order_state import ACTIVITY_STATUSES
+from td.order_state import FILL_MESSAGE_TYPES
+
+# the instructions that add to a position, and the ones that take away from it.
+BUY_INSTRUCTIONS = frozenset(['BUY', 'BUY_TO_COVER', 'BUY_TO_OPEN', 'BUY_TO_CLOSE'])
+SELL_INSTRUCTIONS = frozenset(['SELL', 'SELL_SHORT', 'SELL_TO_OPEN', 'SELL_TO_CLOSE'])
+
+# the number of shares an option contract is for.
+OPTION_MULTIPLIER = 100
+
+
+class RiskCheckError(ValueError):
+
+    """
+        An order that failed a pre-trade risk check, it was never sent.
+
+        `check` is the name of the check, one of `invalid_order`,
+        `restricted_symbol`, `max_position`, `max_notional`, `buying_power`
+        or `no_price`.
+    """
+
+    def __init__(self, check: str, message: str, account: str = None, symbol: str = None) -> None:
+
+        super().__init__(message)
+
+        self.check = check
+        self.account = account
+        self.symbol = symbol
+
+
+class Reservation():
+
+    """The exposure of a single leg of an order that passed the checks, until it fills or ends."""
+
+    __slots__ = ('account', 'symbol', 'instruction', 'is_buy', 'quantity', 'unit_notional', 'order_id')
+
+    def __init__(self, account: str, symbol: str, instruction: str, is_buy: bool, quantity: float,
+                 unit_notional: float = 0.0) -> None:
+
+        self.account = account
+        self.symbol = symbol
+        self.instruction = instruction
+        self.is_buy = is_buy
+        self.quantity = quantity
+
+        # what a unit of a buy takes from the buying power, 0 for sells.
+        self.unit_notional = unit_notional
+
+        # set by the first ACCT_ACTIVITY message of the order.
+        self.order_id = None
+
+    def __repr__(self) -> str:
+        return '<Reservation {} {} {:g} order_id={}>'.format(self.instruction, self.symbol, self.quantity, self.order_id)
+
+
+class AccountRisk():
+
+    """The positions, buying power and working orders of a single account, as the risk checks see them."""
+
+    __slots__ = ('account', 'buying_power', 'positions', 'updated_at', 'reservations', 'pending_buys',
+                 'pending_sells', 'pending_notional')
+
+    def __init__(self, account: str) -> None:
+
+        self.account = account
+        self.buying_power = None
+        self.positions: Dict[str, float] = {}
+        self.updated_at = 0.0
+
+        # the legs of the working orders, oldest first, and their totals.
+        self.reservations: List[Reservation] = []
+        self.pending_buys: Dict[str, float] = {}
+        self.pending_sells: Dict[str, float] = {}
+        self.pending_notional = 0.0
+
+    def __repr__(self) -> str:
+        return '<AccountRisk {} buying_power={} positions={} working={}>'.format(
+            self.account, self.buying_power, len(self.positions), len(self.reservations)
+        )
+
+
+class RiskManager():
+
+    """
+        Pre-trade risk checks against an in-memory view of positions and balances.
+
+        The positions and buying power of every account are loaded from
+        account snapshots, then kept current by the fills of the ACCT_ACTIVITY
+        stream, so checking an order never needs a request. A check is a few
+        dictionary lookups per leg, a handful of microseconds per order. A
+        fill is applied once, by its execution id, so a replayed message
+        doesn't move the position again.
+
+        Assign it to `TDClient.risk_manager` and every order is checked
+        before it leaves the client, through `place_order`, `place_orders`,
+        `modify_order` and `FastOrderPath`. An order that fails raises a
+        `RiskCheckError`, a `ValueError`, and is never sent.
+
+        An order that passes is reserved until it's done: its quantity counts
+        against `max_position`, and a buy's value against the buying power, so
+        orders sent one after the other can't get around a limit while they're
+        working. The reservation shrinks with every fill and is released when
+        the order is cancelled or rejected, or when its request fails. Both
+        orders of an OCO are reserved until one of them is cancelled, and a
+        replacement is reserved on top of the order it replaces until the
+        replace is confirmed.
+
+        Every check is off unless it's configured:
+
+            restricted_symbols -- Symbols that can't be traded at all.
+            max_position -- The largest absolute position, in shares or contracts,
+                an order can leave a symbol at. A number for every symbol, or a
+                dictionary of limits by symbol.
+            max_notional -- The largest value of a single order, price times quantity.
+            check_buying_power -- Buy orders can't be worth more than the buying power
+                of the account, once it's known.
+
+        Usage:
+        ----
+            risk = RiskManager(max_notional=50000.0, max_position=1000, restricted_symbols=['GME'])
+            risk.update_snapshots(snapshots=TDSession.get_account_snapshots(accounts=['MyAccountNumber']))
+            TDSession.risk_manager = risk
+            TDStreamingClient.risk_updates(risk_manager=risk)
+    """
+
+    def __init__(self, max_notional: float = None, max_position: Union[float, Dict[str, float]] = None,
+                 restricted_symbols: Iterable[str] = None, check_buying_power: bool = False) -> None:
+        """Initalizes the checks, with no positions.
+
+        Keyword Arguments:
+        ----
+        max_notional {float} -- The largest value of a single order. (default: {None})
+
+        max_position {Union[float, Dict[str, float]]} -- The largest absolute position, for
+            every symbol, or by symbol. (default: {None})
+
+        restricted_symbols {Iterable[str]} -- The symbols that can't be traded. (default: {None})
+
+        check_buying_power {bool} -- Check buy orders against the buying power. (default: {False})
+        """
+
+        self.max_notional = max_notional
+        self.max_position = max_position
+        self.restricted_symbols = frozenset(restricted_symbols or ())
+        self.check_buying_power = check_buying_power
+
+        self.accounts: Dict[str, AccountRisk] = {}
+
+        # the last known price of every symbol, used to value orders without a price.
+        self.prices: Dict[str, float] = {}
+
+        # the `(account, execution id)` of every fill applied.
+        self._execution_ids: Set[Tuple[str, str]] = set()
+
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return '<RiskManager accounts={} max_notional={} max_position={} restricted={}>'.format(
+            len(self.accounts), self.max_notional, self.max_position, len(self.restricted_symbols)
+        )
+
+    def _account(self, account: str) -> AccountRisk:
+
+        account_risk = self.accounts.get(account)
+
+        if account_risk is None:
+            account_risk = self.accounts[account] = AccountRisk(account=account)
+
+        return account_risk
+
+    def position(self, account: str, symbol: str) -> float:
+        """Returns the net position of a symbol, long minus short, 0 if there's none."""
+
+        account_risk = self.accounts.get(account)
+
+        return account_risk.positions.get(symbol, 0.0) if account_risk is not None else 0.0
+
+    def set_price(self, symbol: str, price: float) -> None:
+        """Sets the price used to value the orders of a symbol that don't carry one, like market orders."""
+
+        self.prices[symbol] = price
+
+    def update_snapshot(self, snapshot: AccountSnapshot) -> None:
+        """Replaces the positions and buying power of an account with a fresh snapshot.
+
+        A snapshot whose request failed is skipped, so the last known state stays in place.
+
+        Arguments:
+        ----
+        snapshot {AccountSnapshot} -- The snapshot, from `TDClient.get_account_snapshots`.
+        """
+
+        if not snapshot.ok:
+            return None
+
+        positions = {}
+        prices = {}
+        table = snapshot.positions
+
+        for symbol, asset_type, long_quantity, short_quantity, market_value in zip(
+            table.symbol, table.asset_type, table.long_quantity, table.short_quantity, table.market_value
+        ):
+
+            quantity = long_quantity - short_quantity
+            positions[symbol] = positions.get(symbol, 0.0) + quantity
+
+            # NaN never equals itself, a missing market value is skipped.
+            if quantity and market_value == market_value:
+                multiplier = OPTION_MULTIPLIER if asset_type == 'OPTION' else 1
+                prices[symbol] = abs(market_value / quantity / multiplier)
+
+        buying_power = snapshot.balances.buying_power[0] if len(snapshot.balances) else None
+
+        with self._lock:
+
+            self.prices.update(prices)
+
+            account_risk = self._account(snapshot.account)
+            account_risk.positions = positions
+            account_risk.buying_power = buying_power if buying_power == buying_power else None
+            account_risk.updated_at = snapshot.fetched_at
+
+    def update_snapshots(self, snapshots: Union[AccountSnapshots, Iterable[AccountSnapshot]]) -> None:
+        """Applies the snapshot of every account, see `update_snapshot`."""
+
+        if isinstance(snapshots, AccountSnapshots):
+            snapshots = snapshots.snapshots.values()
+
+        for snapshot in snapshots:
+            self.update_snapshot(snapshot=snapshot)
+
+    def apply_fill(self, account: str, symbol: str, instruction: str, quantity: float, price: float = None,
+                   asset_type: str = 'EQUITY', execution_id: str = None) -> bool:
+        """Moves a position, and the buying power, by a single fill.
+
+        Arguments:
+        ----
+        account {str} -- The account of the fill.
+
+        symbol {str} -- The symbol that was traded.
+
+        instruction {str} -- The instruction of the order, like `BUY` or `SELL_SHORT`.
+
+        quantity {float} -- The quantity of the fill.
+
+        Keyword Arguments:
+        ----
+        price {float} -- The price of the fill. (default: {None})
+
+        asset_type {str} -- The asset type, options are valued with their multiplier. (default: {'EQUITY'})
+
+        execution_id {str} -- The id of the fill, a fill whose id was already applied is
+            skipped. (default: {None})
+
+        Raises:
+        ----
+        ValueError: If the instruction isn't a buy or a sell.
+
+        Returns:
+        ----
+        bool -- `False` if the fill was already applied.
+        """
+
+        if instruction in BUY_INSTRUCTIONS:
+            signed_quantity = quantity
+        elif instruction in SELL_INSTRUCTIONS:
+            signed_quantity = -quantity
+        else:
+            raise ValueError('{!r} is not a buy or a sell instruction.'.format(instruction))
+
+        with self._lock:
+
+            if execution_id is not None:
+                if (account, execution_id) in self._execution_ids:
+                    return False
+                self._execution_ids.add((account, execution_id))
+
+            account_risk = self._account(account)
+            account_risk.positions[symbol] = account_risk.positions.get(symbol, 0.0) + signed_quantity
+
+            if price is not None:
+
+                self.prices[symbol] = price
+
+                if account_risk.buying_power is not None:
+                    multiplier = OPTION_MULTIPLIER if asset_type == 'OPTION' else 1
+                    account_risk.buying_power -= signed_quantity * price * multiplier
+
+        return True
+
+    def apply_activity(self, activity: AccountActivity) -> bool:
+        """Applies an ACCT_ACTIVITY record, only fills move the positions.
+
+        A fill that was already applied, or whose instruction isn't a buy or a
+        sell, is skipped, as there's no telling which way it moved the position.
+        A fill takes its quantity off the order's reservation, a cancel or a
+        rejection releases what's left of it, and so does a replace for the
+        order it replaces.
+
+        Returns:
+        ----
+        bool -- `True` if the record was a fill, and it was applied.
+        """
+
+        if activity is None:
+            return False
+
+        message_type = activity.message_type
+
+        if message_type not in FILL_MESSAGE_TYPES:
+
+            if message_type == 'OrderEntryRequest':
+                self._settle(activity=activity, order_id=activity.order_id, quantity=0.0)
+            elif ACTIVITY_STATUSES.get(message_type) in ('CANCELED', 'REJECTED'):
+                self._settle(activity=activity, order_id=activity.order_id)
+            elif message_type == 'OrderCancelReplaceRequest':
+                self._settle(activity=activity, order_id=activity.original_order_id)
+
+            return False
+
+        if not activity.execution_quantity:
+            return False
+
+        if activity.instruction not in BUY_INSTRUCTIONS and activity.instruction not in SELL_INSTRUCTIONS:
+            return False
+
+        applied = self.apply_fill(
+            account=activity.account,
+            symbol=activity.symbol,
+            instruction=activity.instruction,
+            quantity=activity.execution_quantity,
+            price=activity.execution_price,
+            asset_type='OPTION' if activity.security_type and 'Option' in activity.security_type else 'EQUITY',
+            execution_id=activity.execution_id
+        )
+
+        if applied:
+            self._settle(activity=activity, order_id=activity.order_id, quantity=activity.execution_quantity)
+
+        return applied
+
+    def _reduce(self, account_risk: AccountRisk, reservation: Reservation, quantity: float) -> None:
+        """Takes a quantity off a reservation and the totals, dropping it once nothing is left."""
+
+        quantity = min(quantity, reservation.quantity)
+        reservation.quantity -= quantity
+
+        pending = account_risk.pending_buys if reservation.is_buy else account_risk.pending_sells
+        pending[reservation.symbol] -= quantity
+        account_risk.pending_notional -= quantity * reservation.unit_notional
+
+        if reservation.quantity <= 0:
+
+            account_risk.reservations.remove(reservation)
+
+            if pending[reservation.symbol] <= 0:
+                del pending[reservation.symbol]
+
+            if not account_risk.reservations:
+                account_risk.pending_notional = 0.0
+
+    def _settle(self, activity: AccountActivity, order_id: int, quantity: float = None) -> None:
+        """Takes a fill off the reservations of an order, or releases them all if there's no quantity.
+
+        The reservations are found by order id, the first message of an order
+        claims the oldest reservation with the same symbol and instruction.
+        """
+
+        with self._lock:
+
+            account_risk = self.accounts.get(activity.account)
+
+            if account_risk is None or not account_risk.reservations:
+                return None
+
+            if quantity is None:
+                reservations = [
+                    reservation for reservation in account_risk.reservations
+                    if order_id is not None and reservation.order_id == order_id
+                ]
+            else:
+                reservations = [
+                    reservation for reservation in account_risk.reservations
+                    if order_id is not None and reservation.order_id == order_id and reservation.symbol == activity.symbol
+                ]
+
+            if not reservations:
+                for reservation in account_risk.reservations:
+                    if (reservation.order_id is None and reservation.symbol == activity.symbol
+                            and reservation.instruction == activity.instruction):
+                        reservation.order_id = order_id
+                        reservations = [reservation]
+                        break
+
+            for reservation in reservations:
+                self._reduce(account_risk, reservation, reservation.quantity if quantity is None else quantity)
+
+    def release(self, reservations: Iterable[Reservation]) -> None:
+        """Releases what's left of some reservations, for orders that were never placed.
+
+        Arguments:
+        ----
+        reservations {Iterable[Reservation]} -- The reservations returned by `check`.
+        """
+
+        with self._lock:
+
+            for reservation in reservations:
+
+                account_risk = self.accounts.get(reservation.account)
+
+                if account_risk is not None and reservation in account_risk.reservations:
+                    self._reduce(account_risk, reservation, reservation.quantity)
+
+    def process_message(self, message: dict) -> int:
+        """Applies the fills of a stream message, to keep the positions current.
+
+        Arguments:
+        ----
+        message {dict} -- A decoded stream message, other services are skipped.
+
+        Returns:
+        ----
+        int -- The number of fills applied.
+        """
+
+        return sum(self.apply_activity(activity=activity) for activity in parse_activity_message(message=message))
+
+    def on_record(self, service_name: str, service_timestamp: int, content: dict) -> None:
+        """`StreamHub` callback, applies a single ACCT_ACTIVITY item."""
+
+        self.apply_activity(activity=parse_activity_content(content=content))
+
+    def _limit(self, symbol: str) -> float:
+
+        if isinstance(self.max_position, dict):
+            return self.max_position.get(symbol)
+
+        return self.max_position
+
+    def _read_leg(self, account: str, leg: dict) -> Tuple[dict, str, float, str]:
+        """Returns the instrument, symbol, quantity and instruction of a leg, checking they're all there."""
+
+        instrument = leg.get('instrument') if isinstance(leg, dict) else None
+        symbol = instrument.get('symbol') if isinstance(instrument, dict) else None
+
+        if not isinstance(symbol, str) or not symbol:
+            raise RiskCheckError('invalid_order', 'An order leg has no instrument symbol: {!r}.'.format(leg), account)
+
+        quantity = leg.get('quantity')
+
+        if isinstance(quantity, bool) or not isinstance(quantity, (int, float)) or not quantity > 0:
+            raise RiskCheckError(
+                'invalid_order', 'The order leg for {} has no valid quantity: {!r}.'.format(symbol, quantity),
+                account, symbol
+            )
+
+        instruction = leg.get('instruction')
+
+        if instruction not in BUY_INSTRUCTIONS and instruction not in SELL_INSTRUCTIONS:
+            raise RiskCheckError(
+                'invalid_order', 'The order leg for {} has no buy or sell instruction: {!r}.'.format(
+                    symbol, instruction
+                ),
+                account, symbol
+            )
+
+        return instrument, symbol, quantity, instruction
+
+    def _check_order(self, account: str, order: dict, projected: Dict[str, float], buying_power: list,
+                     reserved: list) -> None:
+        """Checks a single order, then its child orders, moving `projected` and `buying_power` as it goes.
+
+        The legs that pass are added to `reserved`, as `Reservation` objects.
+        """
+
+        if not isinstance(order, dict):
+            raise RiskCheckError('invalid_order', 'An order has to be a payload, not {!r}.'.format(order), account)
+
+        legs = order.get('orderLegCollection')
+
+        if legs:
+
+            notional = 0.0
+            buy_notional = 0.0
+            order_price = order.get('price', order.get('stopPrice'))
+
+            account_risk = self.accounts.get(account)
+            pending_buys = account_risk.pending_buys if account_risk is not None else {}
+            pending_sells = account_risk.pending_sells if account_risk is not None else {}
+
+            for leg in legs:
+
+                instrument, symbol, quantity, instruction = self._read_leg(account, leg)
+                is_buy = instruction in BUY_INSTRUCTIONS
+                reservation = Reservation(
+                    account=account, symbol=symbol, instruction=instruction, is_buy=is_buy, quantity=quantity
+                )
+                reserved.append(reservation)
+
+                if symbol in self.restricted_symbols:
+                    raise RiskCheckError(
+                        'restricted_symbol', '{} is a restricted symbol.'.format(symbol), account, symbol
+                    )
+
+                if self.max_position is not None:
+
+                    limit = self._limit(symbol)
+                    position = projected.get(symbol)
+
+                    if position is None:
+                        position = projected[symbol] = self.position(account, symbol)
+
+                    position += quantity if is_buy else -quantity
+
+                    # the working orders on the same side could all fill first.
+                    if is_buy:
+                        exposure = position + pending_buys.get(symbol, 0.0)
+                    else:
+                        exposure = position - pending_sells.get(symbol, 0.0)
+
+                    if limit is not None and abs(exposure) > limit:
+                        raise RiskCheckError(
+                            'max_position',
+                            'The order takes the position in {} to {:g}, over the limit of {:g}.'.format(
+                                symbol, exposure, limit
+                            ),
+                            account, symbol
+                        )
+
+                    projected[symbol] = position
+
+                if self.max_notional is None and not buying_power:
+                    continue
+
+                # a leg of a spread is priced at the last known price, the order price is the net.
+                price = order_price if len(legs) == 1 and order_price is not None else self.prices.get(symbol)
+
+                if price is None:
+                    raise RiskCheckError(
+                        'no_price', 'The order for {} has no price, and there is no known price to value it.'.format(
+                            symbol
+                        ),
+                        account, symbol
+                    )
+
+                unit_notional = price * (OPTION_MULTIPLIER if instrument.get('assetType') == 'OPTION' else 1)
+                leg_notional = quantity * unit_notional
+                notional += leg_notional
+
+                if is_buy:
+                    buy_notional += leg_notional
+                    reservation.unit_notional = unit_notional
+
+            if self.max_notional is not None and notional > self.max_notional:
+                raise RiskCheckError(
+                    'max_notional', 'The order is worth {:,.2f}, over the limit of {:,.2f}.'.format(
+                        notional, self.max_notional
+                    ),
+                    account
+                )
+
+            if buying_power:
+
+                buying_power[0] -= buy_notional
+
+                if buying_power[0] < 0:
+                    raise RiskCheckError(
+                        'buying_power', 'The order needs {:,.2f} more buying power than the account has.'.format(
+                            -buying_power[0]
+                        ),
+                        account
+                    )
+
+        children = order.get('childOrderStrategies', ())
+
+        # only one order of an OCO can fill, every one is checked from the same starting point.
+        if order.get('orderStrategyType') == 'OCO':
+            for child in children:
+                self._check_order(
+                    account=account, order=child, projected=dict(projected), buying_power=list(buying_power),
+                    reserved=reserved
+                )
+            return None
+
+        for child in children:
+            self._check_order(
+                account=account, order=child, projected=projected, buying_power=buying_power, reserved=reserved
+            )
+
+    def check(self, account: str, order: dict, reserve: bool = True) -> List[Reservation]:
+        """Runs the checks on an order, and reserves it if it passes.
+
+        Every order of the payload is checked, the child orders included,
+        and every leg moves the position it trades, so a triggered order is
+        checked as if its parent had filled. The orders of an OCO are checked
+        one at a time, as only one of them can fill. The working orders that
+        were reserved before count against the limits too.
+
+        Arguments:
+        ----
+        account {str} -- The account the order is for.
+
+        order {dict} -- The order payload.
+
+        Keyword Arguments:
+        ----
+        reserve {bool} -- Whether to reserve the order, `False` only checks it. (default: {True})
+
+        Raises:
+        ----
+        RiskCheckError: If the order fails a check, nothing is reserved.
+
+        Returns:
+        ----
+        List[Reservation] -- The reservations of the order, pass them to `release` if it
+            isn't placed after all.
+        """
+
+        return self.check_many(account=account, orders=(order,), reserve=reserve)[0]
+
+    def check_many(self, account: str, orders: Iterable[dict], reserve: bool = True) -> List[List[Reservation]]:
+        """Runs the checks on a batch of orders, as if they were all placed, and reserves them if they pass.
+
+        The positions and the buying power carry over from one order to the
+        next, so a batch can't get around a limit by splitting an order.
+
+        Arguments:
+        ----
+        account {str} -- The account the orders are for.
+
+        orders {Iterable[dict]} -- The order payloads.
+
+        Keyword Arguments:
+        ----
+        reserve {bool} -- Whether to reserve the orders, `False` only checks them. (default: {True})
+
+        Raises:
+        ----
+        RiskCheckError: If any of the orders fails a check, nothing is reserved.
+
+        Returns:
+        ----
+        List[List[Reservation]] -- The reservations of every order, in the order of `orders`.
+        """
+
+        projected = {}
+        buying_power = []
+        reservations = []
+
+        # checked and reserved at once, so two orders checked at the same time can't both take the room left.
+        with self._lock:
+
+            account_risk = self.accounts.get(account)
+
+            if self.check_buying_power and account_risk is not None and account_risk.buying_power is not None:
+                buying_power.append(account_risk.buying_power - account_risk.pending_notional)
+
+            for order in orders:
+                reserved = []
+                self._check_order(
+                    account=account, order=order, projected=projected, buying_power=buying_power, reserved=reserved
+                )
+                reservations.append(reserved)
+
+            if reserve:
+
+                account_risk = self._account(account)
+
+                for reservation in (reservation for reserved in reservations for reservation in reserved):
+
+                    pending = account_risk.pending_buys if reservation.is_buy else account_risk.pending_sells
+                    pending[reservation.symbol] = pending.get(reservation.symbol, 0.0) + reservation.quantity
+
+                    account_risk.pending_notional += reservation.quantity * reservation.unit_notional
+                    account_risk.reservations.append(reservation)
+
+        return reservations
@@ -6,7 +6,26 @@ import urllib
 import websockets
 import unicodedata
 import io
+import time
+import logging
+import collections
 from td.fields import STREAM_FIELD_IDS, CSV_FIELD_KEYS, CSV_FIELD_KEYS_LEVEL_2
+from td.actives import ActivesTracker
+from td.book_analytics import BookAnalytics
+from td.chart_history import CHART_HISTORY_SPANS
+from td.chart_history import MILLISECONDS_PER_DAY
+from td.chart_history import ChartHistoryAssembler
+from td.chart_history import split_range
+from td.metrics import LatencyHistogram
+from td.order_state import OrderStateManager
+from td.risk import RiskManager
+from td.records import decode_records
+from td.records import SERVICE_ENDPOINTS
+
+# the stages of the hot path that are timed when instrumentation is on.
+LATENCY_STAGES = ('exchange_to_receive', 'decode', 'queue_wait', 'handler')
+
+logger = logging.getLogger(__name__)
 
 class TDStreamerClient():
 
@@ -47,6 +66,9 @@ class TDStreamerClient():
         # this will hold all of our requests
         self.data_requests = {"requests": []}
 
+        # the id of the last request built, the login request is 0.
+        self._request_count = 0
+
         # this will house all of our field numebrs and keys so that way the user can use names to define the fields they want.
         self.fields_ids_dictionary = STREAM_FIELD_IDS
         self.fields_keys_write = CSV_FIELD_KEYS
@@ -57,6 +79,38 @@ class TDStreamerClient():
         self.print_to_console = True
         self.write_flag = False
 
+        # conflation is opt-in, see `conflation_mode`.
+        self.conflation_services = set()
+        self.conflation_stats = {}
+        self._conflation_pending = {}
+        self._conflation_messages = collections.deque()
+        self._conflation_event: asyncio.Event = None
+        self._conflation_closed = False
+        self._conflation_received_ns = None
+
+        # latency instrumentation is opt-in, see `instrumentation`.
+        self.instrumented = False
+        self.latency_histograms = {}
+        self.latency_export_hooks = []
+        self.latency_export_interval = None
+        self._delivered_services = ()
+        self._delivered_ns = None
+
+        # typed records are opt-in, see `typed_records`.
+        self.record_decoding = False
+
+        # order book analytics are opt-in, see `level_two_analytics`.
+        self.book_analytics: BookAnalytics = None
+
+        # ACTIVES rankings are opt-in, see `actives_rankings`.
+        self.actives_tracker: ActivesTracker = None
+
+        # filled in by `chart_history_futures_range`.
+        self.chart_history: ChartHistoryAssembler = None
+
+        # the stages above that see every decoded message.
+        self._message_processors = []
+
         try:
             self.loop = asyncio.get_event_loop()
         except websockets.WebSocketException:
@@ -109,6 +163,259 @@ class TDStreamerClient():
 
             self.write_flag = True
 
+    def conflation_mode(self, services: list = None) -> None:
+        """Turns on per-symbol conflation for the data pipeline.
+
+        When conflation is on, `build_pipeline` starts a background task that
+        keeps reading the websocket. Updates for the conflated services are
+        merged per symbol until `start_pipeline` is called again, so a consumer
+        that falls behind gets one update per symbol holding the latest value
+        of every field, instead of a backlog of stale ones. Every merged record
+        gets a `conflated` key with the number of updates it represents, and
+        totals are kept per service in `conflation_stats`.
+
+        Keyword Arguments:
+        ----
+        services {list} -- The services to conflate. Defaults to the level one
+            services: QUOTE, OPTION, LEVELONE_FUTURES, LEVELONE_FOREX and
+            LEVELONE_FUTURES_OPTIONS. (default: {None})
+        """
+
+        if services is None:
+            services = ['QUOTE', 'OPTION', 'LEVELONE_FUTURES', 'LEVELONE_FOREX', 'LEVELONE_FUTURES_OPTIONS']
+
+        self.conflation_services = set(services)
+
+        for service in self.conflation_services:
+            self.conflation_stats.setdefault(service, {'updates': 0, 'conflated': 0})
+
+    def typed_records(self, enabled: bool = True) -> None:
+        """Makes `start_pipeline` return typed records instead of dictionaries.
+
+        When on, the content of every service that has a record class in
+        `td.records` (the level one services, TIMESALE, CHART, NEWS_HEADLINE
+        and ACCT_ACTIVITY) is returned as slotted records with attribute access
+        by field name, for example `record.bid_price`. The CSV writer and the
+        conflation stage still work on the raw content.
+
+        Keyword Arguments:
+        ----
+        enabled {bool} -- Whether to return typed records or not. (default: {True})
+        """
+
+        self.record_decoding = enabled
+
+    def level_two_analytics(self, depth_levels: int = 5, interval: float = 1.0, callbacks: list = None) -> BookAnalytics:
+        """Computes order book analytics on every level two update as it's received.
+
+        The books are read straight from the decoded message, so the analytics
+        don't add a second parse. The metrics are kept in `book_analytics.metrics`
+        and emitted to the callbacks at most once per interval, once the pipeline
+        is built a timer emits the changes that no later update picks up.
+
+        Keyword Arguments:
+        ----
+        depth_levels {int} -- The number of levels of each side used by the weighted
+            mid. (default: {5})
+
+        interval {float} -- The least number of seconds between two emits. (default: {1.0})
+
+        callbacks {list} -- Functions called with the list of `BookMetrics` that changed
+            since the last emit. (default: {None})
+
+        Returns:
+        ----
+        BookAnalytics -- The analytics stage.
+        """
+
+        self.book_analytics = BookAnalytics(depth_levels=depth_levels, interval=interval, callbacks=callbacks)
+        self._message_processors.append(self.book_analytics.process_message)
+
+        return self.book_analytics
+
+    def actives_rankings(self, callbacks: list = None) -> ActivesTracker:
+        """Parses every ACTIVES message into ranking tables as it's received.
+
+        The latest ranking of every venue and duration is kept in
+        `actives_tracker.tables`, and the callbacks are called with the table
+        and its rank changes whenever a ranking moves.
+
+        Keyword Arguments:
+        ----
+        callbacks {list} -- Functions called as `callback(table, changes)`. (default: {None})
+
+        Returns:
+        ----
+        ActivesTracker -- The tracker.
+        """
+
+        self.actives_tracker = ActivesTracker(callbacks=callbacks)
+        self._message_processors.append(self.actives_tracker.process_message)
+
+        return self.actives_tracker
+
+    def order_updates(self, order_state: OrderStateManager) -> OrderStateManager:
+        """Keeps an order state view current from the ACCT_ACTIVITY stream.
+
+        Subscribes to ACCT_ACTIVITY and applies every message to the view as
+        it's received, so the orders don't have to be polled.
+
+        Arguments:
+        ----
+        order_state {OrderStateManager} -- The view, already loaded from the REST API.
+
+        Returns:
+        ----
+        OrderStateManager -- The view.
+        """
+
+        self._subscribe_account_activity()
+        self._message_processors.append(order_state.process_message)
+
+        return order_state
+
+    def risk_updates(self, risk_manager: RiskManager) -> RiskManager:
+        """Keeps the positions and working orders of a risk manager current from the ACCT_ACTIVITY stream.
+
+        Subscribes to ACCT_ACTIVITY and applies every message to the risk
+        manager as it's received: fills move the positions and shrink the
+        reservations, cancels and rejections release them.
+
+        Arguments:
+        ----
+        risk_manager {RiskManager} -- The risk manager, usually the one assigned to `TDClient.risk_manager`.
+
+        Returns:
+        ----
+        RiskManager -- The risk manager.
+        """
+
+        self._subscribe_account_activity()
+        self._message_processors.append(risk_manager.process_message)
+
+        return risk_manager
+
+    def _subscribe_account_activity(self) -> None:
+        """Requests ACCT_ACTIVITY, unless it's already requested."""
+
+        if not any(request['service'] == 'ACCT_ACTIVITY' for request in self.data_requests['requests']):
+            self.account_activity()
+
+    def instrumentation(self, enabled: bool = True, export_interval: int = None, export_hooks: list = None) -> None:
+        """Turns the hot path latency instrumentation on or off.
+
+        Once on, every service gets a `LatencyHistogram` for each of the
+        following stages, all in microseconds:
+
+            exchange_to_receive -- From the service `timestamp` to the message
+                being received, this includes any clock difference with TD.
+            decode -- Parsing the JSON message.
+            queue_wait -- From the message being received to it being handed
+                to the consumer by `start_pipeline`.
+            handler -- From `start_pipeline` returning to it being called again,
+                which is the time spent in the consumer's handler.
+
+        Keyword Arguments:
+        ----
+        enabled {bool} -- Whether to record latencies or not. (default: {True})
+
+        export_interval {int} -- If given, every `export_interval` seconds the
+            export hooks are called with `latency_snapshot()`. (default: {None})
+
+        export_hooks {list} -- Callables that receive the periodic snapshots. (default: {None})
+        """
+
+        self.instrumented = enabled
+        self.latency_export_interval = export_interval
+
+        if export_hooks:
+            self.latency_export_hooks.extend(export_hooks)
+
+    def latency_snapshot(self, reset: bool = False) -> dict:
+        """Summarizes the recorded latencies.
+
+        Keyword Arguments:
+        ----
+        reset {bool} -- Clears the histograms after taking the snapshot, so the
+            next snapshot only covers the next interval. (default: {False})
+
+        Returns:
+        ----
+        dict -- The histogram summaries keyed by service and then by stage.
+        """
+
+        snapshot = {}
+
+        for service_name, histograms in self.latency_histograms.items():
+            snapshot[service_name] = {stage: histogram.snapshot() for stage, histogram in histograms.items()}
+
+            if reset:
+                for histogram in histograms.values():
+                    histogram.reset()
+
+        return snapshot
+
+    def _record_latency(self, service_name: str, stage: str, value: int) -> None:
+        """Records a latency, in microseconds, for a service and stage."""
+
+        histograms = self.latency_histograms.get(service_name)
+
+        if histograms is None:
+            histograms = {latency_stage: LatencyHistogram() for latency_stage in LATENCY_STAGES}
+            self.latency_histograms[service_name] = histograms
+
+        histograms[stage].record(value)
+
+    def _message_services(self, message: dict) -> list:
+        """Returns the service results of a decoded message, if it has any."""
+
+        if 'data' in message:
+            return message['data']
+        elif 'snapshot' in message:
+            return message['snapshot']
+
+        return []
+
+    def _record_receive_latency(self, message: dict, received_ns: int, received_ms: float, decoded_ns: int) -> None:
+        """Records the exchange to receive and decode latencies of a message.
+
+        Both receive times are taken as soon as `recv` returns, `received_ms` on
+        the wall clock to compare with the service timestamps and `received_ns`
+        on the performance counter, so the decode time isn't counted twice.
+        """
+
+        decode_time = (decoded_ns - received_ns) // 1000
+
+        for service_result in self._message_services(message=message):
+            service_name = service_result['service']
+            self._record_latency(service_name, 'exchange_to_receive', (received_ms - service_result['timestamp']) * 1000)
+            self._record_latency(service_name, 'decode', decode_time)
+
+    def _record_delivery_latency(self, message: dict, received_ns: int) -> None:
+        """Records the queue wait of a message that is handed to the consumer."""
+
+        delivered_ns = time.perf_counter_ns()
+        services = [service_result['service'] for service_result in self._message_services(message=message)]
+
+        for service_name in services:
+            self._record_latency(service_name, 'queue_wait', (delivered_ns - received_ns) // 1000)
+
+        # the handler clock starts now and stops on the next `start_pipeline` call.
+        self._delivered_services = services
+        self._delivered_ns = delivered_ns
+
+    async def _export_latency(self) -> None:
+        """Periodically hands a latency snapshot to the export hooks."""
+
+        while self.instrumented and self.latency_export_interval:
+
+            await asyncio.sleep(self.latency_export_interval)
+
+            snapshot = self.latency_snapshot()
+
+            for export_hook in self.latency_export_hooks:
+                export_hook(snapshot)
+
     def _write_non_chart_services(self, data_content: dict, service_name: str) -> list:
         """Takes a Non-Chart Services and parses the values to write.
 
@@ -442,6 +749,19 @@ class TDStreamerClient():
         # Build the Data Request.
         await self._send_message(self._build_data_request())
 
+        # Conflation needs to keep reading while the consumer is busy.
+        if self.conflation_services:
+            self._conflation_event = asyncio.Event()
+            self._conflation_closed = False
+            asyncio.ensure_future(self._conflation_reader())
+
+        if self.instrumented and self.latency_export_interval:
+            asyncio.ensure_future(self._export_latency())
+
+        # emit the last change of a book that goes quiet.
+        if self.book_analytics is not None:
+            asyncio.ensure_future(self.book_analytics.emit_periodically())
+
         return self.connection
 
     async def start_pipeline(self) -> dict:     
@@ -452,7 +772,25 @@ class TDStreamerClient():
         dict -- The data coming from the websocket.
         """
 
-        return await self._receive_message(return_value=True)
+        # the consumer is back, so its handler is done.
+        if self._delivered_ns is not None:
+
+            handler_time = (time.perf_counter_ns() - self._delivered_ns) // 1000
+
+            for service_name in self._delivered_services:
+                self._record_latency(service_name, 'handler', handler_time)
+
+            self._delivered_ns = None
+
+        if self._conflation_event is not None:
+            message = await self._next_conflated_message()
+        else:
+            message = await self._receive_message(return_value=True)
+
+        if self.record_decoding and message is not None:
+            decode_records(message=message)
+
+        return message
 
     def stream(self, print_to_console: bool = True) -> None:
         """Starts the stream and prints the output to the console.
@@ -479,6 +817,10 @@ class TDStreamerClient():
         # Start Recieving Messages.
         asyncio.ensure_future(self._receive_message(return_value=False))
 
+        # Export the latencies, if asked to.
+        if self.instrumented and self.latency_export_interval:
+            asyncio.ensure_future(self._export_latency())
+
         # Keep the Loop going, until an exception is reached.
         self.loop.run_forever()
 
@@ -631,15 +973,27 @@ class TDStreamerClient():
                 
                 # Grab the Message
                 message = await self.connection.recv()
+                received_ns = time.perf_counter_ns()
+                received_ms = time.time() * 1000
 
                 # Parse Message
                 message_decoded = await self._parse_json_message(message=message)
 
+                if self.instrumented:
+                    self._record_receive_latency(message_decoded, received_ns, received_ms, time.perf_counter_ns())
+
                 # Write the data if needed.
                 if self.write_flag:
                     await self._write_to_csv(data = message_decoded)
 
+                for process_message in self._message_processors:
+                    process_message(message_decoded)
+
                 if return_value:
+
+                    if self.instrumented:
+                        self._record_delivery_latency(message=message_decoded, received_ns=received_ns)
+
                     return message_decoded
                 elif self.print_to_console:
                     print('='*20)
@@ -655,6 +1009,187 @@ class TDStreamerClient():
                 print('Connection with server closed')
                 break
 
+    async def _conflation_reader(self) -> None:
+        """Reads the websocket in the background and conflates level one updates.
+
+        However the reader stops, the connection closing, an error in a message
+        processor or the task being cancelled, the buffers are marked closed so
+        the consumer drains what's left instead of waiting forever.
+        """
+
+        try:
+
+            while True:
+
+                try:
+
+                    # Grab the Message
+                    message = await self.connection.recv()
+                    received_ns = time.perf_counter_ns()
+                    received_ms = time.time() * 1000
+
+                except websockets.exceptions.ConnectionClosed:
+                    print('Connection with server closed')
+                    break
+
+                # Parse Message
+                message_decoded = await self._parse_json_message(message=message)
+
+                if self.instrumented:
+                    self._record_receive_latency(message_decoded, received_ns, received_ms, time.perf_counter_ns())
+
+                # Write the data if needed.
+                if self.write_flag:
+                    await self._write_to_csv(data=message_decoded)
+
+                for process_message in self._message_processors:
+                    process_message(message_decoded)
+
+                self._conflate_message(message=message_decoded, received_ns=received_ns)
+                self._conflation_event.set()
+
+        except Exception:
+            logger.exception('The conflation reader stopped on an error.')
+
+        finally:
+
+            # let the consumer drain what's left.
+            self._conflation_closed = True
+            self._conflation_event.set()
+
+    def _conflate_message(self, message: dict, received_ns: int = 0) -> None:
+        """Merges a decoded message into the pending conflated updates.
+
+        Arguments:
+        ----
+        message {dict} -- The decoded message.
+
+        Keyword Arguments:
+        ----
+        received_ns {int} -- When the message was received, in `time.perf_counter_ns`
+            nanoseconds. (default: {0})
+        """
+
+        # Anything that isn't streaming data is passed through untouched.
+        if 'data' not in message:
+            self._seal_conflated_batch()
+            self._conflation_messages.append((message, received_ns))
+            return None
+
+        pending = self._conflation_pending
+        passthrough = []
+
+        # the oldest update waiting sets the queue wait of the next batch.
+        if not pending:
+            self._conflation_received_ns = received_ns
+
+        for service_result in message['data']:
+
+            service_name = service_result['service']
+
+            if service_name not in self.conflation_services:
+                passthrough.append(service_result)
+                continue
+
+            service_stats = self.conflation_stats[service_name]
+
+            for content in service_result['content']:
+
+                pending_key = (service_name, content['key'])
+                service_stats['updates'] += 1
+
+                # keep the latest value of every field.
+                if pending_key in pending:
+                    _, merged = pending[pending_key]
+                    merged.update(content)
+                    merged['conflated'] += 1
+                    service_stats['conflated'] += 1
+                else:
+                    merged = dict(content)
+                    merged['conflated'] = 1
+
+                pending[pending_key] = (service_result['timestamp'], merged)
+
+        if passthrough:
+            self._seal_conflated_batch()
+            self._conflation_messages.append(({'data': passthrough}, received_ns))
+
+    def _seal_conflated_batch(self) -> None:
+        """Queues the pending conflated updates as a message, ahead of a message that arrived after them.
+
+        Updates that arrive from then on start a new batch, so the stream keeps
+        the order it arrived in.
+        """
+
+        if not self._conflation_pending:
+            return None
+
+        self._conflation_messages.append((self._conflated_message(), self._conflation_received_ns))
+
+    def _conflated_message(self) -> dict:
+        """Turns the pending conflated updates into a single `data` message, grouped by service."""
+
+        # Swap the buffer out, so new updates start a fresh round.
+        pending = self._conflation_pending
+        self._conflation_pending = {}
+
+        service_results = {}
+
+        for (service_name, _), (timestamp, merged) in pending.items():
+
+            if service_name not in service_results:
+                service_results[service_name] = {
+                    'service': service_name,
+                    'timestamp': timestamp,
+                    'command': 'SUBS',
+                    'content': []
+                }
+
+            service_result = service_results[service_name]
+            service_result['timestamp'] = max(service_result['timestamp'], timestamp)
+            service_result['content'].append(merged)
+
+        return {'data': list(service_results.values())}
+
+    async def _next_conflated_message(self) -> dict:
+        """Returns the next message from the conflation buffers, in the order they arrived.
+
+        A message that is not conflated seals the conflated updates that came
+        before it into a single `data` message, grouped by service, which is
+        returned first. Whatever is queued is returned before the updates that
+        are still being merged, as all of it arrived before them.
+
+        Returns:
+        ----
+        dict -- The next message, or `None` once the connection is closed and
+            everything has been returned.
+        """
+
+        while not self._conflation_messages and not self._conflation_pending:
+
+            if self._conflation_closed:
+                return None
+
+            self._conflation_event.clear()
+            await self._conflation_event.wait()
+
+        if self._conflation_messages:
+
+            message, received_ns = self._conflation_messages.popleft()
+
+            if self.instrumented:
+                self._record_delivery_latency(message=message, received_ns=received_ns)
+
+            return message
+
+        received_ns = self._conflation_received_ns
+        message = self._conflated_message()
+
+        if self.instrumented:
+            self._record_delivery_latency(message=message, received_ns=received_ns)
+
+        return message
+
     async def _parse_json_message(self, message: str) -> dict:
         """Parses incoming messages from the stream
 
@@ -694,8 +1229,10 @@ class TDStreamerClient():
             so that the requests are in order.
         '''
 
-        # first get the current service request count
-        service_count = len(self.data_requests['requests']) + 1
+        # every request gets its own id, even the ones sent after the stream started,
+        # so the responses can be matched to their requests.
+        self._request_count += 1
+        service_count = self._request_count
 
         request = {
             "service": None, 
@@ -758,6 +1295,82 @@ class TDStreamerClient():
                 return key_value
                 
 
+    async def add_subscription(self, service=None, symbols=None, fields=None):
+        '''
+            Adds symbols to a service without touching the symbols already subscribed,
+            using the `ADD` command. If the stream is already running the request is sent
+            right away, otherwise it is sent with the other requests when the stream starts.
+
+            NAME: service
+            DESC: The service to add the symbols to, for example `QUOTE` or `OPTION`.
+            TYPE: String
+
+            NAME: symbols
+            DESC: The symbols to add.
+            TYPE: List<String>
+
+            NAME: fields
+            DESC: The fields for the request, defaults to every field of the service.
+            TYPE: List<int> | List<str>
+        '''
+
+        endpoint = SERVICE_ENDPOINTS.get(service)
+
+        if endpoint is None and fields is None:
+            raise ValueError('The fields are required for the {} service.'.format(service))
+
+        if fields is None:
+            fields = list(self.fields_ids_dictionary[endpoint].keys())
+        elif endpoint is not None:
+            fields = self._validate_argument(argument=fields, endpoint=endpoint)
+
+        # Build the request
+        request = self._new_request_template()
+        request['service'] = service
+        request['command'] = 'ADD'
+        request['parameters']['keys'] = ','.join(symbols)
+        request['parameters']['fields'] = ','.join(str(field) for field in fields)
+
+        await self._send_dynamic_request(request=request)
+
+    async def remove_subscription(self, service=None, symbols=None):
+        '''
+            Removes symbols from a service, using the `UNSUBS` command, the rest of
+            the service keeps streaming.
+
+            NAME: service
+            DESC: The service to remove the symbols from, for example `QUOTE` or `OPTION`.
+            TYPE: String
+
+            NAME: symbols
+            DESC: The symbols to remove.
+            TYPE: List<String>
+        '''
+
+        # Build the request
+        request = self._new_request_template()
+        request['service'] = service
+        request['command'] = 'UNSUBS'
+        request['parameters']['keys'] = ','.join(symbols)
+        del request['parameters']['fields']
+
+        await self._send_dynamic_request(request=request)
+
+    async def _send_dynamic_request(self, request=None):
+        '''
+            Sends a request on the open connection, or queues it with the other
+            requests if the stream hasn't started yet.
+
+            NAME: request
+            DESC: The request built from `_new_request_template`.
+            TYPE: Dictionary
+        '''
+
+        if self.connection is None:
+            self.data_requests['requests'].append(request)
+        else:
+            await self._send_message(json.dumps({'requests': [request]}))
+
     def quality_of_service(self, qos_level=None):
         '''
             Allows the user to set the speed at which they recieve messages
@@ -931,6 +1544,23 @@ class TDStreamerClient():
             raise ValueError(
                 "The PERIOD you have chosen is not correct please choose a valid option:['d5', 'w4', 'n10', 'y1', 'y10']")
 
+        request = self._chart_history_futures_request(
+            symbol=symbol,
+            frequency=frequency,
+            period=period,
+            start_time=start_time,
+            end_time=end_time
+        )
+
+        self.data_requests['requests'].append(request)
+
+    def _chart_history_futures_request(self, symbol=None, frequency=None, period=None, start_time=None, end_time=None):
+        '''
+            Builds a CHART_HISTORY_FUTURES request, see `chart_history_futures` for the arguments.
+
+            RTYPE: Dictionary
+        '''
+
         # Build the request
         request = self._new_request_template()
         request['service'] = 'CHART_HISTORY_FUTURES'
@@ -951,7 +1581,72 @@ class TDStreamerClient():
 
         request['requestid'] = str(request['requestid'])
 
-        self.data_requests['requests'].append(request)
+        return request
+
+    async def chart_history_futures_range(self, symbol=None, frequency=None, start_time=None, end_time=None, max_span=None):
+        '''
+            Requests the futures chart history of a long time range, split into as many
+            CHART_HISTORY_FUTURES requests as needed. The pieces are collected and stitched
+            by `chart_history` as they arrive, use `chart_history.is_complete(symbol)` and
+            `chart_history.candles(symbol)` to get the candles in the same columnar shape
+            as `CandleColumns.from_price_history`. On a running stream every piece is sent
+            in order before this returns, otherwise they're queued for `stream`.
+
+            NAME: symbol
+            DESC: A single futures symbol that you wish to get chart data for.
+            TYPE: String
+
+            NAME: frequency
+            DESC: The frequency at which you want the data to appear. Can be one of the following options:
+                  [m1, m5, m10, m30, h1, d1, w1, n1] where [m=minute, h=hour, d=day, w=week, n=month]
+            TYPE: String
+
+            NAME: start_time
+            DESC: Start time of chart in milliseconds since Epoch.
+            TYPE: Integer
+
+            NAME: end_time
+            DESC: End time of chart in milliseconds since Epoch.
+            TYPE: Integer
+
+            NAME: max_span
+            DESC: The longest range of a single request in milliseconds. OPTIONAL, defaults to
+                  `CHART_HISTORY_SPANS` for the frequency.
+            TYPE: Integer
+
+            RTYPE: List<String>, the request ids.
+        '''
+
+        if frequency not in CHART_HISTORY_SPANS:
+            raise ValueError(
+                "The FREQUENCY you have chosen is not correct please choose a valid option:['m1', 'm5', 'm10', 'm30', 'h1', 'd1', 'w1', 'n1']")
+
+        if max_span is None:
+            max_span = CHART_HISTORY_SPANS[frequency] * MILLISECONDS_PER_DAY
+
+        if self.chart_history is None:
+            self.chart_history = ChartHistoryAssembler()
+            self._message_processors.append(self.chart_history.process_message)
+
+        requests = [
+            self._chart_history_futures_request(
+                symbol=[symbol],
+                frequency=frequency,
+                start_time=str(range_start),
+                end_time=str(range_end)
+            )
+            for range_start, range_end in split_range(start_time=int(start_time), end_time=int(end_time), max_span=max_span)
+        ]
+
+        request_ids = [request['requestid'] for request in requests]
+
+        # expect the pieces before any is sent, so none of the responses is missed.
+        self.chart_history.expect(symbol=symbol, request_ids=request_ids)
+
+        for request in requests:
+            await self._send_dynamic_request(request=request)
+
+        return request_ids
 
     def level_one_quotes(self, symbols=None, fields=None):
         '''
@@ -0,0 +1,199 @@
+import asyncio
+import itertools
+from types import MappingProxyType
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Tuple
+from td.stream import TDStreamerClient
+
+
+class StreamHub():
+
+    """
+        TD Ameritrade Stream Fan-Out Hub.
+
+        Sits on top of a `TDStreamerClient` and routes every decoded stream
+        record to the consumers that asked for it. Consumers subscribe by
+        service and symbol, and can either register a callback or an
+        `asyncio.Queue`. Routing is a single dictionary lookup per record
+        and every record is decoded once and shared read-only between all
+        of its subscribers.
+    """
+
+    def __init__(self, streaming_client: TDStreamerClient) -> None:
+        """Initalizes the hub.
+
+        Arguments:
+        ----
+        streaming_client {TDStreamerClient} -- The streaming client that
+            will feed the hub. Requests should already be added to it.
+        """
+
+        self.streaming_client = streaming_client
+
+        # routes keyed by (service, symbol), by service and for every service.
+        self._symbol_routes: Dict[Tuple[str, str], List[Tuple]] = {}
+        self._service_routes: Dict[str, List[Tuple]] = {}
+        self._global_routes: List[Tuple] = []
+
+        # keeps track of where a subscription lives so it can be removed.
+        self._subscriptions = {}
+        self._subscription_ids = itertools.count(1)
+
+        self.messages_published = 0
+        self.records_published = 0
+
+    def subscribe(self, service: str = None, symbols: List[str] = None, callback: Callable = None,
+                  queue: asyncio.Queue = None) -> int:
+        """Registers a consumer with the hub.
+
+        Keyword Arguments:
+        ----
+        service {str} -- The stream service to listen to, for example `QUOTE`
+            or `OPTION`. If `None`, the consumer receives every service. (default: {None})
+
+        symbols {List[str]} -- The symbols to listen to. If `None`, the consumer
+            receives every symbol of the service. (default: {None})
+
+        callback {Callable} -- A function called as `callback(service, timestamp, content)`
+            for every matching record. (default: {None})
+
+        queue {asyncio.Queue} -- A queue that receives `(service, timestamp, content)`
+            tuples for every matching record. (default: {None})
+
+        Raises:
+        ----
+        ValueError: If neither or both a callback and a queue are given, or if
+            symbols are given without a service.
+
+        Returns:
+        ----
+        int -- The subscription id, used to unsubscribe.
+        """
+
+        if (callback is None) == (queue is None):
+            raise ValueError('Provide either a callback or a queue, but not both.')
+
+        if symbols is not None and service is None:
+            raise ValueError('A service is required when subscribing to symbols.')
+
+        # a queue is delivered to without blocking the dispatch loop.
+        if callback is not None:
+            target = callback
+        else:
+            def target(service_name, service_timestamp, record, put=queue.put_nowait):
+                put((service_name, service_timestamp, record))
+
+        subscription_id = next(self._subscription_ids)
+        subscriber = (subscription_id, target)
+
+        # Grab the route lists this subscriber belongs in.
+        if service is None:
+            routes = [self._global_routes]
+        elif symbols is None:
+            routes = [self._service_routes.setdefault(service, [])]
+        else:
+            routes = [self._symbol_routes.setdefault((service, symbol), []) for symbol in symbols]
+
+        for route in routes:
+            route.append(subscriber)
+
+        self._subscriptions[subscription_id] = (subscriber, routes)
+
+        return subscription_id
+
+    def unsubscribe(self, subscription_id: int) -> None:
+        """Removes a consumer from the hub.
+
+        Arguments:
+        ----
+        subscription_id {int} -- The id returned by `subscribe`.
+
+        Raises:
+        ----
+        KeyError: If the subscription id does not exist.
+        """
+
+        if subscription_id not in self._subscriptions:
+            raise KeyError('The subscription id you provided does not exist.')
+
+        subscriber, routes = self._subscriptions.pop(subscription_id)
+
+        for route in routes:
+            route.remove(subscriber)
+
+        # Drop empty routes so lookups stay small.
+        self._symbol_routes = {key: route for key, route in self._symbol_routes.items() if route}
+        self._service_routes = {key: route for key, route in self._service_routes.items() if route}
+
+    def publish(self, message: dict) -> None:
+        """Routes a decoded stream message to its subscribers.
+
+        Only `data` and `snapshot` sections carry records, everything else
+        (login responses, heartbeats) is ignored.
+
+        Arguments:
+        ----
+        message {dict} -- A message as returned by `TDStreamerClient.start_pipeline`.
+        """
+
+        if 'data' in message:
+            service_results = message['data']
+        elif 'snapshot' in message:
+            service_results = message['snapshot']
+        else:
+            return None
+
+        self.messages_published += 1
+
+        symbol_routes = self._symbol_routes
+        service_routes = self._service_routes
+        global_routes = self._global_routes
+
+        for service_result in service_results:
+
+            service_name = service_result['service']
+            service_timestamp = service_result['timestamp']
+            service_subscribers = service_routes.get(service_name, ())
+
+            for content in service_result['content']:
+
+                symbol_subscribers = symbol_routes.get((service_name, content.get('key')), ())
+
+                if not (symbol_subscribers or service_subscribers or global_routes):
+                    continue
+
+                # every subscriber gets the same read-only view of the record.
+                if isinstance(content, dict):
+                    record = MappingProxyType(content)
+                else:
+                    record = content
+
+                self.records_published += 1
+
+                for _, target in symbol_subscribers:
+                    target(service_name, service_timestamp, record)
+
+                for _, target in service_subscribers:
+                    target(service_name, service_timestamp, record)
+
+                for _, target in global_routes:
+                    target(service_name, service_timestamp, record)
+
+    async def run(self) -> None:
+        """Builds the pipeline, if needed, and dispatches messages until the connection closes."""
+
+        if self.streaming_client.connection is None:
+            await self.streaming_client.build_pipeline()
+
+        while True:
+
+            # Grab the next message.
+            message = await self.streaming_client.start_pipeline()
+
+            # start_pipeline returns nothing once the connection is closed.
+            if message is None:
+                break
+
+            self.publish(message=message)
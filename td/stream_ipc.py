@@ -0,0 +1,265 @@
+import os
+import stat
+import json
+import struct
+import asyncio
+from typing import List
+from typing import Tuple
+from td.stream_hub import StreamHub
+from td.records import StreamRecord
+
+# every frame is a 4 byte, big-endian length followed by a JSON payload.
+FRAME_HEADER = struct.Struct('>I')
+
+
+def _encode_frame(payload) -> bytes:
+    """Encodes a JSON serializable object into a length prefixed frame.
+
+    Arguments:
+    ----
+    payload {object} -- The object to encode.
+
+    Returns:
+    ----
+    bytes -- The frame.
+    """
+
+    body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return FRAME_HEADER.pack(len(body)) + body
+
+
+async def _read_frame(reader: asyncio.StreamReader):
+    """Reads a single frame from a stream.
+
+    Arguments:
+    ----
+    reader {asyncio.StreamReader} -- The stream to read from.
+
+    Returns:
+    ----
+    object -- The decoded payload, or `None` if the stream was closed.
+    """
+
+    try:
+        header = await reader.readexactly(FRAME_HEADER.size)
+        body = await reader.readexactly(FRAME_HEADER.unpack(header)[0])
+    except asyncio.IncompleteReadError:
+        return None
+
+    return json.loads(body)
+
+
+class _PublisherClient():
+
+    """Holds the connection and topic filter of a single local subscriber."""
+
+    __slots__ = ('writer', 'services', 'symbols', 'receive_all', 'dropped')
+
+    def __init__(self, writer: asyncio.StreamWriter, topics: list) -> None:
+
+        self.writer = writer
+        self.dropped = 0
+
+        # an empty topic list means the subscriber wants everything.
+        self.receive_all = not topics
+        self.services = {service for service, symbol in topics if symbol is None}
+        self.symbols = {(service, symbol) for service, symbol in topics if symbol is not None}
+
+    def wants(self, service_name: str, symbol: str) -> bool:
+        return self.receive_all or service_name in self.services or (service_name, symbol) in self.symbols
+
+
+class StreamPublisher():
+
+    """
+        Re-broadcasts decoded stream records to other local processes.
+
+        The publisher listens on a Unix domain socket and registers itself
+        with a `StreamHub`, so a single TD Ameritrade connection can feed any
+        number of local `StreamSubscriber` processes. Each record is encoded
+        at most once, no matter how many subscribers receive it.
+    """
+
+    def __init__(self, hub: StreamHub, path: str, max_buffer_size: int = 4 * 1024 * 1024) -> None:
+        """Initalizes the publisher.
+
+        Arguments:
+        ----
+        hub {StreamHub} -- The hub that provides the decoded records.
+
+        path {str} -- The file path of the Unix domain socket.
+
+        Keyword Arguments:
+        ----
+        max_buffer_size {int} -- The number of bytes that can be waiting to be sent
+            to a single subscriber, once exceeded new records for that subscriber are
+            dropped instead of slowing down the feed. (default: {4 * 1024 * 1024})
+        """
+
+        self.hub = hub
+        self.path = path
+        self.max_buffer_size = max_buffer_size
+        self.clients: List[_PublisherClient] = []
+        self.records_sent = 0
+
+        self._server: asyncio.AbstractServer = None
+        self._subscription_id = None
+
+    async def start(self) -> None:
+        """Starts listening for subscribers and attaches the publisher to the hub."""
+
+        # A socket file left behind by a previous run would block the bind.
+        if os.path.exists(self.path) and stat.S_ISSOCK(os.stat(self.path).st_mode):
+            os.unlink(self.path)
+
+        self._server = await asyncio.start_unix_server(self._handle_client, path=self.path)
+        self._subscription_id = self.hub.subscribe(callback=self._publish_record)
+
+    async def close(self) -> None:
+        """Detaches from the hub, disconnects every subscriber and removes the socket."""
+
+        if self._subscription_id is not None:
+            self.hub.unsubscribe(self._subscription_id)
+            self._subscription_id = None
+
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+        for client in self.clients:
+            client.writer.close()
+
+        self.clients = []
+
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Registers a new subscriber and keeps it until it disconnects.
+
+        The first frame a subscriber sends is its topic list, a list of
+        `[service, symbol]` pairs where the symbol can be `null`.
+        """
+
+        topics = await _read_frame(reader)
+
+        if topics is None:
+            writer.close()
+            return None
+
+        client = _PublisherClient(writer=writer, topics=[tuple(topic) for topic in topics])
+        self.clients.append(client)
+
+        # Subscribers never send anything else, so wait for them to hang up.
+        try:
+            await reader.read()
+        finally:
+            if client in self.clients:
+                self.clients.remove(client)
+            writer.close()
+
+    def _publish_record(self, service_name: str, service_timestamp: int, content: dict) -> None:
+        """Hub callback, sends a record to every interested subscriber."""
+
+        frame = None
+        symbol = content.get('key')
+
+        for client in self.clients:
+
+            if not client.wants(service_name, symbol):
+                continue
+
+            # Don't let a slow subscriber back up the whole feed.
+            if client.writer.transport.get_write_buffer_size() > self.max_buffer_size:
+                client.dropped += 1
+                continue
+
+            if frame is None:
+
+                # typed records go over the wire in their raw form.
+                if isinstance(content, StreamRecord):
+                    content = content.to_content()
+                else:
+                    content = dict(content)
+
+                frame = _encode_frame([service_name, service_timestamp, content])
+
+            client.writer.write(frame)
+            self.records_sent += 1
+
+
+class StreamSubscriber():
+
+    """
+        Receives the records re-broadcast by a `StreamPublisher`.
+
+        Usage:
+        ----
+            subscriber = StreamSubscriber(path='/tmp/td_stream.sock', topics=[('QUOTE', 'AAPL')])
+            await subscriber.connect()
+
+            async for service, timestamp, content in subscriber:
+                print(service, timestamp, content)
+    """
+
+    def __init__(self, path: str, topics: List[Tuple[str, str]] = None) -> None:
+        """Initalizes the subscriber.
+
+        Arguments:
+        ----
+        path {str} -- The file path of the publisher's Unix domain socket.
+
+        Keyword Arguments:
+        ----
+        topics {List[Tuple[str, str]]} -- The `(service, symbol)` pairs to receive, use
+            `None` as the symbol to receive every symbol of a service. If no topics
+            are given, every record is received. (default: {None})
+        """
+
+        self.path = path
+        self.topics = topics or []
+        self._reader: asyncio.StreamReader = None
+        self._writer: asyncio.StreamWriter = None
+
+    async def connect(self) -> None:
+        """Connects to the publisher and sends the topic list."""
+
+        self._reader, self._writer = await asyncio.open_unix_connection(path=self.path)
+        self._writer.write(_encode_frame([list(topic) for topic in self.topics]))
+        await self._writer.drain()
+
+    async def receive(self) -> tuple:
+        """Receives the next record.
+
+        Returns:
+        ----
+        tuple -- A `(service, timestamp, content)` tuple, or `None` once the
+            publisher has closed the connection.
+        """
+
+        record = await _read_frame(self._reader)
+
+        if record is None:
+            return None
+
+        return tuple(record)
+
+    async def close(self) -> None:
+        """Closes the connection to the publisher."""
+
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> tuple:
+
+        record = await self.receive()
+
+        if record is None:
+            raise StopAsyncIteration
+
+        return record
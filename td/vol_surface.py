@@ -0,0 +1,380 @@
+import bisect
+import math
+from array import array
+from typing import Dict
+from typing import List
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+from td.greeks import DAYS_PER_YEAR
+from td.greeks import NAN
+from td.greeks import chain_implied_volatility
+from td.greeks import implied_volatility
+from td.option_chain import OptionChainColumns
+from td.records import StreamRecord
+from td.records import decode_record
+
+# strike / spot, from 70% to 130% in 5% steps.
+DEFAULT_MONEYNESS_GRID = tuple(round(0.70 + 0.05 * step, 2) for step in range(13))
+
+
+class _ExpirySlice():
+
+    """The quotes and fitted grid of a single expiration date."""
+
+    __slots__ = ('days', 'points', 'grid', 'dirty')
+
+    def __init__(self, days: int) -> None:
+
+        self.days = days
+
+        # (strike, is_call) -> (moneyness, implied volatility).
+        self.points: Dict[Tuple[float, bool], Tuple[float, float]] = {}
+        self.grid: array = None
+        self.dirty = True
+
+
+class VolatilitySurface():
+
+    """
+        Implied volatility surfaces, one per underlying, on an expiry by moneyness grid.
+
+        Surfaces are fed with option chain snapshots and with streamed option
+        quotes. Every quote only marks its own expiration date as touched, and
+        only touched expirations are re-fitted the next time the surface is read,
+        so a tick on one contract costs a single slice, not the whole surface.
+
+        Each slice is fitted by taking the out-of-the-money volatility at every
+        strike and interpolating it linearly onto the moneyness grid. Lookups
+        interpolate linearly in moneyness and in total variance across time.
+    """
+
+    def __init__(self, moneyness_grid: Sequence[float] = DEFAULT_MONEYNESS_GRID, rate: float = None,
+                 dividend_yield: float = 0.0, model: str = 'black_scholes') -> None:
+        """Initalizes an empty set of surfaces.
+
+        Keyword Arguments:
+        ----
+        moneyness_grid {Sequence[float]} -- The strike / spot points of the grid,
+            in increasing order. (default: {DEFAULT_MONEYNESS_GRID})
+
+        rate {float} -- The risk free rate, as a decimal. If `None`, the rate of
+            every chain is used. (default: {None})
+
+        dividend_yield {float} -- The continuous dividend yield, as a decimal. (default: {0.0})
+
+        model {str} -- Either `black_scholes` or `black76`. (default: {'black_scholes'})
+        """
+
+        self.moneyness_grid = tuple(moneyness_grid)
+        self.rate = rate
+        self.dividend_yield = dividend_yield
+        self.model = model
+
+        # underlying -> expiry -> slice, and the latest underlying prices and rates.
+        self.slices: Dict[str, Dict[str, _ExpirySlice]] = {}
+        self.underlying_prices: Dict[str, float] = {}
+        self.rates: Dict[str, float] = {}
+
+        # what we know about every contract, to place streamed quotes on the surface.
+        self.contracts: Dict[str, Tuple[str, str, float, bool]] = {}
+
+        self.refit_count = 0
+
+    def update_chain(self, chain: OptionChainColumns, volatility: Sequence[float] = None) -> None:
+        """Loads a chain snapshot, touching every expiration date in it.
+
+        Arguments:
+        ----
+        chain {OptionChainColumns} -- The chain, from `get_options_chain(columnar=True)`.
+
+        Keyword Arguments:
+        ----
+        volatility {Sequence[float]} -- The implied volatility of every row, as decimals.
+            If `None`, it's solved from the mark. (default: {None})
+        """
+
+        underlying = chain.underlying
+        spot = chain.underlying_price
+
+        if volatility is None:
+            volatility = chain_implied_volatility(
+                chain=chain, rate=self.rate, dividend_yield=self.dividend_yield, model=self.model
+            )
+
+        self.underlying_prices[underlying] = spot
+
+        if self.rate is not None:
+            self.rates[underlying] = self.rate
+        elif chain.interest_rate == chain.interest_rate:
+            self.rates[underlying] = chain.interest_rate / 100.0
+
+        slices = self.slices.setdefault(underlying, {})
+        contracts = self.contracts
+
+        for symbol, expiry, days, strike, is_call, implied in zip(chain.symbol, chain.expiry, chain.days_to_expiration,
+                                                                 chain.strike, chain.is_call, volatility):
+
+            is_call = bool(is_call)
+            contracts[symbol] = (underlying, expiry, strike, is_call)
+
+            expiry_slice = slices.get(expiry)
+
+            if expiry_slice is None:
+                expiry_slice = slices[expiry] = _ExpirySlice(days=days)
+
+            expiry_slice.days = days
+            expiry_slice.dirty = True
+
+            if implied == implied:
+                expiry_slice.points[(strike, is_call)] = (strike / spot, implied)
+            else:
+                expiry_slice.points.pop((strike, is_call), None)
+
+    def update_quotes(self, records: Sequence[Union[StreamRecord, dict]]) -> int:
+        """Applies streamed `LEVELONE_OPTION` quotes, touching only their expiration dates.
+
+        Quotes for contracts that were not part of a loaded chain are ignored, as
+        are quotes without a mark or a bid and ask.
+
+        Arguments:
+        ----
+        records {Sequence[Union[StreamRecord, dict]]} -- Typed records or raw content.
+
+        Returns:
+        ----
+        int -- The number of quotes applied.
+        """
+
+        quotes = []
+
+        for record in records:
+
+            if not isinstance(record, StreamRecord):
+                record = decode_record('OPTION', record)
+
+            contract = self.contracts.get(record.symbol)
+
+            if contract is None:
+                continue
+
+            # update the underlying as we go, option quotes carry its price.
+            underlying = contract[0]
+
+            if record.underlying_price:
+                self.underlying_prices[underlying] = float(record.underlying_price)
+
+            if record.mark is not None:
+                price = float(record.mark)
+            elif record.bid_price is not None and record.ask_price is not None:
+                price = (float(record.bid_price) + float(record.ask_price)) / 2.0
+            else:
+                continue
+
+            quotes.append((contract, price))
+
+        if not quotes:
+            return 0
+
+        spots = array('d', (self.underlying_prices.get(contract[0], NAN) for contract, _ in quotes))
+        days = array('d', (self.slices[contract[0]][contract[1]].days for contract, _ in quotes))
+
+        volatilities = implied_volatility(
+            prices=[price for _, price in quotes],
+            is_call=[contract[3] for contract, _ in quotes],
+            underlying=spots,
+            strike=[contract[2] for contract, _ in quotes],
+            time_to_expiry=array('d', (day / DAYS_PER_YEAR for day in days)),
+            rate=[self.rates.get(contract[0], 0.0) for contract, _ in quotes],
+            dividend_yield=self.dividend_yield,
+            model=self.model
+        )
+
+        for ((underlying, expiry, strike, is_call), _), spot, implied in zip(quotes, spots, volatilities):
+
+            expiry_slice = self.slices[underlying][expiry]
+            expiry_slice.dirty = True
+
+            if implied == implied:
+                expiry_slice.points[(strike, is_call)] = (strike / spot, implied)
+            else:
+                expiry_slice.points.pop((strike, is_call), None)
+
+        return len(quotes)
+
+    def _fit_slice(self, expiry_slice: _ExpirySlice) -> None:
+        """Fits a single expiration date onto the moneyness grid."""
+
+        # one volatility per strike, the out-of-the-money side if we have it.
+        by_strike = {}
+
+        for (strike, is_call), (moneyness, implied) in expiry_slice.points.items():
+
+            out_of_the_money = is_call == (moneyness >= 1.0)
+            current = by_strike.get(strike)
+
+            if current is None or (out_of_the_money and not current[2]):
+                by_strike[strike] = (moneyness, implied, out_of_the_money)
+
+        curve = sorted((moneyness, implied) for moneyness, implied, _ in by_strike.values())
+
+        if not curve:
+            expiry_slice.grid = None
+            expiry_slice.dirty = False
+            return None
+
+        moneyness_points = [moneyness for moneyness, _ in curve]
+        grid = array('d')
+
+        for moneyness in self.moneyness_grid:
+
+            position = bisect.bisect_left(moneyness_points, moneyness)
+
+            # flat outside of the quoted strikes.
+            if position == 0:
+                grid.append(curve[0][1])
+            elif position == len(curve):
+                grid.append(curve[-1][1])
+            else:
+                (left_moneyness, left_volatility), (right_moneyness, right_volatility) = curve[position - 1], curve[position]
+                weight = (moneyness - left_moneyness) / (right_moneyness - left_moneyness)
+                grid.append(left_volatility + weight * (right_volatility - left_volatility))
+
+        expiry_slice.grid = grid
+        expiry_slice.dirty = False
+        self.refit_count += 1
+
+    def refit(self, underlying: str = None) -> int:
+        """Re-fits the expiration dates that were touched since the last fit.
+
+        Keyword Arguments:
+        ----
+        underlying {str} -- Only re-fit this underlying, if `None` every underlying
+            is re-fitted. (default: {None})
+
+        Returns:
+        ----
+        int -- The number of expiration dates that were re-fitted.
+        """
+
+        underlyings = self.slices.keys() if underlying is None else [underlying]
+        refitted = 0
+
+        for name in underlyings:
+            for expiry_slice in self.slices.get(name, {}).values():
+                if expiry_slice.dirty:
+                    self._fit_slice(expiry_slice=expiry_slice)
+                    refitted += 1
+
+        return refitted
+
+    def _fitted_slices(self, underlying: str) -> List[_ExpirySlice]:
+        """Returns the fitted slices of an underlying sorted by days to expiration."""
+
+        if underlying not in self.slices:
+            raise KeyError('The underlying you provided does not have a surface.')
+
+        self.refit(underlying=underlying)
+
+        return sorted(
+            (expiry_slice for expiry_slice in self.slices[underlying].values() if expiry_slice.grid is not None),
+            key=lambda expiry_slice: expiry_slice.days
+        )
+
+    def _slice_volatility(self, expiry_slice: _ExpirySlice, moneyness: float) -> float:
+        """Interpolates a fitted slice at a moneyness."""
+
+        grid_points = self.moneyness_grid
+        position = bisect.bisect_left(grid_points, moneyness)
+
+        if position == 0:
+            return expiry_slice.grid[0]
+        elif position == len(grid_points):
+            return expiry_slice.grid[-1]
+
+        weight = (moneyness - grid_points[position - 1]) / (grid_points[position] - grid_points[position - 1])
+        return expiry_slice.grid[position - 1] + weight * (expiry_slice.grid[position] - expiry_slice.grid[position - 1])
+
+    def volatility(self, underlying: str, days: float, moneyness: float = None, strike: float = None) -> float:
+        """Looks up the implied volatility at any point of a surface.
+
+        Arguments:
+        ----
+        underlying {str} -- The underlying symbol.
+
+        days {float} -- The days to expiration.
+
+        Keyword Arguments:
+        ----
+        moneyness {float} -- The strike / spot ratio. (default: {None})
+
+        strike {float} -- The strike, converted with the latest underlying price,
+            used if no moneyness is given. (default: {None})
+
+        Raises:
+        ----
+        KeyError: If the underlying has no surface.
+
+        ValueError: If neither a moneyness nor a strike is given.
+
+        Returns:
+        ----
+        float -- The implied volatility, as a decimal, NaN if the surface is empty.
+        """
+
+        if moneyness is None:
+
+            if strike is None:
+                raise ValueError('Either a moneyness or a strike is required.')
+
+            moneyness = strike / self.underlying_prices[underlying]
+
+        fitted = self._fitted_slices(underlying=underlying)
+
+        if not fitted:
+            return NAN
+
+        expiry_days = [expiry_slice.days for expiry_slice in fitted]
+        position = bisect.bisect_left(expiry_days, days)
+
+        if position == 0:
+            return self._slice_volatility(expiry_slice=fitted[0], moneyness=moneyness)
+        elif position == len(fitted):
+            return self._slice_volatility(expiry_slice=fitted[-1], moneyness=moneyness)
+
+        near, far = fitted[position - 1], fitted[position]
+        near_volatility = self._slice_volatility(expiry_slice=near, moneyness=moneyness)
+        far_volatility = self._slice_volatility(expiry_slice=far, moneyness=moneyness)
+
+        # interpolate the total variance, so the term structure stays arbitrage free.
+        near_time = max(near.days, 0) / DAYS_PER_YEAR
+        far_time = max(far.days, 0) / DAYS_PER_YEAR
+        time = days / DAYS_PER_YEAR
+        weight = (days - near.days) / (far.days - near.days)
+        variance = near_volatility ** 2 * near_time + weight * (far_volatility ** 2 * far_time - near_volatility ** 2 * near_time)
+
+        if time <= 0 or variance <= 0:
+            return near_volatility
+
+        return math.sqrt(variance / time)
+
+    def grid(self, underlying: str) -> dict:
+        """Returns the fitted grid of an underlying.
+
+        Arguments:
+        ----
+        underlying {str} -- The underlying symbol.
+
+        Returns:
+        ----
+        dict -- The `moneyness` points, the `days` of every fitted expiration date and
+            the `volatility` rows, one per expiration date.
+        """
+
+        fitted = self._fitted_slices(underlying=underlying)
+
+        return {
+            'moneyness': self.moneyness_grid,
+            'days': [expiry_slice.days for expiry_slice in fitted],
+            'volatility': [list(expiry_slice.grid) for expiry_slice in fitted]
+        }
@@ -0,0 +1,74 @@
+from td.account_activity import OrderFill
+from td.account_activity import parse_activity
+from td.account_activity import parse_activity_message
+
+ORDER = (
+    '<Order><OrderKey>1001</OrderKey><Security><CUSIP>037833100</CUSIP><Symbol>AAPL</Symbol>'
+    '<SecurityType>Common Stock</SecurityType></Security><OrderPricing><Limit>320.5</Limit></OrderPricing>'
+    '<OrderType>Limit</OrderType><OrderDuration>Day</OrderDuration>'
+    '<OrderInstructions>Buy</OrderInstructions><OriginalQuantity>100</OriginalQuantity></Order>'
+)
+
+FILL = (
+    '<ContraInformation><Contra><Quantity>500</Quantity></Contra></ContraInformation>'
+    '<ExecutionInformation><Type>Bought</Type><Quantity>40</Quantity><ExecutionPrice>320.25</ExecutionPrice>'
+    '<LeavesQuantity>60</LeavesQuantity><ID>1001-1</ID><Exchange>Q</Exchange></ExecutionInformation>'
+    '<TradeDate>2020-06-01</TradeDate>'
+)
+
+
+def message(message_type: str, body: str = '') -> str:
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><{0}Message xmlns="urn:xmlns:beb.ameritrade.com">'
+        '<ActivityTimestamp>2020-06-01T10:00:01.000-05:00</ActivityTimestamp>{1}{2}</{0}Message>'
+    ).format(message_type, ORDER, body)
+
+
+def test_an_order_entry_is_read_into_its_record():
+
+    record = parse_activity(message_type='OrderEntryRequest', message_data=message('OrderEntryRequest'), account='123')
+
+    assert record.to_dict() == {
+        'message_type': 'OrderEntryRequest', 'account': '123', 'activity_timestamp': '2020-06-01T10:00:01.000-05:00',
+        'order_id': 1001, 'symbol': 'AAPL', 'cusip': '037833100', 'security_type': 'Common Stock',
+        'instruction': 'BUY', 'order_type': 'LIMIT', 'duration': 'DAY', 'quantity': 100.0, 'limit_price': 320.5
+    }
+
+
+def test_a_fill_reads_the_execution_block_not_the_contra():
+
+    record = parse_activity(message_type='OrderPartialFill', message_data=message('OrderPartialFill', FILL))
+
+    assert isinstance(record, OrderFill)
+    assert record.execution_quantity == 40.0
+    assert record.execution_price == 320.25
+    assert record.leaves_quantity == 60.0
+    assert record.execution_id == '1001-1'
+    assert record.execution_type == 'BOUGHT'
+    assert record.trade_date == '2020-06-01'
+
+
+def test_escaped_text_is_unescaped():
+
+    body = message('OrderRejection', '<RejectReason>Price &gt; limit &amp; band</RejectReason>')
+    record = parse_activity(message_type='OrderRejection', message_data=body)
+
+    assert record.reject_reason == 'Price > limit & band'
+
+
+def test_status_messages_and_other_services_are_skipped():
+
+    stream_message = {'data': [
+        {'service': 'QUOTE', 'content': [{'key': 'AAPL'}]},
+        {'service': 'ACCT_ACTIVITY', 'content': [
+            {'0': 'SubscriptionKey', '2': 'SUBSCRIBED', '3': ''},
+            {'0': 'SubscriptionKey', '1': '123', '2': 'OrderRoute', '3': message('OrderRoute')},
+            {'0': 'SubscriptionKey', '1': '123', '2': 'SomethingNew', '3': message('SomethingNew')}
+        ]}
+    ]}
+
+    records = parse_activity_message(message=stream_message)
+
+    assert [type(record).__name__ for record in records] == ['OrderRoute', 'AccountActivity']
+    assert records[1].message_type == 'SomethingNew'
+    assert records[0].subscription_key == 'SubscriptionKey'
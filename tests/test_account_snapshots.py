@@ -0,0 +1,22 @@
+from td.client import TDClient
+
+
+def test_a_failing_account_does_not_abort_the_others(monkeypatch):
+
+    client = TDClient(client_id='CLIENT_ID', redirect_uri='https://localhost')
+
+    def get_accounts(account: str, fields: list) -> dict:
+
+        if account == 'BROKEN':
+            raise ValueError('not json')
+
+        return {'securitiesAccount': {'accountId': account, 'type': 'MARGIN', 'currentBalances': {}}}
+
+    monkeypatch.setattr(client, 'get_accounts', get_accounts)
+    monkeypatch.setattr(client, '_token_validation', lambda nseconds: None)
+
+    snapshots = client.get_account_snapshots(accounts=['GOOD', 'BROKEN'], max_workers=2)
+
+    assert snapshots.snapshots['GOOD'].ok
+    assert not snapshots.snapshots['BROKEN'].ok
+    assert isinstance(snapshots.snapshots['BROKEN'].error, ValueError)
@@ -0,0 +1,40 @@
+from td.actives import ActivesTracker
+from td.actives import parse_actives
+
+
+def actives(*ranked, message_id: str = '1') -> dict:
+
+    entries = ':'.join('{}:{}:{}'.format(symbol, volume, percent) for symbol, volume, percent in ranked)
+    payload = '{};0;11: 40: 00;11:40;1;0:{}:1000:{}'.format(message_id, len(ranked), entries)
+
+    return {'key': 'NASDAQ-60', '1': payload}
+
+
+def test_a_message_is_parsed_into_ranked_columns():
+
+    table = parse_actives('ACTIVES_NASDAQ', actives(('AAPL', 500, 50.0), ('MSFT', 300, 30.0)))
+    group = table.groups['0']
+
+    assert (table.venue, table.duration, table.timestamp) == ('NASDAQ', '0', '11:40:00')
+    assert (group.count, group.total_volume) == (2, 1000)
+    assert group.rows() == [(1, 'AAPL', 500, 50.0), (2, 'MSFT', 300, 30.0)]
+
+
+def test_rank_changes_are_reported():
+
+    changes_seen = []
+    tracker = ActivesTracker(callbacks=[lambda table, changes: changes_seen.append(changes)])
+
+    first = tracker.update('ACTIVES_NASDAQ', actives(('AAPL', 500, 50.0), ('MSFT', 300, 30.0), ('GME', 200, 20.0)))
+    same = tracker.update('ACTIVES_NASDAQ', actives(('AAPL', 600, 50.0), ('MSFT', 300, 30.0), ('GME', 200, 20.0)))
+    moved = tracker.update('ACTIVES_NASDAQ', actives(('MSFT', 700, 70.0), ('AAPL', 500, 20.0), ('AMC', 100, 10.0)))
+
+    assert [(change.symbol, change.old_rank, change.new_rank) for change in first] == [
+        ('AAPL', None, 1), ('MSFT', None, 2), ('GME', None, 3)
+    ]
+    assert same == []
+    assert sorted((change.symbol, change.old_rank, change.new_rank) for change in moved) == [
+        ('AAPL', 1, 2), ('AMC', None, 3), ('GME', 3, None), ('MSFT', 2, 1)
+    ]
+    assert len(changes_seen) == 2
+    assert tracker.ranking('NASDAQ', '0').symbols == ['MSFT', 'AAPL', 'AMC']
@@ -0,0 +1,48 @@
+import asyncio
+from td.book_analytics import BookAnalytics
+
+
+def book_message(symbol: str, bid: float, ask: float, bid_size: float = 100.0, ask_size: float = 100.0) -> dict:
+
+    content = {
+        'key': symbol,
+        '1': 1591023601000,
+        '2': [{'0': bid, '1': bid_size, '2': 1, '3': []}],
+        '3': [{'0': ask, '1': ask_size, '2': 1, '3': []}]
+    }
+
+    return {'data': [{'service': 'NASDAQ_BOOK', 'timestamp': 1591023601000, 'command': 'SUBS', 'content': [content]}]}
+
+
+def test_updates_inside_the_interval_are_held_back():
+
+    emitted = []
+    analytics = BookAnalytics(interval=60.0, callbacks=[emitted.append])
+
+    assert len(analytics.process_message(book_message('MSFT', 10.0, 10.2))) == 1
+    assert analytics.process_message(book_message('MSFT', 10.1, 10.2, bid_size=300.0)) == []
+
+    metrics = analytics.metrics[('NASDAQ_BOOK', 'MSFT')]
+
+    assert metrics.imbalance == 0.5
+    assert len(emitted) == 1
+
+
+def test_the_last_change_of_a_quiet_book_is_emitted():
+
+    emitted = []
+    analytics = BookAnalytics(interval=0.05, callbacks=[emitted.extend])
+
+    analytics.process_message(book_message('MSFT', 10.0, 10.2))
+    analytics.process_message(book_message('MSFT', 10.1, 10.2))
+
+    async def wait_for_timer():
+
+        timer = asyncio.ensure_future(analytics.emit_periodically())
+        await asyncio.sleep(0.2)
+        timer.cancel()
+
+    asyncio.get_event_loop().run_until_complete(wait_for_timer())
+
+    assert [metrics.best_bid for metrics in emitted] == [10.0, 10.1]
+    assert analytics.emit_due() == []
@@ -0,0 +1,62 @@
+import copy
+from td.chain_tracker import OptionChainTracker
+
+
+def contract(symbol: str, put_call: str, strike: float, bid: float) -> dict:
+    return {
+        'symbol': symbol, 'putCall': put_call, 'strikePrice': strike, 'bid': bid, 'ask': bid + 0.1,
+        'volatility': 30.0, 'daysToExpiration': 30
+    }
+
+
+def chain(*contracts) -> dict:
+
+    calls = {}
+    puts = {}
+
+    for option in contracts:
+        side = calls if option['putCall'] == 'CALL' else puts
+        side.setdefault('{:.1f}'.format(option['strikePrice']), []).append(option)
+
+    return {
+        'symbol': 'XYZ', 'underlyingPrice': 101.0, 'interestRate': 0.01, 'volatility': 29.0,
+        'callExpDateMap': {'2020-05-15:30': calls}, 'putExpDateMap': {'2020-05-15:30': puts}
+    }
+
+
+CALL = contract('XYZ_051520C100', 'CALL', 100.0, 1.0)
+PUT = contract('XYZ_051520P100', 'PUT', 100.0, 2.0)
+
+
+def test_the_first_poll_adds_every_contract():
+
+    delta = OptionChainTracker().update(chain(CALL, PUT))
+
+    assert delta.underlying == 'XYZ'
+    assert sorted(delta.added) == ['XYZ_051520C100', 'XYZ_051520P100']
+    assert not delta.removed and not delta.changed
+
+
+def test_only_changed_columns_are_reported():
+
+    tracker = OptionChainTracker()
+    tracker.update(chain(CALL, PUT))
+
+    moved = dict(copy.deepcopy(CALL), bid=1.5)
+    delta = tracker.update(chain(moved, PUT))
+
+    assert delta.changed == {'XYZ_051520C100': {'bid': 1.5}}
+    assert not delta.added and not delta.removed
+    assert tracker.snapshot('XYZ')['XYZ_051520C100']['bid'] == 1.5
+
+
+def test_contracts_that_disappear_are_removed_and_a_quiet_poll_is_empty():
+
+    tracker = OptionChainTracker()
+    tracker.update(chain(CALL, PUT))
+
+    assert not tracker.update(chain(CALL, PUT))
+    assert tracker.update(chain(CALL)).removed == ['XYZ_051520P100']
+
+    tracker.clear('XYZ')
+    assert 'XYZ' not in tracker.snapshots
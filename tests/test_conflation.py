@@ -0,0 +1,101 @@
+import asyncio
+import json
+import pytest
+from td.stream import TDStreamerClient
+
+
+class FakeConnection():
+
+    """Hands out a fixed list of messages, then closes."""
+
+    def __init__(self, messages: list) -> None:
+        self.messages = [json.dumps(message) for message in messages]
+
+    async def recv(self) -> str:
+
+        if not self.messages:
+            # block, like an idle websocket.
+            await asyncio.sleep(3600)
+
+        return self.messages.pop(0)
+
+
+def quote(key: str, timestamp: int, **fields) -> dict:
+    content = dict(fields, key=key)
+    return {'data': [{'service': 'QUOTE', 'timestamp': timestamp, 'command': 'SUBS', 'content': [content]}]}
+
+
+@pytest.fixture
+def client() -> TDStreamerClient:
+
+    client = TDStreamerClient(websocket_url='example.com')
+    client.conflation_mode(services=['QUOTE'])
+
+    return client
+
+
+def test_updates_are_merged_per_symbol(client):
+
+    client._conflate_message(quote('MSFT', 1, **{'1': 10.0, '2': 10.5}))
+    client._conflate_message(quote('MSFT', 2, **{'1': 10.1}))
+    client._conflate_message(quote('AAPL', 3, **{'1': 300.0}))
+
+    client._conflation_event = asyncio.Event()
+    message = asyncio.get_event_loop().run_until_complete(client._next_conflated_message())
+
+    service_result = message['data'][0]
+    merged = {content['key']: content for content in service_result['content']}
+
+    assert service_result['timestamp'] == 3
+    assert merged['MSFT'] == {'key': 'MSFT', '1': 10.1, '2': 10.5, 'conflated': 2}
+    assert merged['AAPL']['conflated'] == 1
+    assert client.conflation_stats['QUOTE'] == {'updates': 3, 'conflated': 1}
+
+
+def test_messages_come_out_in_the_order_they_arrived(client):
+
+    response = {'response': [{'service': 'ADMIN', 'command': 'LOGIN'}]}
+    timesale = {'data': [{'service': 'TIMESALE_EQUITY', 'timestamp': 2, 'command': 'SUBS', 'content': [{'key': 'MSFT'}]}]}
+
+    client._conflate_message(response)
+    client._conflate_message(quote('MSFT', 1, **{'1': 10.0}))
+    client._conflate_message(quote('MSFT', 1, **{'1': 10.1}))
+    client._conflate_message(timesale)
+    client._conflate_message(quote('MSFT', 3, **{'1': 10.2}))
+
+    client._conflation_event = asyncio.Event()
+    loop = asyncio.get_event_loop()
+
+    assert loop.run_until_complete(client._next_conflated_message()) == response
+
+    # the quotes before the time and sale are merged, and come out ahead of it.
+    before = loop.run_until_complete(client._next_conflated_message())['data'][0]
+    assert before['content'] == [{'key': 'MSFT', '1': 10.1, 'conflated': 2}]
+
+    assert loop.run_until_complete(client._next_conflated_message()) == timesale
+
+    after = loop.run_until_complete(client._next_conflated_message())['data'][0]
+    assert after['content'] == [{'key': 'MSFT', '1': 10.2, 'conflated': 1}]
+
+
+def test_a_failing_processor_closes_the_buffers(client):
+
+    def failing_processor(message):
+        raise RuntimeError('boom')
+
+    client.connection = FakeConnection([quote('MSFT', 1, **{'1': 10.0})])
+    client._message_processors.append(failing_processor)
+
+    async def consume():
+
+        client._conflation_event = asyncio.Event()
+        reader = asyncio.ensure_future(client._conflation_reader())
+
+        # without the reader closing the buffers, this would wait forever.
+        message = await asyncio.wait_for(client._next_conflated_message(), timeout=1.0)
+        await reader
+
+        return message
+
+    assert asyncio.get_event_loop().run_until_complete(consume()) is None
+    assert client._conflation_closed
@@ -0,0 +1,80 @@
+import json
+import pytest
+from td.client import TDClient
+from td.fast_orders import FastOrderPath
+from td.fast_orders import OrderTemplate
+
+ORDER = {
+    'orderType': 'LIMIT',
+    'session': 'NORMAL',
+    'duration': 'DAY',
+    'orderStrategyType': 'SINGLE',
+    'price': 100.0,
+    'orderLegCollection': [
+        {'instruction': 'SELL', 'quantity': 100, 'instrument': {'symbol': 'MSFT', 'assetType': 'EQUITY'}}
+    ]
+}
+
+
+def test_render_fills_in_the_slots():
+
+    template = OrderTemplate(order=ORDER)
+    body = template.render(price=101.25, quantity=300)
+
+    expected = json.loads(json.dumps(ORDER))
+    expected['price'] = 101.25
+    expected['orderLegCollection'][0]['quantity'] = 300
+
+    assert json.loads(body) == expected
+    assert template.to_dict() == ORDER
+
+
+def test_render_rejects_an_unknown_slot():
+
+    template = OrderTemplate(order=ORDER)
+
+    with pytest.raises(KeyError, match='qty'):
+        template.render(qty=300)
+
+
+@pytest.mark.parametrize('value', [float('nan'), float('inf'), float('-inf')])
+def test_render_rejects_values_without_a_json_literal(value):
+
+    template = OrderTemplate(order=ORDER)
+
+    with pytest.raises(ValueError):
+        template.render(price=value)
+
+
+def test_fill_matches_the_rendered_order_and_leaves_the_template_alone():
+
+    template = OrderTemplate(order=ORDER)
+    filled = template.fill(price=101.25, quantity=300)
+
+    assert filled == template.to_dict(price=101.25, quantity=300)
+    assert template.payload == ORDER
+    assert template.payload['orderLegCollection'][0]['quantity'] == 100
+    assert filled['orderLegCollection'][0]['instrument'] is ORDER['orderLegCollection'][0]['instrument']
+
+
+class RecordingRiskManager():
+
+    def __init__(self) -> None:
+        self.orders = []
+
+    def check(self, account: str, order: dict) -> None:
+        self.orders.append(order)
+
+
+def test_place_checks_and_sends_the_same_order(monkeypatch):
+
+    client = TDClient(client_id='CLIENT_ID', redirect_uri='https://localhost')
+    client.risk_manager = RecordingRiskManager()
+
+    fast_path = FastOrderPath(client=client, account='123')
+    sent = []
+    monkeypatch.setattr(fast_path, '_send', lambda method, url, body: sent.append(body))
+
+    fast_path.place(template=OrderTemplate(order=ORDER), price=101.25)
+
+    assert client.risk_manager.orders == [json.loads(sent[0])]
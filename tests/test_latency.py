@@ -0,0 +1,81 @@
+import asyncio
+import json
+import time
+from td.metrics import LatencyHistogram
+from td.stream import TDStreamerClient
+
+
+def test_percentiles_stay_within_the_precision_of_a_bucket():
+
+    histogram = LatencyHistogram(significant_bits=5)
+
+    for value in range(1, 10001):
+        histogram.record(value)
+
+    assert histogram.total_count == 10000
+    assert (histogram.min_value, histogram.max_value) == (1, 10000)
+    assert histogram.mean() == 5000.5
+
+    for percentile, exact in ((50.0, 5000), (90.0, 9000), (99.0, 9900)):
+        assert abs(histogram.percentile(percentile) - exact) <= exact / 32
+
+    assert histogram.percentile(100.0) == 10000
+
+
+def test_every_value_falls_in_a_bucket_that_bounds_it():
+
+    histogram = LatencyHistogram(significant_bits=3, highest_value=1 << 20)
+
+    for value in (0, 1, 7, 8, 15, 16, 17, 1000, 65535, 1 << 20):
+        index = histogram._index(value)
+        assert histogram._value_at(index) >= value
+        assert index == 0 or histogram._value_at(index - 1) < value
+
+
+def test_values_out_of_range_are_clamped_and_reset_clears():
+
+    histogram = LatencyHistogram(highest_value=1000)
+    histogram.record(-5)
+    histogram.record(5000)
+
+    assert (histogram.min_value, histogram.max_value) == (0, 1000)
+
+    histogram.reset()
+
+    assert histogram.snapshot() == {
+        'count': 0, 'min': 0, 'max': 0, 'mean': 0.0, 'p50': 0, 'p90': 0, 'p99': 0, 'p999': 0
+    }
+
+
+class OneMessageConnection():
+
+    def __init__(self, message: dict) -> None:
+        self.message = json.dumps(message)
+
+    async def recv(self) -> str:
+        return self.message
+
+
+def test_the_receive_time_does_not_include_decoding():
+
+    client = TDStreamerClient(websocket_url='example.com')
+    client.instrumentation()
+    client.connection = OneMessageConnection({'data': [
+        {'service': 'QUOTE', 'timestamp': int(time.time() * 1000), 'command': 'SUBS', 'content': [{'key': 'MSFT'}]}
+    ]})
+
+    parse = client._parse_json_message
+
+    async def slow_parse(message: str) -> dict:
+        await asyncio.sleep(0.2)
+        return await parse(message=message)
+
+    client._parse_json_message = slow_parse
+
+    asyncio.get_event_loop().run_until_complete(client.start_pipeline())
+
+    snapshot = client.latency_snapshot()['QUOTE']
+
+    assert snapshot['decode']['min'] >= 190000
+    assert snapshot['exchange_to_receive']['max'] < 150000
+    assert snapshot['queue_wait']['count'] == 1
@@ -0,0 +1,32 @@
+from td.ledger import TransactionLedger
+
+
+def transaction(transaction_id: int, symbol: str, underlying: str = None) -> dict:
+
+    instrument = {'symbol': symbol}
+
+    if underlying is not None:
+        instrument.update(underlyingSymbol=underlying, assetType='OPTION')
+
+    return {
+        'transactionId': transaction_id,
+        'type': 'TRADE',
+        'transactionDate': '2020-06-01T14:30:00+0000',
+        'netAmount': -100.0,
+        'transactionItem': {'instrument': instrument}
+    }
+
+
+def test_option_fills_are_found_by_their_underlying():
+
+    with TransactionLedger(client=None, path=':memory:') as ledger:
+
+        ledger.add(account='123', transactions=[
+            transaction(1, 'AAPL'),
+            transaction(2, 'AAPL_061920C300', underlying='AAPL'),
+            transaction(3, 'MSFT')
+        ])
+
+        assert [row['transactionId'] for row in ledger.query(symbol='AAPL')] == [1, 2]
+        assert [row['transactionId'] for row in ledger.query(symbol='AAPL_061920C300')] == [2]
+
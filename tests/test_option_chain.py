@@ -0,0 +1,137 @@
+import time
+from td.client import TDClient
+from td.rate_limiter import RateLimiter
+import pytest
+from td.option_chain import OptionChainColumns
+from td.option_chain import OptionChainSpec
+from td.option_chain import _to_int
+
+
+def contract(symbol: str, put_call: str, strike: float, volatility: float) -> dict:
+    return {
+        'symbol': symbol, 'putCall': put_call, 'strikePrice': strike, 'bid': 1.0, 'ask': 1.1,
+        'volatility': volatility, 'daysToExpiration': 30
+    }
+
+
+RESPONSE = {
+    'symbol': 'XYZ',
+    'underlyingPrice': 101.0,
+    'interestRate': 0.01,
+    'volatility': 29.0,
+    'callExpDateMap': {
+        '2020-05-15:30': {
+            '100.0': [
+                contract('XYZ_051520C100', 'CALL', 100.0, 31.5),
+                # an adjusted contract, after a corporate action, at the same strike.
+                contract('XYZ1_051520C100', 'CALL', 100.0, 45.0)
+            ]
+        }
+    },
+    'putExpDateMap': {
+        '2020-05-15:30': {
+            '100.0': [contract('XYZ_051520P100', 'PUT', 100.0, 33.0)]
+        }
+    }
+}
+
+
+def test_chain_volatility_is_not_shadowed_by_the_column():
+
+    chain = OptionChainColumns.from_response(RESPONSE)
+
+    assert chain.underlying_volatility == 29.0
+    assert list(chain.volatility) == [31.5, 45.0, 33.0]
+
+
+def test_contracts_sharing_a_strike_are_all_indexed():
+
+    chain = OptionChainColumns.from_response(RESPONSE)
+    rows = chain.rows(expiry='2020-05-15', strike=100)
+
+    assert sorted(chain.symbol[row] for row in rows) == ['XYZ1_051520C100', 'XYZ_051520C100', 'XYZ_051520P100']
+    assert chain.contract_index[('2020-05-15', 100.0, True)] == [0, 1]
+    assert chain.symbol_index['XYZ1_051520C100'] == 1
+
+
+def test_specs_with_the_same_arguments_are_equal_and_hash_the_same():
+
+    spec = OptionChainSpec(symbol='MSFT', strikeCount=10, range='NTM')
+    same = OptionChainSpec(range='NTM', strikeCount=10, symbol='MSFT', strike=None)
+
+    assert spec == same
+    assert hash(spec) == hash(same)
+    assert {spec: 'cached'}[same] == 'cached'
+    assert spec != OptionChainSpec(symbol='MSFT', strikeCount=20, range='NTM')
+
+
+def test_replace_derives_a_new_spec():
+
+    spec = OptionChainSpec(symbol='MSFT', strikeCount=10, range='NTM')
+    other = spec.replace(symbol='AAPL', range=None)
+
+    assert dict(other._get_query_parameters()) == {'symbol': 'AAPL', 'strikeCount': 10}
+    assert spec.symbol == 'MSFT'
+
+    with pytest.raises(AttributeError):
+        spec.symbol = 'AAPL'
+
+
+def test_invalid_specs_are_rejected():
+
+    with pytest.raises(KeyError):
+        OptionChainSpec(symbol='MSFT', strikes=10)
+
+    with pytest.raises(KeyError):
+        OptionChainSpec(symbol='MSFT', range='FAR')
+
+    with pytest.raises(KeyError):
+        OptionChainSpec(symbol='MSFT', strategy='SINGLE', volatility=30)
+
+
+def test_values_that_are_not_integers_become_zero():
+
+    assert _to_int('12') == 12
+    assert _to_int(None) == 0
+    assert _to_int('NaN') == 0
+    assert _to_int(float('nan')) == 0
+    assert _to_int(float('inf')) == 0
+
+
+def chains_client(monkeypatch, failing: str = None) -> TDClient:
+
+    client = TDClient(client_id='CLIENT_ID', redirect_uri='https://localhost')
+    monkeypatch.setattr(client, '_token_validation', lambda nseconds: None)
+
+    def get_options_chain(option_chain: dict, columnar: bool) -> dict:
+
+        if option_chain['symbol'] == failing:
+            raise ValueError('not json')
+
+        return {'symbol': option_chain['symbol']}
+
+    monkeypatch.setattr(client, 'get_options_chain', get_options_chain)
+
+    return client
+
+
+def test_a_failing_symbol_does_not_end_the_other_chains(monkeypatch):
+
+    client = chains_client(monkeypatch, failing='MSFT')
+
+    chains = dict(client.get_options_chains(option_chains=['AAPL', 'MSFT', 'IBM'], max_workers=3))
+
+    assert chains == {'AAPL': {'symbol': 'AAPL'}, 'MSFT': None, 'IBM': {'symbol': 'IBM'}}
+
+
+def test_every_chain_request_waits_for_the_rate_limiter(monkeypatch):
+
+    client = chains_client(monkeypatch)
+    rate_limiter = RateLimiter(max_calls=2, period=0.2)
+
+    started = time.perf_counter()
+    chains = list(client.get_options_chains(option_chains=['AAPL', 'MSFT', 'IBM', 'SPY'], rate_limiter=rate_limiter))
+
+    # two requests go out at once, the other two wait for the bucket to refill.
+    assert len(chains) == 4
+    assert time.perf_counter() - started >= 0.15
@@ -0,0 +1,33 @@
+import logging
+from td.order_amend import OrderAmendManager
+
+
+class FakeClient():
+
+    """Replaces every order with the next id."""
+
+    def __init__(self) -> None:
+        self.next_id = 100
+
+    def modify_order(self, account: str, order: dict, order_id: str) -> dict:
+
+        self.next_id += 1
+
+        return {'order_id': str(self.next_id), 'status_code': 201}
+
+
+def test_a_failing_callback_is_logged_and_the_others_still_run(caplog):
+
+    events = []
+
+    def failing_callback(chain, event):
+        raise RuntimeError('boom')
+
+    with caplog.at_level(logging.ERROR, logger='td.order_amend'):
+        with OrderAmendManager(client=FakeClient(), account='123', min_interval=0.0,
+                               callbacks=[failing_callback, lambda chain, event: events.append(event)]) as amender:
+            chain = amender.amend(order_id='1', order={'price': 10.0})
+
+    assert events == ['REPLACED']
+    assert chain.history == ['1', '101']
+    assert 'REPLACED of order 1' in caplog.text
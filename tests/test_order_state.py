@@ -0,0 +1,118 @@
+import asyncio
+import time
+from td.account_activity import ACTIVITY_CLASSES
+from td.order_state import OrderStateManager
+
+
+class FakeClient():
+
+    """Answers `get_orders_query` with a fixed list of orders."""
+
+    def __init__(self, orders: list = None) -> None:
+        self.orders = orders or []
+
+    def get_orders_query(self, account: str = None) -> list:
+        return self.orders
+
+
+def activity(message_type: str, order_id: int = 1, **attributes):
+
+    record = ACTIVITY_CLASSES[message_type](message_type=message_type, account='123')
+    record.order_id = order_id
+
+    for name, value in attributes.items():
+        setattr(record, name, value)
+
+    return record
+
+
+def entered(manager: OrderStateManager, quantity: float = 100.0) -> None:
+
+    manager.apply_activity(activity(
+        'OrderEntryRequest', symbol='AAPL', instruction='BUY', order_type='LIMIT', quantity=quantity, limit_price=10.0
+    ))
+    manager.apply_activity(activity('OrderRoute'))
+
+
+def test_fills_update_the_quantity_and_average_price():
+
+    manager = OrderStateManager(client=FakeClient(), load=False)
+    entered(manager)
+
+    manager.apply_activity(activity(
+        'OrderPartialFill', execution_id='1', execution_quantity=40.0, execution_price=10.0, leaves_quantity=60.0
+    ))
+    order = manager.apply_activity(activity(
+        'OrderFill', execution_id='2', execution_quantity=60.0, execution_price=10.5, leaves_quantity=0.0
+    ))
+
+    assert order.status == 'FILLED'
+    assert order.filled_quantity == 100.0
+    assert order.average_fill_price == 10.3
+    assert manager.by_status('FILLED') == [order]
+
+
+def test_a_replayed_fill_is_counted_once():
+
+    manager = OrderStateManager(client=FakeClient(), load=False)
+    entered(manager)
+
+    fill = activity(
+        'OrderPartialFill', execution_id='1', execution_quantity=40.0, execution_price=10.0, leaves_quantity=60.0
+    )
+
+    assert manager.apply_activity(fill) is not None
+    assert manager.apply_activity(fill) is None
+
+    order = manager.get(1)
+
+    assert order.filled_quantity == 40.0
+    assert order.average_fill_price == 10.0
+    assert order.status == 'WORKING'
+
+
+def test_a_stale_snapshot_does_not_reopen_a_filled_order():
+
+    working = {
+        'orderId': 1, 'accountId': '123', 'status': 'WORKING', 'orderType': 'LIMIT', 'quantity': 100.0,
+        'filledQuantity': 0.0, 'remainingQuantity': 100.0, 'price': 10.0,
+        'orderLegCollection': [{'instruction': 'BUY', 'instrument': {'symbol': 'AAPL'}}]
+    }
+    client = FakeClient(orders=[working])
+    manager = OrderStateManager(client=client, load=False)
+    entered(manager)
+
+    def fetch_while_the_order_fills() -> list:
+
+        manager.apply_activity(activity(
+            'OrderFill', execution_id='1', execution_quantity=100.0, execution_price=10.0, leaves_quantity=0.0
+        ))
+
+        return client.orders
+
+    manager._fetch_orders = fetch_while_the_order_fills
+
+    async def reconcile_once():
+
+        task = asyncio.ensure_future(manager.reconcile_periodically(interval=0.0))
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+    asyncio.get_event_loop().run_until_complete(reconcile_once())
+
+    assert manager.get(1).status == 'FILLED'
+    assert manager.get(1).filled_quantity == 100.0
+
+
+def test_a_snapshot_never_reopens_a_done_order():
+
+    manager = OrderStateManager(client=FakeClient(), load=False)
+    entered(manager)
+    manager.apply_activity(activity('UROUT'))
+
+    changed = manager.apply_order(
+        order_dict={'orderId': 1, 'status': 'WORKING', 'quantity': 100.0}, fetched_at=time.time() + 60
+    )
+
+    assert not changed
+    assert manager.get(1).status == 'CANCELED'
@@ -0,0 +1,113 @@
+import json
+import pathlib
+import pytest
+from td.order_templates import OrderTemplateLibrary
+
+SAMPLES = pathlib.Path(__file__).resolve().parent.parent.joinpath('samples', 'orders')
+
+BRACKET = {
+    'orderType': 'LIMIT', 'session': 'NORMAL', 'duration': 'DAY', 'orderStrategyType': 'TRIGGER', 'price': 50.0,
+    'orderLegCollection': [
+        {'instruction': 'BUY', 'quantity': 100, 'instrument': {'symbol': 'SYM', 'assetType': 'EQUITY'}}
+    ],
+    'childOrderStrategies': [{
+        'orderStrategyType': 'OCO',
+        'childOrderStrategies': [
+            {
+                'orderType': 'LIMIT', 'session': 'NORMAL', 'duration': 'GOOD_TILL_CANCEL', 'orderStrategyType': 'SINGLE',
+                'price': 52.5,
+                'orderLegCollection': [
+                    {'instruction': 'SELL', 'quantity': 100, 'instrument': {'symbol': 'SYM', 'assetType': 'EQUITY'}}
+                ]
+            },
+            {
+                'orderType': 'STOP', 'session': 'NORMAL', 'duration': 'GOOD_TILL_CANCEL', 'orderStrategyType': 'SINGLE',
+                'stopPrice': 47.5,
+                'orderLegCollection': [
+                    {'instruction': 'SELL', 'quantity': 100, 'instrument': {'symbol': 'SYM', 'assetType': 'EQUITY'}}
+                ]
+            }
+        ]
+    }]
+}
+
+
+@pytest.fixture
+def library() -> OrderTemplateLibrary:
+
+    library = OrderTemplateLibrary()
+    library.add(name='bracket', payload=BRACKET)
+
+    return library
+
+
+def test_build_fills_every_path_of_a_slot(library):
+
+    payload = library.build('bracket', symbol='MSFT', quantity=10, child_0_0_price=210.0)
+    exits = payload['childOrderStrategies'][0]['childOrderStrategies']
+
+    assert payload['orderLegCollection'][0]['instrument']['symbol'] == 'MSFT'
+    assert [leg['quantity'] for exit_order in exits for leg in exit_order['orderLegCollection']] == [10, 10]
+    assert exits[0]['price'] == 210.0
+    assert exits[1]['stopPrice'] == 47.5
+
+
+def test_built_payloads_do_not_share_state(library):
+
+    first, second = library.build_many('bracket', [{'symbol': 'MSFT'}, {'symbol': 'AAPL'}])
+    first['orderLegCollection'][0]['instrument']['symbol'] = 'GME'
+
+    assert second['orderLegCollection'][0]['instrument']['symbol'] == 'AAPL'
+    assert BRACKET['orderLegCollection'][0]['instrument']['symbol'] == 'SYM'
+    assert library.build('bracket')['orderLegCollection'][0]['instrument']['symbol'] == 'SYM'
+
+
+def test_build_and_render_agree(library):
+
+    values = {'symbol': 'MSFT', 'quantity': 10, 'child_0_1_stop_price': 190.0}
+
+    assert json.loads(library.render('bracket', **values)) == library.build('bracket', **values)
+    assert library.build_many('bracket', [values], as_bytes=True) == [library.render('bracket', **values)]
+
+
+def test_unknown_slots_and_templates_raise(library):
+
+    with pytest.raises(KeyError, match='qty'):
+        library.build('bracket', qty=10)
+
+    with pytest.raises(KeyError, match='brakcet'):
+        library.template('brakcet')
+
+
+def test_invalid_payloads_are_rejected(library):
+
+    with pytest.raises(ValueError):
+        library.add(name='broken', payload={'orderType': 'LIMIT', 'orderStrategyType': 'SINGLE'})
+
+    assert not library.add(name='broken', payload={'orderType': 'LIMIT'}, strict=False)
+    assert 'broken' in library.errors
+    assert 'broken' not in library
+
+
+def test_the_samples_load_under_stable_names():
+
+    library = OrderTemplateLibrary.from_directory(directory=SAMPLES)
+
+    assert {'limit_buy', 'market_sell', 'stop_limit_buy', 'trigger_oco', 'option_vertical'} <= set(library.templates)
+    assert 'name' not in library.templates['limit_buy'].payload
+    assert 'limit_sell' in library.errors
+
+    with pytest.raises(ValueError):
+        OrderTemplateLibrary.from_directory(directory=SAMPLES, strict=True)
+
+
+def test_a_list_spec_needs_names(tmp_path):
+
+    order = dict(BRACKET, childOrderStrategies=[], orderStrategyType='SINGLE')
+    tmp_path.joinpath('order - pair.json').write_text(json.dumps([dict(order, name='pair_buy'), order]))
+    tmp_path.joinpath('order - single.jsonc').write_text('// a single order\n' + json.dumps(order))
+
+    library = OrderTemplateLibrary.from_directory(directory=tmp_path)
+
+    assert sorted(library.templates) == ['pair_buy', 'single']
+    assert list(library.errors) == ['pair[1]']
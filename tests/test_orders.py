@@ -0,0 +1,115 @@
+import json
+import pytest
+from td.orders import Order
+from td.orders import OrderLeg
+
+
+def equity_leg(instruction: str, quantity: int) -> OrderLeg:
+
+    order_leg = OrderLeg()
+    order_leg.order_leg_instruction(instruction=instruction)
+    order_leg.order_leg_quantity(quantity=quantity)
+    order_leg.order_leg_asset(asset_type='EQUITY', symbol='MSFT')
+
+    return order_leg
+
+
+def bracket_order() -> Order:
+
+    entry_order = Order()
+    entry_order.order_session(session='NORMAL')
+    entry_order.order_duration(duration='DAY')
+    entry_order.order_type(order_type='LIMIT')
+    entry_order.order_price(price=250.0)
+    entry_order.order_strategy_type(order_strategy_type='TRIGGER')
+    entry_order.add_order_leg(order_leg=equity_leg(instruction='BUY', quantity=100))
+
+    exit_order = entry_order.create_child_order_strategy()
+    exit_order.order_strategy_type(order_strategy_type='OCO')
+
+    for order_type, price in (('LIMIT', 260.0), ('STOP', 245.0)):
+
+        child_order = exit_order.create_child_order_strategy()
+        child_order.order_session(session='NORMAL')
+        child_order.order_duration(duration='GOOD_TILL_CANCEL')
+        child_order.order_type(order_type=order_type)
+        child_order.order_strategy_type(order_strategy_type='SINGLE')
+
+        if order_type == 'LIMIT':
+            child_order.order_price(price=price)
+        else:
+            child_order.stop_price(stop_price=price)
+
+        child_order.add_order_leg(order_leg=equity_leg(instruction='SELL', quantity=100))
+        exit_order.add_child_order_strategy(child_order_strategy=child_order)
+
+    entry_order.add_child_order_strategy(child_order_strategy=exit_order)
+
+    return entry_order
+
+
+def sell_leg() -> dict:
+    return {'instruction': 'SELL', 'quantity': 100, 'instrument': {'assetType': 'EQUITY', 'symbol': 'MSFT'}}
+
+
+# what `_grab_order` returned for the bracket before the order was rebuilt on `to_dict`.
+BRACKET_PAYLOAD = {
+    'session': 'NORMAL',
+    'duration': 'DAY',
+    'orderType': 'LIMIT',
+    'price': 250.0,
+    'orderStrategyType': 'TRIGGER',
+    'orderLegCollection': [
+        {'instruction': 'BUY', 'quantity': 100, 'instrument': {'assetType': 'EQUITY', 'symbol': 'MSFT'}}
+    ],
+    'childOrderStrategies': [
+        {
+            'orderStrategyType': 'OCO',
+            'childOrderStrategies': [
+                {
+                    'session': 'NORMAL', 'duration': 'GOOD_TILL_CANCEL', 'orderType': 'LIMIT',
+                    'orderStrategyType': 'SINGLE', 'price': 260.0, 'orderLegCollection': [sell_leg()]
+                },
+                {
+                    'session': 'NORMAL', 'duration': 'GOOD_TILL_CANCEL', 'orderType': 'STOP',
+                    'orderStrategyType': 'SINGLE', 'stopPrice': 245.0, 'orderLegCollection': [sell_leg()]
+                }
+            ]
+        }
+    ]
+}
+
+
+def test_a_bracket_order_keeps_its_payload():
+
+    order = bracket_order()
+
+    # compared as JSON, so the order of the keys counts too.
+    assert json.dumps(order.to_dict()) == json.dumps(BRACKET_PAYLOAD)
+    assert json.loads(order.to_json()) == BRACKET_PAYLOAD
+
+
+def test_legs_and_child_orders_are_deleted_by_index():
+
+    order = bracket_order()
+    order.add_order_leg(order_leg=equity_leg(instruction='BUY', quantity=50))
+    order.delete_order_leg(index=0)
+
+    assert [leg['quantity'] for leg in order.to_dict()['orderLegCollection']] == [50]
+
+    # the new leg doesn't take the key of the one that's left.
+    order.add_order_leg(order_leg=equity_leg(instruction='BUY', quantity=25))
+
+    assert [leg['quantity'] for leg in order.to_dict()['orderLegCollection']] == [50, 25]
+
+    order.delete_order_leg(index=1)
+
+    order.delete_child_order_strategy(index=0)
+
+    assert 'childOrderStrategies' not in order.to_dict()
+
+    with pytest.raises(ValueError):
+        order.delete_order_leg(index=1)
+
+    with pytest.raises(ValueError):
+        order.delete_child_order_strategy(index=0)
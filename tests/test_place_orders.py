@@ -0,0 +1,90 @@
+import pytest
+from td.client import TDClient
+from td.risk import RiskCheckError
+from td.risk import RiskManager
+
+
+def limit_order(symbol: str, quantity: float, price: float = 10.0) -> dict:
+    return {
+        'orderType': 'LIMIT', 'session': 'NORMAL', 'duration': 'DAY', 'orderStrategyType': 'SINGLE', 'price': price,
+        'orderLegCollection': [{'instruction': 'BUY', 'quantity': quantity, 'instrument': {'symbol': symbol}}]
+    }
+
+
+@pytest.fixture
+def client(monkeypatch) -> TDClient:
+
+    client = TDClient(client_id='CLIENT_ID', redirect_uri='https://localhost')
+    client.sent = []
+    client.cancelled = []
+
+    def send_order(account: str, order: dict) -> dict:
+
+        symbol = order['orderLegCollection'][0]['instrument']['symbol']
+
+        if symbol == 'BROKEN':
+            raise KeyError('Location')
+
+        client.sent.append(symbol)
+
+        return {'order_id': str(len(client.sent)), 'status_code': 201}
+
+    def cancel_order(account: str, order_id: str) -> dict:
+
+        client.cancelled.append(order_id)
+
+        return {'status_code': 200}
+
+    monkeypatch.setattr(client, '_send_order', send_order)
+    monkeypatch.setattr(client, 'cancel_order', cancel_order)
+    monkeypatch.setattr(client, '_token_validation', lambda nseconds: None)
+
+    return client
+
+
+def test_the_batch_is_checked_once_as_a_whole(client, monkeypatch):
+
+    client.risk_manager = RiskManager(max_position=150)
+
+    def check(account: str, order: dict) -> None:
+        raise AssertionError('the orders of a batch are not checked one by one')
+
+    monkeypatch.setattr(client.risk_manager, 'check', check)
+
+    results = list(client.place_orders(account='123', orders=[limit_order('AAPL', 100), limit_order('MSFT', 100)]))
+
+    assert sorted(result.status for result in results) == ['PLACED', 'PLACED']
+
+    with pytest.raises(RiskCheckError):
+        list(client.place_orders(account='123', orders=[limit_order('AAPL', 100), limit_order('AAPL', 100)]))
+
+
+def test_an_unexpected_error_still_rolls_the_batch_back(client):
+
+    results = list(client.place_orders(
+        account='123', orders=[limit_order('AAPL', 100), limit_order('BROKEN', 100)], max_workers=1, all_or_none=True
+    ))
+
+    failed = [result for result in results if result.status == 'FAILED']
+
+    assert len(failed) == 1
+    assert isinstance(failed[0].error, KeyError)
+    assert client.cancelled == ['1']
+    assert results[-1].status == 'CANCELLED'
+
+
+def test_a_failed_order_releases_its_reservation(client):
+
+    client.risk_manager = RiskManager(max_position=150)
+
+    with pytest.raises(KeyError):
+        client.place_order(account='123', order=limit_order('BROKEN', 100))
+
+    results = list(client.place_orders(account='123', orders=[limit_order('BROKEN', 100)]))
+
+    assert results[0].status == 'FAILED'
+    assert client.risk_manager.accounts['123'].reservations == []
+
+    client.place_order(account='123', order=limit_order('AAPL', 150))
+
+    assert client.sent == ['AAPL']
@@ -0,0 +1,41 @@
+from td.records import LevelOneQuoteRecord
+from td.records import decode_record
+from td.records import decode_records
+
+
+def test_a_quote_is_read_by_field_name():
+
+    record = decode_record('QUOTE', {'key': 'MSFT', '1': 10.0, '2': 10.2, '30': 12.5, 'unknown': 1})
+
+    assert isinstance(record, LevelOneQuoteRecord)
+    assert (record.symbol, record.bid_price, record.ask_price, record.week_high_52) == ('MSFT', 10.0, 10.2, 12.5)
+    assert record.last_price is None
+    assert record.get('1') == record.get('bid_price') == 10.0
+    assert record.get('3', default=0.0) == 0.0
+
+
+def test_a_record_goes_back_to_its_raw_content():
+
+    content = {'key': 'MSFT', '1': 10.0, '49': 10.1}
+
+    assert decode_record('QUOTE', content).to_content() == content
+
+
+def test_update_only_copies_the_fields_that_are_set():
+
+    record = decode_record('QUOTE', {'key': 'MSFT', '1': 10.0, '2': 10.2})
+    record.update(decode_record('QUOTE', {'key': 'MSFT', '1': 10.1}))
+
+    assert record.to_dict() == {'symbol': 'MSFT', 'bid_price': 10.1, 'ask_price': 10.2}
+
+
+def test_services_without_a_record_class_are_left_as_is():
+
+    book = {'key': 'MSFT', '2': []}
+    message = decode_records({'data': [
+        {'service': 'NASDAQ_BOOK', 'content': [book]},
+        {'service': 'QUOTE', 'content': [{'key': 'MSFT', '1': 10.0}]}
+    ]})
+
+    assert message['data'][0]['content'][0] is book
+    assert message['data'][1]['content'][0].bid_price == 10.0
@@ -0,0 +1,170 @@
+import pytest
+from td.account_activity import ACTIVITY_CLASSES
+from td.risk import RiskCheckError
+from td.risk import RiskManager
+
+
+def order(symbol: str, quantity: float, instruction: str = 'BUY', price: float = 10.0) -> dict:
+    return {
+        'orderType': 'LIMIT', 'orderStrategyType': 'SINGLE', 'price': price,
+        'orderLegCollection': [{'instruction': instruction, 'quantity': quantity, 'instrument': {'symbol': symbol}}]
+    }
+
+
+def fill(execution_id: str, instruction: str = 'BUY', quantity: float = 10.0, price: float = 10.0):
+
+    record = ACTIVITY_CLASSES['OrderFill'](message_type='OrderFill', account='123')
+    record.order_id = 1
+    record.symbol = 'AAPL'
+    record.security_type = 'Common Stock'
+    record.instruction = instruction
+    record.execution_id = execution_id
+    record.execution_quantity = quantity
+    record.execution_price = price
+
+    return record
+
+
+def test_a_batch_cannot_split_an_order_around_a_limit():
+
+    risk = RiskManager(max_position=150)
+
+    risk.check_many(account='123', orders=[order('AAPL', 100), order('MSFT', 100)])
+
+    with pytest.raises(RiskCheckError) as error:
+        risk.check_many(account='123', orders=[order('AAPL', 100), order('AAPL', 100)])
+
+    assert error.value.check == 'max_position'
+    assert error.value.symbol == 'AAPL'
+
+
+def test_buying_power_carries_over_the_batch():
+
+    risk = RiskManager(check_buying_power=True)
+    risk._account('123').buying_power = 1500.0
+
+    # a sell doesn't use buying power.
+    risk.check_many(account='123', orders=[order('AAPL', 100), order('MSFT', 100, instruction='SELL')])
+
+    with pytest.raises(RiskCheckError) as error:
+        risk.check_many(account='123', orders=[order('AAPL', 100), order('MSFT', 100)])
+
+    assert error.value.check == 'buying_power'
+
+
+def test_the_orders_of_an_oco_are_checked_one_at_a_time():
+
+    risk = RiskManager(max_position=100)
+    oco = {'orderStrategyType': 'OCO', 'childOrderStrategies': [order('AAPL', 100), order('AAPL', 100)]}
+
+    risk.check(account='123', order=oco)
+
+
+@pytest.mark.parametrize('leg', [
+    {'instruction': 'BUY', 'quantity': 10},
+    {'instruction': 'BUY', 'instrument': {'symbol': 'AAPL'}},
+    {'instruction': 'BUY', 'quantity': 'ten', 'instrument': {'symbol': 'AAPL'}},
+    {'quantity': 10, 'instrument': {'symbol': 'AAPL'}},
+    'AAPL'
+])
+def test_a_malformed_order_fails_the_check(leg):
+
+    risk = RiskManager(max_notional=10000.0)
+
+    with pytest.raises(RiskCheckError) as error:
+        risk.check(account='123', order={'orderStrategyType': 'SINGLE', 'orderLegCollection': [leg]})
+
+    assert error.value.check == 'invalid_order'
+
+
+def test_a_replayed_fill_moves_the_position_once():
+
+    risk = RiskManager()
+    risk._account('123').buying_power = 1000.0
+
+    assert risk.apply_activity(fill('1'))
+    assert not risk.apply_activity(fill('1'))
+
+    assert risk.position('123', 'AAPL') == 10.0
+    assert risk.accounts['123'].buying_power == 900.0
+
+
+def test_a_fill_without_a_known_instruction_is_skipped():
+
+    risk = RiskManager()
+
+    assert not risk.apply_activity(fill('1', instruction=None))
+    assert risk.position('123', 'AAPL') == 0.0
+
+    with pytest.raises(ValueError):
+        risk.apply_fill(account='123', symbol='AAPL', instruction=None, quantity=10.0)
+
+
+def activity(message_type: str, order_id: int = 1, instruction: str = 'BUY'):
+
+    record = ACTIVITY_CLASSES[message_type](message_type=message_type, account='123')
+    record.order_id = order_id
+    record.symbol = 'AAPL'
+    record.instruction = instruction
+
+    return record
+
+
+def test_working_orders_count_against_the_limits():
+
+    risk = RiskManager(max_position=150, check_buying_power=True)
+    risk._account('123').buying_power = 1500.0
+
+    risk.check(account='123', order=order('AAPL', 100))
+
+    # each order is under the limits on its own, not with the first one still working.
+    with pytest.raises(RiskCheckError) as error:
+        risk.check(account='123', order=order('AAPL', 100))
+
+    assert error.value.check == 'max_position'
+
+    with pytest.raises(RiskCheckError) as error:
+        risk.check(account='123', order=order('MSFT', 100))
+
+    assert error.value.check == 'buying_power'
+
+
+def test_a_filled_order_moves_from_its_reservation_to_the_position():
+
+    risk = RiskManager(max_position=150)
+
+    risk.check(account='123', order=order('AAPL', 10))
+    risk.apply_activity(activity('OrderEntryRequest'))
+    risk.apply_activity(fill('1'))
+
+    assert risk.position('123', 'AAPL') == 10.0
+    assert risk.accounts['123'].reservations == []
+
+    risk.check(account='123', order=order('AAPL', 140))
+
+
+@pytest.mark.parametrize('message_type', ['UROUT', 'OrderRejection'])
+def test_a_cancelled_or_rejected_order_releases_its_reservation(message_type):
+
+    risk = RiskManager(max_position=150)
+
+    risk.check(account='123', order=order('AAPL', 100))
+    risk.check(account='123', order=order('AAPL', 50))
+    risk.apply_activity(activity('OrderEntryRequest', order_id=7))
+    risk.apply_activity(activity(message_type, order_id=7))
+
+    assert [reservation.quantity for reservation in risk.accounts['123'].reservations] == [50]
+
+    risk.check(account='123', order=order('AAPL', 100))
+
+
+def test_an_order_that_is_not_placed_gives_its_reservation_back():
+
+    risk = RiskManager(max_position=150)
+
+    reservations = risk.check(account='123', order=order('AAPL', 100))
+    risk.release(reservations=reservations)
+
+    # a dry run only checks.
+    risk.check_many(account='123', orders=[order('AAPL', 150)], reserve=False)
+    risk.check(account='123', order=order('AAPL', 150))
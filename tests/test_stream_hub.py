@@ -0,0 +1,75 @@
+import asyncio
+import pytest
+from td.stream import TDStreamerClient
+from td.stream_hub import StreamHub
+
+
+def quotes(*symbols) -> dict:
+    return {'data': [{
+        'service': 'QUOTE', 'timestamp': 1, 'command': 'SUBS',
+        'content': [{'key': symbol, '1': 10.0} for symbol in symbols]
+    }]}
+
+
+@pytest.fixture
+def hub() -> StreamHub:
+    return StreamHub(streaming_client=TDStreamerClient(websocket_url='example.com'))
+
+
+def test_records_are_routed_by_service_and_symbol(hub):
+
+    by_symbol, by_service, everything = [], [], []
+    queue = asyncio.Queue()
+
+    hub.subscribe(service='QUOTE', symbols=['MSFT'], callback=lambda *record: by_symbol.append(record))
+    hub.subscribe(service='QUOTE', callback=lambda *record: by_service.append(record))
+    hub.subscribe(service='OPTION', queue=queue)
+    hub.subscribe(callback=lambda *record: everything.append(record))
+
+    hub.publish(quotes('MSFT', 'AAPL'))
+    hub.publish({'response': [{'service': 'ADMIN'}]})
+
+    assert [record[2]['key'] for record in by_symbol] == ['MSFT']
+    assert [record[2]['key'] for record in by_service] == ['MSFT', 'AAPL']
+    assert len(everything) == 2
+    assert queue.empty()
+    assert hub.messages_published == 1
+    assert hub.records_published == 2
+
+
+def test_subscribers_share_a_read_only_record(hub):
+
+    received = []
+
+    hub.subscribe(service='QUOTE', callback=lambda service, timestamp, record: received.append(record))
+    hub.subscribe(service='QUOTE', callback=lambda service, timestamp, record: received.append(record))
+    hub.publish(quotes('MSFT'))
+
+    assert received[0] is received[1]
+
+    with pytest.raises(TypeError):
+        received[0]['1'] = 11.0
+
+
+def test_unsubscribe_stops_delivery(hub):
+
+    received = []
+    subscription_id = hub.subscribe(service='QUOTE', symbols=['MSFT'], callback=lambda *record: received.append(record))
+
+    hub.unsubscribe(subscription_id)
+    hub.publish(quotes('MSFT'))
+
+    assert received == []
+    assert hub.records_published == 0
+
+    with pytest.raises(KeyError):
+        hub.unsubscribe(subscription_id)
+
+
+def test_a_consumer_needs_exactly_one_target(hub):
+
+    with pytest.raises(ValueError):
+        hub.subscribe(service='QUOTE')
+
+    with pytest.raises(ValueError):
+        hub.subscribe(symbols=['MSFT'], callback=print)
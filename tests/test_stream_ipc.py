@@ -0,0 +1,48 @@
+import asyncio
+from td.stream import TDStreamerClient
+from td.stream_hub import StreamHub
+from td.stream_ipc import StreamPublisher
+from td.stream_ipc import StreamSubscriber
+
+
+def test_subscribers_receive_only_their_topics(tmp_path):
+
+    path = str(tmp_path / 'stream.sock')
+    hub = StreamHub(streaming_client=TDStreamerClient(websocket_url='example.com'))
+    publisher = StreamPublisher(hub=hub, path=path)
+
+    async def exchange():
+
+        await publisher.start()
+
+        msft = StreamSubscriber(path=path, topics=[('QUOTE', 'MSFT')])
+        everything = StreamSubscriber(path=path)
+        await msft.connect()
+        await everything.connect()
+
+        # let the publisher register both subscribers.
+        while len(publisher.clients) < 2:
+            await asyncio.sleep(0.01)
+
+        hub.publish({'data': [{
+            'service': 'QUOTE', 'timestamp': 5, 'command': 'SUBS',
+            'content': [{'key': 'AAPL', '1': 300.0}, {'key': 'MSFT', '1': 10.0}]
+        }]})
+
+        received = (
+            await asyncio.wait_for(msft.receive(), timeout=1.0),
+            [await asyncio.wait_for(everything.receive(), timeout=1.0) for _ in range(2)]
+        )
+
+        await msft.close()
+        await everything.close()
+        await publisher.close()
+
+        return received
+
+    msft_record, all_records = asyncio.get_event_loop().run_until_complete(exchange())
+
+    assert msft_record == ('QUOTE', 5, {'key': 'MSFT', '1': 10.0})
+    assert [record[2]['key'] for record in all_records] == ['AAPL', 'MSFT']
+    assert publisher.records_sent == 3
+    assert not (tmp_path / 'stream.sock').exists()
@@ -0,0 +1,105 @@
+import asyncio
+import json
+import pytest
+from td.order_state import OrderStateManager
+from td.risk import RiskManager
+from td.stream import TDStreamerClient
+
+USER_PRINCIPAL_DATA = {
+    'accounts': [{'accountId': '123456789'}],
+    'streamerInfo': {'appId': 'APP'},
+    'streamerSubscriptionKeys': {'keys': [{'key': 'SubscriptionKey'}]}
+}
+
+
+class RecordingConnection():
+
+    """Keeps every request that's sent."""
+
+    def __init__(self) -> None:
+        self.requests = []
+
+    async def send(self, message: str) -> None:
+        self.requests.extend(json.loads(message)['requests'])
+
+
+@pytest.fixture
+def client() -> TDStreamerClient:
+    return TDStreamerClient(websocket_url='example.com', user_principal_data=USER_PRINCIPAL_DATA)
+
+
+def test_dynamic_requests_get_their_own_ids(client):
+
+    client.connection = RecordingConnection()
+    loop = asyncio.get_event_loop()
+
+    loop.run_until_complete(client.add_subscription(service='QUOTE', symbols=['MSFT'], fields=[0, 1]))
+    loop.run_until_complete(client.add_subscription(service='QUOTE', symbols=['AAPL'], fields=[0, 1]))
+    loop.run_until_complete(client.remove_subscription(service='QUOTE', symbols=['MSFT']))
+
+    request_ids = [request['requestid'] for request in client.connection.requests]
+
+    assert len(set(request_ids)) == 3
+    assert request_ids == sorted(request_ids)
+
+
+def test_queued_and_dynamic_requests_never_share_an_id(client):
+
+    client.account_activity()
+    client.connection = RecordingConnection()
+
+    asyncio.get_event_loop().run_until_complete(
+        client.add_subscription(service='QUOTE', symbols=['MSFT'], fields=[0, 1])
+    )
+
+    assert client.data_requests['requests'][0]['requestid'] != client.connection.requests[0]['requestid']
+
+
+def test_chart_history_range_is_sent_on_a_running_stream(client):
+
+    client.connection = RecordingConnection()
+
+    request_ids = asyncio.get_event_loop().run_until_complete(client.chart_history_futures_range(
+        symbol='/ES', frequency='m1', start_time=0, end_time=3 * 86400000, max_span=86400000
+    ))
+
+    assert len(request_ids) == 3
+    assert [request['requestid'] for request in client.connection.requests] == request_ids
+    assert client.data_requests['requests'] == []
+
+
+def test_chart_history_range_is_queued_before_the_stream_starts(client):
+
+    request_ids = asyncio.get_event_loop().run_until_complete(client.chart_history_futures_range(
+        symbol='/ES', frequency='m1', start_time=0, end_time=2 * 86400000, max_span=86400000
+    ))
+
+    assert [request['requestid'] for request in client.data_requests['requests']] == request_ids
+    assert not client.chart_history.is_complete('/ES')
+
+
+class FailingConnection():
+
+    async def send(self, message: str) -> None:
+        raise ConnectionError('closed')
+
+
+def test_a_failed_chart_history_send_reaches_the_caller(client):
+
+    client.connection = FailingConnection()
+
+    with pytest.raises(ConnectionError):
+        asyncio.get_event_loop().run_until_complete(client.chart_history_futures_range(
+            symbol='/ES', frequency='m1', start_time=0, end_time=86400000
+        ))
+
+
+def test_risk_updates_share_the_account_activity_subscription(client):
+
+    risk = RiskManager()
+
+    client.order_updates(order_state=OrderStateManager(client=None, load=False))
+
+    assert client.risk_updates(risk_manager=risk) is risk
+    assert risk.process_message in client._message_processors
+    assert [request['service'] for request in client.data_requests['requests']] == ['ACCT_ACTIVITY']
@@ -0,0 +1,74 @@
+import math
+import pytest
+from td.option_chain import OptionChainColumns
+from td.vol_surface import VolatilitySurface
+
+EXPIRIES = {'2020-05-15:30': 30, '2020-06-19:65': 65}
+
+
+def chain_response() -> dict:
+
+    def side(put_call: str, letter: str) -> dict:
+        return {
+            expiry: {
+                '{:.1f}'.format(strike): [{
+                    'symbol': 'XYZ_{}{}{:.0f}'.format(days, letter, strike), 'putCall': put_call,
+                    'strikePrice': strike, 'bid': 1.0, 'ask': 1.2, 'mark': 1.1, 'daysToExpiration': days
+                }] for strike in (90.0, 100.0, 110.0)
+            } for expiry, days in EXPIRIES.items()
+        }
+
+    return {
+        'symbol': 'XYZ', 'underlyingPrice': 100.0, 'interestRate': 1.0, 'volatility': 29.0,
+        'callExpDateMap': side('CALL', 'C'), 'putExpDateMap': side('PUT', 'P')
+    }
+
+
+@pytest.fixture
+def surface() -> VolatilitySurface:
+
+    chain = OptionChainColumns.from_response(chain_response())
+
+    # a flat 20% smile on the near expiry, 30% on the far one.
+    volatility = [0.2 if days == 30 else 0.3 for days in chain.days_to_expiration]
+
+    surface = VolatilitySurface()
+    surface.update_chain(chain=chain, volatility=volatility)
+
+    return surface
+
+
+def test_lookups_interpolate_total_variance_across_expiries(surface):
+
+    assert surface.volatility('XYZ', days=30, moneyness=1.0) == pytest.approx(0.2)
+    assert surface.volatility('XYZ', days=65, strike=120.0) == pytest.approx(0.3)
+
+    variance = 0.2 ** 2 * 30 + (45.0 - 30) / (65 - 30) * (0.3 ** 2 * 65 - 0.2 ** 2 * 30)
+    assert surface.volatility('XYZ', days=45, moneyness=1.0) == pytest.approx(math.sqrt(variance / 45))
+
+
+def test_a_quote_only_refits_its_own_expiry(surface):
+
+    surface.refit()
+    refits = surface.refit_count
+
+    applied = surface.update_quotes([{'key': 'XYZ_30C110', '41': 2.5}, {'key': 'NOT_LOADED', '41': 1.0}])
+
+    assert applied == 1
+    assert surface.refit() == 1
+    assert surface.refit_count == refits + 1
+
+    grid = surface.grid('XYZ')
+
+    assert grid['days'] == [30, 65]
+    assert grid['volatility'][0][-1] > 0.2
+    assert grid['volatility'][1] == pytest.approx([0.3] * len(surface.moneyness_grid))
+
+
+def test_unknown_underlyings_and_missing_points_raise(surface):
+
+    with pytest.raises(KeyError):
+        surface.volatility('ABC', days=30, moneyness=1.0)
+
+    with pytest.raises(ValueError):
+        surface.volatility('XYZ', days=30)